@@ -1,62 +1,118 @@
 import os
+import math
+import base64
+import binascii
+import time
 import pandas as pd
 import numpy as np
-import chardet
 import warnings
 from datetime import datetime
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.decomposition import TruncatedSVD
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from sklearn.ensemble import RandomForestRegressor
+from scipy import sparse
+
+from menu_index import ContainerFitIndex, MenuFilterIndex, SimilarityNeighborIndex, ClusteredVectorIndex
+from menu_catalog import MenuCatalog
+from result_cache import RecommendationCache
+from metrics import StageTimer
+from model_artifacts import load_model_artifacts, save_model_artifacts, save_preference_model, source_fingerprint
+from csv_ingest import ingest_csv, MENU_SCHEMA, RESTAURANT_SCHEMA
+from packing import orientation_loads, placed_dimensions, pack_containers
+from context_engine import ContextEngine, load_context_rules
+from event_log import LOG_DIR as EVENT_LOG_DIR, log_fingerprint, read_interaction_log
 
 warnings.filterwarnings("ignore")
 
-# CSV 경로 설정 - 루트 폴더에 있는 CSV 파일들
+# CSV 경로 설정 - 루트 폴더에 있는 CSV 파일들 (환경 변수로 다른 카탈로그 지정 가능)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MENUS_CSV_PATH = os.environ.get("MENUS_CSV_PATH", os.path.join(BASE_DIR, "final_menus_data.csv"))
+RESTAURANTS_CSV_PATH = os.environ.get("RESTAURANTS_CSV_PATH", os.path.join(BASE_DIR, "restaurants.csv"))
+
+# 학습된 모델 아티팩트 번들 위치
+ARTIFACTS_DIR = os.environ.get("MODEL_ARTIFACTS_DIR", os.path.join(BASE_DIR, "artifacts"))
+
+# 고정 어휘(TF-IDF)로 점진 변환한 메뉴가 이 비율을 넘으면 어휘를 다시 학습
+CONTENT_REFIT_FRACTION = float(os.environ.get("CONTENT_REFIT_FRACTION", "0.2"))
+
+# 유사 메뉴 ANN 검색 설정 - 콘텐츠 특성이 이보다 많으면 SVD로 축소할 차원,
+# 클러스터(역 리스트) 수(0이면 √N), 질의당 기본 탐색 클러스터 수(클수록 재현율↑ 지연↑)
+ANN_DIMENSIONS = int(os.environ.get("ANN_DIMENSIONS", "64"))
+ANN_LISTS = int(os.environ.get("ANN_LISTS", "0")) or None
+ANN_PROBES = int(os.environ.get("ANN_PROBES", "8"))
+
+# 영업시간 밖인 가게의 메뉴를 후보에서 제외할지 여부 (기본 끔 - 켜면 심야/새벽에는 추천이 비어 있을 수 있음)
+FILTER_CLOSED_RESTAURANTS = os.environ.get("FILTER_CLOSED_RESTAURANTS", "0") != "0"
+
+# 다양성 재정렬(MMR) 후보 수와 유사 메뉴 감점 가중치 (0이면 점수 순위 그대로)
+MMR_CANDIDATES = int(os.environ.get("MMR_CANDIDATES", "50"))
+MMR_DIVERSITY_WEIGHT = float(os.environ.get("MMR_DIVERSITY_WEIGHT", "10"))
+
+# 용기에 들어가는 후보가 이보다 많으면 활용률 45~90% 구간 메뉴로 커트라인을 잡아 상위권에 들 수 없는 메뉴는
+# 선호도 예측 전에 제외 (0이면 끔)
+BAND_PRUNE_MIN_CANDIDATES = int(os.environ.get("BAND_PRUNE_MIN_CANDIDATES", "2000"))
 
-def load_csv_robust(filepath):
-    """다양한 인코딩을 시도하여 CSV 파일을 안전하게 로드"""
+# 여러 용기 담기 탐색에 쓰는 가치 상위 후보 수와 빔 폭
+PACKING_CANDIDATES = int(os.environ.get("PACKING_CANDIDATES", "100"))
+PACKING_BEAM_WIDTH = int(os.environ.get("PACKING_BEAM_WIDTH", "32"))
+
+# 선호도 모델 학습에 쓰는 feedback 이벤트 로그 위치 (기본은 추천 이벤트 로그 디렉터리의 feedback 파일, 빈 문자열이면 학습하지 않음)
+INTERACTIONS_LOG_DIR = os.environ.get("INTERACTIONS_LOG_DIR", EVENT_LOG_DIR)
+
+# 정제된 CSV의 Parquet 캐시 위치 (미설정 시 캐시하지 않음, pyarrow 필요)
+CSV_CACHE_DIR = os.environ.get("CSV_CACHE_DIR") or None
+
+def load_csv_robust(filepath, schema=RESTAURANT_SCHEMA):
+    """인코딩을 감지해 CSV를 스트리밍으로 로드 (건너뛴 행이 있으면 출력)"""
+    df, report = ingest_csv(filepath, schema, cache_dir=CSV_CACHE_DIR)
+    if report.get("skipped_rows"):
+        lines = ", ".join(str(skip["line"]) for skip in report["skipped"][:10])
+        print(f"CSV 행 건너뜀 ({os.path.basename(filepath)}): {report['skipped_rows']}개 (줄 {lines})")
+    if report.get("invalid_values"):
+        print(f"CSV 숫자 아닌 값 기본값 대체 ({os.path.basename(filepath)}): {report['invalid_values']}")
+    return df
+
+def load_menu_data():
+    """루트 폴더의 메뉴/레스토랑 CSV 로드 (실패 시 더미 데이터)"""
     try:
-        with open(filepath, 'rb') as f:
-            raw_data = f.read()
-            encoding = chardet.detect(raw_data)['encoding']
-        return pd.read_csv(filepath, encoding=encoding, on_bad_lines='skip')
+        menus_df = load_csv_robust(MENUS_CSV_PATH, MENU_SCHEMA)
+        restaurants_df = load_csv_robust(RESTAURANTS_CSV_PATH)
+        print(f"실제 CSV 데이터 로드 성공: 메뉴 {len(menus_df)}개, 레스토랑 {len(restaurants_df)}개")
     except Exception as e:
-        print(f"CSV 로드 실패 ({filepath}): {e}")
-        # 기본 인코딩들로 재시도
-        encodings = ['utf-8', 'utf-8-sig', 'cp949', 'euc-kr', 'latin1']
-        for enc in encodings:
-            try:
-                return pd.read_csv(filepath, encoding=enc, on_bad_lines='skip')
-            except:
-                continue
-        raise Exception(f"모든 인코딩 시도 실패: {filepath}")
+        print(f"실제 CSV 데이터 로드 오류: {e}")
+        print("더미 데이터로 대체합니다...")
+        # 더미 데이터 생성 (테스트용)
+        menus_df = pd.DataFrame({
+            'menu_id': range(1, 101),
+            'restaurant_id': np.random.randint(1, 21, 100),
+            'menu_name': [f'메뉴_{i}' for i in range(1, 101)],
+            'category': np.random.choice(['한식', '중식', '일식', '양식', '기타'], 100),
+            'price': np.random.randint(5000, 20000, 100),
+            'width': np.random.uniform(10, 25, 100),
+            'length': np.random.uniform(10, 25, 100),
+            'height': np.random.uniform(3, 10, 100),
+            'popularity_score': np.random.uniform(1, 10, 100)
+        })
+        restaurants_df = pd.DataFrame({
+            'restaurant_id': range(1, 21),
+            'name': [f'레스토랑_{i}' for i in range(1, 21)]
+        })
+        print("더미 데이터로 대체됨")
+    return menus_df, restaurants_df
 
-# 데이터 로드 - 루트 폴더에서 직접 로드
-try:
-    menus_df = load_csv_robust(os.path.join(BASE_DIR, "final_menus_data.csv"))
-    restaurants_df = load_csv_robust(os.path.join(BASE_DIR, "restaurants.csv"))
-    print(f"실제 CSV 데이터 로드 성공: 메뉴 {len(menus_df)}개, 레스토랑 {len(restaurants_df)}개")
-except Exception as e:
-    print(f"실제 CSV 데이터 로드 오류: {e}")
-    print("더미 데이터로 대체합니다...")
-    # 더미 데이터 생성 (테스트용)
-    menus_df = pd.DataFrame({
-        'menu_id': range(1, 101),
-        'restaurant_id': np.random.randint(1, 21, 100),
-        'menu_name': [f'메뉴_{i}' for i in range(1, 101)],
-        'category': np.random.choice(['한식', '중식', '일식', '양식', '기타'], 100),
-        'price': np.random.randint(5000, 20000, 100),
-        'width': np.random.uniform(10, 25, 100),
-        'length': np.random.uniform(10, 25, 100),
-        'height': np.random.uniform(3, 10, 100),
-        'popularity_score': np.random.uniform(1, 10, 100)
-    })
-    restaurants_df = pd.DataFrame({
-        'restaurant_id': range(1, 21),
-        'name': [f'레스토랑_{i}' for i in range(1, 21)]
-    })
-    print("더미 데이터로 대체됨")
+def encode_page_cursor(volume, position):
+    """간단 추천 페이지의 마지막 메뉴(부피, 위치)를 다음 페이지 커서 문자열로"""
+    return base64.urlsafe_b64encode(f"{float(volume)!r}:{int(position)}".encode()).decode()
+
+def decode_page_cursor(cursor):
+    """커서 문자열을 (부피, 위치)로 (형식이 잘못되면 None)"""
+    try:
+        volume, position = base64.urlsafe_b64decode(cursor.encode()).decode().split(':')
+        return float(volume), int(position)
+    except (ValueError, UnicodeError, binascii.Error):
+        return None
 
 class AdvancedFoodRecommendationAI:
     """
@@ -67,33 +123,68 @@ class AdvancedFoodRecommendationAI:
     - 지속적 학습 시스템
     """
     
-    def __init__(self, menus_df, restaurants_df, user_interactions_df=None):
+    # 선호도 모델 입력의 카테고리 원-핫 순서
+    PREFERENCE_CATEGORIES = ['한식', '중식', '일식', '양식', '기타']
+    
+    def __init__(self, menus_df, restaurants_df, user_interactions_df=None, similarity_neighbors=None,
+                 cache_size=256, cache_ttl=300, cache_quantization=None, artifacts=None, base_model=None,
+                 event_log=None, content_vectorizer='tfidf', context_rules=None):
         self.menus_df = menus_df.copy()
         self.restaurants_df = restaurants_df.copy()
         self.user_interactions_df = user_interactions_df if user_interactions_df is not None else pd.DataFrame()
         
-        # 데이터 전처리
-        self._preprocess_data()
+        # 지정 시 밀집 유사도 행렬 대신 메뉴별 상위 k개 이웃 인덱스 사용
+        self.similarity_neighbors = similarity_neighbors
+        
+        # 콘텐츠 벡터화 방식 ('tfidf': 학습된 어휘, 'hashing': 학습 없는 해시 어휘 - 점진 갱신에 어휘 drift 없음)
+        if content_vectorizer not in ('tfidf', 'hashing'):
+            raise ValueError(f"지원하지 않는 콘텐츠 벡터화 방식: {content_vectorizer}")
+        self.content_vectorizer_kind = content_vectorizer
+        # 마지막 어휘 학습 이후 점진 변환한 메뉴 수
+        self.content_changes_since_fit = 0
+        
+        # 추천 결과 캐시 (cache_quantization 지정 시 용기 크기를 해당 단위로 내림하여 키 생성, 점수는 실제 크기로 계산)
+        self.result_cache = RecommendationCache(max_size=cache_size, ttl_seconds=cache_ttl)
+        self.cache_quantization = cache_quantization
+        
+        # 추천 이벤트 로그 (RecommendationEventLog, 없으면 콘솔 로그만 출력)
+        self.event_log = event_log
+        
+        # 유사 메뉴 ANN 인덱스와 텍스트 질의용 SVD 투영 행렬 (모델 구축/번들 로드 때 준비)
+        self.similar_index = None
+        self.similar_projection = None
+        
+        # 데이터 전처리 (아티팩트 번들의 메뉴 데이터는 이미 전처리됨)
+        if artifacts is None:
+            self._preprocess_data()
+        self._build_restaurant_lookup()
         
         # AI 모델 컴포넌트들
-        self.content_vectorizer = TfidfVectorizer(max_features=50, analyzer='char', ngram_range=(1, 3))
+        if content_vectorizer == 'hashing':
+            self.content_vectorizer = HashingVectorizer(analyzer='char', ngram_range=(1, 3),
+                                                        n_features=2 ** 12, alternate_sign=False)
+        else:
+            self.content_vectorizer = TfidfVectorizer(max_features=50, analyzer='char', ngram_range=(1, 3))
         self.size_scaler = StandardScaler()
         self.preference_model = RandomForestRegressor(n_estimators=50, random_state=42)
         self.popularity_scaler = MinMaxScaler()
+        self.preference_model_fitted = False
+        self.min_training_interactions = 10
+        # 선호도 모델을 학습한 feedback 로그 파일 지문 (같으면 로그를 다시 읽지 않음)
+        self.feedback_fingerprint = base_model.feedback_fingerprint if base_model is not None else None
         
-        # 상황 인식을 위한 가중치
-        self.contextual_weights = {
-            'morning': {'한식': 1.2, '양식': 0.8, '중식': 0.9, '일식': 1.0, '기타': 0.7},
-            'lunch': {'한식': 1.1, '양식': 1.0, '중식': 1.2, '일식': 1.1, '기타': 0.9},
-            'dinner': {'한식': 1.0, '양식': 1.1, '중식': 1.0, '일식': 1.2, '기타': 0.8},
-            'weekend': {'한식': 0.9, '양식': 1.2, '중식': 1.1, '일식': 1.0, '기타': 1.0}
-        }
+        # 상황 인식 규칙 (시간대/요일/계절 가중치, 로드 시 ContextEngine으로 컴파일)
+        self.context_rules = context_rules if context_rules is not None else load_context_rules()
         
         # 최대 추천 개수 제한
         self.max_recommendations = 5
         
-        # 모델 초기화 및 학습
-        self._initialize_ai_models()
+        # 모델 초기화 및 학습 (저장된 아티팩트가 있으면 학습 없이 복원,
+        # base_model이 있으면 그 어휘와 벡터를 재사용해 바뀐 메뉴만 다시 계산)
+        if artifacts is not None:
+            self._restore_ai_models(artifacts)
+        else:
+            self._initialize_ai_models(base_model)
         
         print("고도화된 AI 추천시스템 초기화 완료")
         print(f"  - 메뉴 데이터: {len(self.menus_df)}개")
@@ -109,25 +200,42 @@ class AdvancedFoodRecommendationAI:
             if col in self.menus_df.columns:
                 self.menus_df[col] = pd.to_numeric(self.menus_df[col], errors='coerce')
         
-        # 결측값 처리
+        # 결측값 처리 (컬럼 단위 inplace fillna는 copy-on-write에서 원본에 반영되지 않으므로 재할당)
         if 'popularity_score' in self.menus_df.columns:
-            self.menus_df['popularity_score'].fillna(5, inplace=True)
+            self.menus_df['popularity_score'] = self.menus_df['popularity_score'].fillna(5)
         if 'price' in self.menus_df.columns:
-            self.menus_df['price'].fillna(self.menus_df['price'].median(), inplace=True)
+            self.menus_df['price'] = self.menus_df['price'].fillna(self.menus_df['price'].median())
         if 'width' in self.menus_df.columns:
-            self.menus_df['width'].fillna(15, inplace=True)
+            self.menus_df['width'] = self.menus_df['width'].fillna(15)
         if 'length' in self.menus_df.columns:
-            self.menus_df['length'].fillna(15, inplace=True)
+            self.menus_df['length'] = self.menus_df['length'].fillna(15)
         if 'height' in self.menus_df.columns:
-            self.menus_df['height'].fillna(8, inplace=True)
+            self.menus_df['height'] = self.menus_df['height'].fillna(8)
+    
+    def _build_restaurant_lookup(self):
+        """restaurant_id -> (이름, place_id) 해시 조회 테이블 구축 (중복 ID는 첫 행 사용)"""
+        ids = self.restaurants_df['restaurant_id'].tolist()
+        names = self.restaurants_df['name'].tolist()
+        if 'place_id' in self.restaurants_df.columns:
+            place_ids = [str(place_id) for place_id in self.restaurants_df['place_id'].tolist()]
+        else:
+            place_ids = [None] * len(ids)
+        
+        self.restaurant_lookup = {}
+        for restaurant_id, name, place_id in zip(ids, names, place_ids):
+            self.restaurant_lookup.setdefault(restaurant_id, (name, place_id))
+    
+    def get_restaurant_info(self, restaurant_id):
+        """레스토랑 이름과 place_id 조회 (없으면 ("알 수 없음", None))"""
+        return self.restaurant_lookup.get(restaurant_id, ("알 수 없음", None))
     
-    def _initialize_ai_models(self):
+    def _initialize_ai_models(self, base_model=None):
         """AI 모델들 초기화 및 사전 학습"""
         try:
             print("AI 모델 초기화 중...")
             
             # 1. 콘텐츠 기반 필터링을 위한 메뉴 벡터화
-            self._prepare_content_features()
+            self._prepare_content_features(base_model)
             
             # 2. 크기 기반 특성 정규화
             self._prepare_size_features()
@@ -135,21 +243,172 @@ class AdvancedFoodRecommendationAI:
             # 3. 인기도 정규화
             self._prepare_popularity_features()
             
+            # 4. 벡터화 점수 계산용 메뉴 컬럼 배열
+            self._prepare_menu_arrays()
+            
+            # 5. 용기 적합성 후보 탐색 인덱스
+            self._prepare_fit_index()
+            
+            # 6. 유사 메뉴 ANN 인덱스 (첫 질의가 구축 비용을 떠안지 않도록 미리 구축)
+            self._prepare_similar_index(base_model)
+            
+            # 7. 상황 가중치 표와 영업시간 비트맵
+            self._prepare_context_engine()
+            
+            # 8. 요청과 무관한 메뉴별 정적 점수 테이블
+            self._prepare_static_feature_table()
+            
+            # 9. 상호작용 데이터 기반 선호도 모델 학습 (새 상호작용이 없고 기존 모델이 학습돼 있으면 재사용)
+            if base_model is not None and base_model.preference_model_fitted and self.user_interactions_df.empty:
+                self.preference_model = base_model.preference_model
+                self.preference_model_fitted = True
+            else:
+                self.train_preference_model()
+            
             print("AI 모델 초기화 완료")
             
         except Exception as e:
             print(f"AI 모델 초기화 실패: {e}")
             raise
     
-    def _prepare_content_features(self):
+    def _restore_ai_models(self, artifacts):
+        """아티팩트 번들에서 학습된 상태 복원 (배열과 후보 탐색 인덱스는 memory-map)"""
+        try:
+            print(f"AI 모델 아티팩트 복원 중... ({artifacts.directory})")
+            artifacts.apply_to(self)
+            self.menu_texts = self._menu_texts()
+            self._use_catalog_columns()
+            self._prepare_context_engine()
+            print("AI 모델 아티팩트 복원 완료")
+            
+        except Exception as e:
+            print(f"AI 모델 아티팩트 복원 실패: {e}")
+            raise
+    
+    def _menu_texts(self):
+        """콘텐츠 특성 추출용 메뉴 텍스트 (메뉴명 + 카테고리)"""
+        return (self.menus_df['menu_name'].fillna('') + ' ' + 
+                self.menus_df['category'].fillna('')).tolist()
+    
+    def _prepare_content_features(self, base_model=None):
         """메뉴 설명 기반 콘텐츠 특성 추출"""
-        menu_texts = (self.menus_df['menu_name'].fillna('') + ' ' + 
-                     self.menus_df['category'].fillna('')).tolist()
+        self.menu_texts = self._menu_texts()
+        
+        reused_rows = None
+        self.content_reused = False
+        if base_model is not None and base_model.content_vectorizer_kind == self.content_vectorizer_kind:
+            reused_rows = self._transform_changed_menus(base_model)
+            self.content_changes_since_fit = base_model.content_changes_since_fit + int((reused_rows < 0).sum())
+            
+            # 고정 어휘로 변환한 메뉴가 많아지면 어휘가 실제 메뉴를 대표하지 못하므로 전체 재학습
+            if (self.content_vectorizer_kind == 'tfidf' and
+                    self.content_changes_since_fit > CONTENT_REFIT_FRACTION * len(self.menu_texts)):
+                print(f"콘텐츠 어휘 drift - 변경 {self.content_changes_since_fit}개, 전체 재학습")
+                reused_rows = None
+                self.content_reused = False
+        
+        if reused_rows is None:
+            self.content_changes_since_fit = 0
+            if self.content_vectorizer_kind == 'tfidf':
+                self.content_vectorizer = TfidfVectorizer(max_features=50, analyzer='char', ngram_range=(1, 3))
+            self.content_features = self.content_vectorizer.fit_transform(self.menu_texts)
         
-        self.content_features = self.content_vectorizer.fit_transform(menu_texts)
-        self.menu_similarity_matrix = cosine_similarity(self.content_features)
+        if self.similarity_neighbors:
+            self.menu_similarity_matrix = None
+            if reused_rows is not None and base_model.neighbor_index is not None:
+                # 신규/변경 메뉴와 이웃을 잃은 메뉴의 행만 다시 계산
+                self.neighbor_index = base_model.neighbor_index.updated(
+                    self.content_features, reused_rows, k=self.similarity_neighbors
+                )
+            else:
+                self.neighbor_index = SimilarityNeighborIndex.build(self.content_features, k=self.similarity_neighbors)
+            print(f"유사 메뉴 이웃 인덱스 구축 완료 - 메뉴당 {self.neighbor_index.k}개")
+        else:
+            self.neighbor_index = None
+            if reused_rows is not None and base_model.menu_similarity_matrix is not None:
+                self.menu_similarity_matrix = self._update_similarity_matrix(base_model, reused_rows)
+            else:
+                self.menu_similarity_matrix = cosine_similarity(self.content_features)
         print(f"콘텐츠 특성 벡터화 완료 - 차원: {self.content_features.shape}")
+    
+    def _transform_changed_menus(self, base_model):
+        """기존 모델의 어휘/idf(또는 해시 어휘)를 그대로 쓰고 텍스트가 바뀐(새로 생긴) 메뉴만 변환
+        
+        메뉴별로 기존 모델에서 재사용한 행 위치 배열을 반환 (새로 변환한 메뉴는 -1)
+        """
+        self.content_vectorizer = base_model.content_vectorizer
+        self.content_reused = True
+        
+        old_rows = {}
+        for row, text in enumerate(base_model.menu_texts):
+            old_rows.setdefault(text, row)
+        reused_rows = np.array([old_rows.get(text, -1) for text in self.menu_texts], dtype=int)
+        reused = np.flatnonzero(reused_rows >= 0)
+        changed = np.flatnonzero(reused_rows < 0)
+        
+        # 재사용 행과 새 행을 쌓은 뒤 원래 메뉴 순서로 재배열 (삭제만 있으면 새로 변환할 행 없음)
+        blocks = [sparse.csr_matrix(base_model.content_features)[reused_rows[reused]]]
+        if len(changed):
+            blocks.append(self.content_vectorizer.transform([self.menu_texts[i] for i in changed]))
+        stacked = sparse.vstack(blocks).tocsr()
+        order = np.empty(len(self.menu_texts), dtype=int)
+        order[reused] = np.arange(len(reused))
+        order[changed] = len(reused) + np.arange(len(changed))
+        self.content_features = stacked[order]
+        
+        print(f"변경 메뉴만 콘텐츠 변환 - 신규/변경 {len(changed)}개, 재사용 {len(reused)}개")
+        return reused_rows
+    
+    def _update_similarity_matrix(self, base_model, reused_rows):
+        """재사용한 메뉴 쌍의 유사도는 복사하고, 바뀐 메뉴의 행/열만 새로 계산"""
+        n = len(reused_rows)
+        reused = np.flatnonzero(reused_rows >= 0)
+        changed = np.flatnonzero(reused_rows < 0)
+        
+        similarity = np.empty((n, n))
+        similarity[np.ix_(reused, reused)] = base_model.menu_similarity_matrix[
+            np.ix_(reused_rows[reused], reused_rows[reused])
+        ]
+        if len(changed):
+            block = cosine_similarity(self.content_features[changed], self.content_features)
+            similarity[changed, :] = block
+            similarity[:, changed] = block.T
+        return similarity
+    
+    def with_menu_changes(self, upserts=None, removed_ids=None):
+        """메뉴 추가/수정/삭제를 반영한 새 모델 생성 (바뀐 메뉴만 다시 계산, 현재 모델은 그대로)
         
+        upserts: 메뉴 행 DataFrame(또는 dict 리스트) - menu_id가 있으면 제자리에서 수정, 없으면 끝에 추가
+        removed_ids: 삭제할 menu_id 목록
+        """
+        menus = self.menus_df.reset_index(drop=True)
+        if removed_ids:
+            removed = {str(menu_id) for menu_id in removed_ids}
+            menus = menus[~menus['menu_id'].astype(str).isin(removed)].reset_index(drop=True)
+        
+        if upserts is not None and len(upserts):
+            upserts = pd.DataFrame(upserts).reset_index(drop=True)
+            existing = {}
+            for position, menu_id in enumerate(menus['menu_id'].astype(str)):
+                existing.setdefault(menu_id, position)
+            targets = upserts['menu_id'].astype(str).map(existing)
+            updates = upserts[targets.notna()]
+            if len(updates):
+                rows = targets[targets.notna()].astype(int).to_numpy()
+                menus = menus.copy()
+                for column in updates.columns.intersection(menus.columns):
+                    menus[column] = menus[column].astype(object)
+                    menus.loc[rows, column] = updates[column].to_numpy()
+            menus = pd.concat([menus, upserts[targets.isna()]], ignore_index=True)
+        
+        return AdvancedFoodRecommendationAI(
+            menus, self.restaurants_df, user_interactions_df=self.user_interactions_df,
+            similarity_neighbors=self.similarity_neighbors,
+            cache_size=self.result_cache.max_size, cache_ttl=self.result_cache.ttl_seconds,
+            cache_quantization=self.cache_quantization, base_model=self, event_log=self.event_log,
+            content_vectorizer=self.content_vectorizer_kind, context_rules=self.context_rules
+        )
+    
     def _prepare_size_features(self):
         """용기 크기 특성 정규화"""
         size_features = self.menus_df[['width', 'length', 'height']].values
@@ -162,22 +421,99 @@ class AdvancedFoodRecommendationAI:
         self.normalized_popularity = self.popularity_scaler.fit_transform(popularity_scores)
         print("인기도 특성 정규화 완료")
     
-    def get_contextual_weights(self, current_time=None):
-        """상황별 가중치 계산"""
-        if current_time is None:
-            current_time = datetime.now()
+    def _prepare_menu_arrays(self):
+        """벡터화 점수 계산을 위한 컬럼형 메뉴 카탈로그 구축"""
+        self.catalog = MenuCatalog.from_frame(self.menus_df)
+        self._use_catalog_columns()
+        print(f"메뉴 카탈로그 구축 완료 - {self.catalog.nbytes / 1024:.1f}KB")
+    
+    def _use_catalog_columns(self):
+        """카탈로그 컬럼을 점수 계산용 속성으로 연결하고 레스토랑 정보 테이블 구축"""
+        self.menu_widths = self.catalog.widths
+        self.menu_lengths = self.catalog.lengths
+        self.menu_heights = self.catalog.heights
+        self.menu_prices = self.catalog.prices
+        self.menu_popularity = self.catalog.popularity
+        
+        # 레스토랑 코드 -> (이름, place_id) (요청마다 해시 조회하지 않도록 코드로 인덱싱)
+        _, first_positions = np.unique(self.catalog.restaurant_codes, return_index=True)
+        original_ids = self.menus_df['restaurant_id'].to_numpy(dtype=object)[first_positions]
+        self.restaurant_info_by_code = [self.get_restaurant_info(restaurant_id) for restaurant_id in original_ids]
+    
+    def _prepare_fit_index(self):
+        """용기 크기 적합성 인덱스와 카테고리/가격 필터 인덱스 구축"""
+        self.fit_index = ContainerFitIndex(self.menu_widths, self.menu_lengths, self.menu_heights)
+        self.filter_index = MenuFilterIndex(self.catalog.category_codes, self.catalog.prices)
+        print("용기 적합성/필터 인덱스 구축 완료")
+    
+    def _prepare_similar_index(self, base_model=None):
+        """콘텐츠 벡터(특성이 많으면 SVD 축소)로 유사 메뉴 ANN 인덱스 구축
         
-        hour = current_time.hour
-        is_weekend = current_time.weekday() >= 5
+        base_model과 어휘를 공유하면 그 투영 행렬과 클러스터 중심을 재사용해 새 벡터만 배정 (k-means 생략)
+        """
+        started = time.perf_counter()
+        features = self.content_features
+        reuse = (self.content_reused and base_model is not None and base_model.similar_index is not None)
+        if reuse:
+            projection = base_model.similar_projection
+        elif min(features.shape) > ANN_DIMENSIONS:
+            projection = TruncatedSVD(n_components=ANN_DIMENSIONS, random_state=42).fit(features).components_
+        else:
+            projection = None
+        
+        if projection is not None:
+            vectors = np.asarray(features @ projection.T)
+        else:
+            vectors = features.toarray() if sparse.issparse(features) else np.asarray(features)
         
-        if is_weekend:
-            return self.contextual_weights['weekend']
-        elif 6 <= hour < 11:
-            return self.contextual_weights['morning']
-        elif 11 <= hour < 15:
-            return self.contextual_weights['lunch']
+        if reuse:
+            self.similar_index = ClusteredVectorIndex.build(vectors, centroids=base_model.similar_index.centroids)
         else:
-            return self.contextual_weights['dinner']
+            self.similar_index = ClusteredVectorIndex.build(vectors, n_lists=ANN_LISTS)
+        self.similar_projection = projection
+        print(f"유사 메뉴 ANN 인덱스 구축 완료 - 차원 {vectors.shape[1]}, "
+              f"클러스터 {self.similar_index.n_lists}개{' (중심 재사용)' if reuse else ''}, "
+              f"{time.perf_counter() - started:.2f}초")
+    
+    def _prepare_context_engine(self):
+        """상황 규칙을 (상황 구간 × 카테고리) 배수 표로, 레스토랑 영업시간을 비트맵으로 컴파일"""
+        self.context_engine = ContextEngine.compile(self.context_rules, self.catalog, self.restaurants_df)
+        print(f"상황 모델 컴파일 완료 - 구간 {len(self.context_engine.labels)}개, "
+              f"영업시간 {self.context_engine.parsed_hours}/{len(self.catalog.restaurant_ids)}개 가게")
+    
+    def _exclude_closed(self, positions, context):
+        """영업시간 밖인 가게의 메뉴를 제외한 위치 배열과 제외한 개수"""
+        if not FILTER_CLOSED_RESTAURANTS:
+            return positions, 0
+        open_mask = self.context_engine.is_open(context, self.catalog.restaurant_codes[positions])
+        return positions[open_mask], int(len(positions) - open_mask.sum())
+    
+    def _prepare_static_feature_table(self):
+        """요청(용기 크기, 시간)과 무관한 메뉴별 점수 항을 연속 배열로 사전 계산"""
+        n = len(self.menus_df)
+        
+        # 콘텐츠 점수: 유사 메뉴 상위 5개 개수 * 2 (메뉴에만 의존하므로 한 번만 계산)
+        available = self.neighbor_index.k if self.neighbor_index is not None else n - 1
+        self.static_content_scores = np.full(n, min(5, max(0, available)) * 2, dtype=float)
+        
+        # 최종 점수에 더해지는 가중 항
+        self.static_content_terms = np.ascontiguousarray(self.static_content_scores * 0.15)
+        self.static_popularity_terms = np.ascontiguousarray(self.menu_popularity.astype(float) * 2 * 0.2)
+        
+        # 선호도 모델 입력용 카테고리 원-핫 행렬
+        preference_codes = np.array([self.catalog.category_code(c) for c in self.PREFERENCE_CATEGORIES])
+        self.category_one_hot = np.ascontiguousarray(
+            (self.catalog.category_codes[:, None] == preference_codes[None, :]).astype(float)
+        )
+        print("메뉴별 정적 점수 테이블 구축 완료")
+    
+    def get_context_bucket(self, current_time=None):
+        """현재 시간의 상황 구간 이름 (기본 규칙: morning / lunch / dinner / weekend)"""
+        return self.context_engine.resolve(current_time).label
+    
+    def get_contextual_weights(self, current_time=None):
+        """상황별 가중치 계산"""
+        return self.context_engine.resolve(current_time).weights
     
     def calculate_advanced_fit_score(self, user_width, user_length, user_height, 
                                    menu_width, menu_length, menu_height):
@@ -210,8 +546,51 @@ class AdvancedFoodRecommendationAI:
         final_score = volume_score * 0.7 + balance_score * 0.3
         return min(100, max(0, final_score))
     
+    def calculate_advanced_fit_scores(self, user_width, user_length, user_height,
+                                      menu_widths, menu_lengths, menu_heights):
+        """calculate_advanced_fit_score의 벡터화 버전 - (적합성 점수 배열, 부피 활용률 배열) 반환"""
+        menu_widths = np.asarray(menu_widths, dtype=float)
+        menu_lengths = np.asarray(menu_lengths, dtype=float)
+        menu_heights = np.asarray(menu_heights, dtype=float)
+        
+        fits = (menu_widths <= user_width) & (menu_lengths <= user_length) & (menu_heights <= user_height)
+        
+        user_volume = user_width * user_length * user_height
+        utilization_rate = (menu_widths * menu_lengths * menu_heights) / user_volume * 100
+        
+        ratios = np.stack([menu_widths / user_width, menu_lengths / user_length, menu_heights / user_height])
+        balance_score = np.maximum(0, 1 - ratios.std(axis=0)) * 100
+        
+        volume_score = self._volume_scores(utilization_rate)
+        final_scores = np.clip(volume_score * 0.7 + balance_score * 0.3, 0, 100)
+        return np.where(fits, final_scores, 0.0), utilization_rate
+    
+    @staticmethod
+    def _volume_scores(utilization_rate):
+        """부피 활용률(%) 배열의 부피 점수 (75~85% 최고점, 45~90% 구간 밖은 활용률 × 0.8)"""
+        return np.select(
+            [
+                (utilization_rate >= 75) & (utilization_rate <= 85),
+                (utilization_rate >= 60) & (utilization_rate < 75),
+                (utilization_rate > 85) & (utilization_rate <= 90),
+                (utilization_rate >= 45) & (utilization_rate < 60),
+            ],
+            [
+                100,
+                80 + (utilization_rate - 60) * 1.33,
+                100 - (utilization_rate - 85) * 2,
+                50 + (utilization_rate - 45) * 2,
+            ],
+            default=np.maximum(0, utilization_rate * 0.8)
+        )
+    
     def get_content_based_recommendations(self, menu_idx, top_k=10):
         """콘텐츠 기반 유사 메뉴 추천"""
+        if self.neighbor_index is not None:
+            if menu_idx >= len(self.neighbor_index):
+                return []
+            return self.neighbor_index.neighbors(menu_idx, top_k).tolist()
+        
         if menu_idx >= len(self.menu_similarity_matrix):
             return []
         
@@ -219,30 +598,212 @@ class AdvancedFoodRecommendationAI:
         similar_indices = np.argsort(similarity_scores)[::-1][1:top_k+1]
         return similar_indices.tolist()
     
+    def _text_vector(self, text):
+        """자유 텍스트를 ANN 인덱스와 같은 공간의 벡터로 변환"""
+        vector = self.content_vectorizer.transform([text])
+        if self.similar_projection is not None:
+            return np.asarray(vector @ self.similar_projection.T)[0]
+        return vector.toarray()[0]
+    
+    def get_similar_menus(self, menu_id=None, text=None, top_k=10, n_probe=None, exact=False):
+        """menu_id 또는 자유 텍스트(메뉴명 등)와 비슷한 메뉴 검색 ("more like this")
+        
+        n_probe: 탐색할 클러스터 수 (기본 ANN_PROBES, 클수록 정확하지만 느림)
+        exact: True면 전체 메뉴와 비교 (정확한 결과, 대규모 카탈로그에서는 느림)
+        """
+        try:
+            if top_k <= 0:
+                return {"status": "error", "message": "top_k는 0보다 커야 합니다.", "data": []}
+            
+            index = self.similar_index
+            exclude = None
+            if menu_id is not None:
+                position = self.catalog.position(menu_id)
+                if position < 0:
+                    return {"status": "error", "message": "해당 메뉴를 찾을 수 없습니다.", "data": []}
+                vector, exclude, query = index.vectors[position], position, {"menu_id": str(menu_id)}
+            elif text:
+                vector, query = self._text_vector(text), {"text": text}
+            else:
+                return {"status": "error", "message": "menu_id 또는 text가 필요합니다.", "data": []}
+            
+            n_probe = n_probe or ANN_PROBES
+            if exact:
+                positions, scores = index.search_exact(vector, top_k, exclude=exclude)
+            else:
+                positions, scores = index.search(vector, top_k, n_probe=n_probe, exclude=exclude)
+            
+            similar_menus = []
+            for position, score in zip(positions, scores):
+                menu = self.catalog.menu_info(position)
+                restaurant_name, place_id = self.restaurant_info_by_code[self.catalog.restaurant_codes[position]]
+                menu.update({
+                    "restaurant_name": str(restaurant_name),
+                    "similarity": round(float(score), 4),
+                    "place_id": place_id
+                })
+                similar_menus.append(menu)
+            
+            return {
+                "status": "success",
+                "message": f"비슷한 메뉴 {len(similar_menus)}개를 찾았습니다.",
+                "data": similar_menus,
+                "metadata": {
+                    "query": query,
+                    "search": "exact" if exact else "ivf",
+                    "n_probe": None if exact else min(n_probe, index.n_lists),
+                    "n_lists": index.n_lists
+                }
+            }
+            
+        except Exception as e:
+            print(f"유사 메뉴 검색 오류: {e}")
+            return {"status": "error", "message": f"유사 메뉴 검색 중 오류 발생: {str(e)}", "data": []}
+    
     def predict_user_preference(self, user_features):
         """사용자 선호도 예측"""
+        if not self.preference_model_fitted:
+            return 5.0
         try:
-            if hasattr(self.preference_model, 'predict'):
-                return self.preference_model.predict([user_features])[0]
-            else:
-                return 5.0
+            return self.preference_model.predict([user_features])[0]
         except:
             return 5.0
+    
+    def predict_user_preferences(self, feature_matrix):
+        """사용자 선호도 일괄 예측 (후보 전체에 대해 predict 1회 호출, 미학습 모델은 기본값 5.0)"""
+        if not self.preference_model_fitted or len(feature_matrix) == 0:
+            return np.full(len(feature_matrix), 5.0)
+        try:
+            return np.asarray(self.preference_model.predict(feature_matrix), dtype=float)
+        except:
+            return np.full(len(feature_matrix), 5.0)
+    
+    def _build_preference_features(self, user_width, user_length, user_height, positions):
+        """선호도 모델 입력 특성 행렬 생성 (용기 크기, 가격, 인기도, 카테고리 원-핫)
+        
+        용기 크기는 스칼라(요청 1건) 또는 positions와 같은 길이의 배열(상호작용 로그) 모두 허용
+        """
+        n = len(positions)
+        return np.column_stack([
+            np.broadcast_to(np.asarray(user_width, dtype=float), (n,)),
+            np.broadcast_to(np.asarray(user_length, dtype=float), (n,)),
+            np.broadcast_to(np.asarray(user_height, dtype=float), (n,)),
+            self.menu_prices[positions],
+            self.menu_popularity[positions],
+            self.category_one_hot[positions],
+        ])
+    
+    def _preference_scores(self, user_width, user_length, user_height, positions):
+        """후보 메뉴별 선호도 점수 (0~100, 미학습 모델은 특성 행렬을 만들지 않고 기본값 50)"""
+        if not self.preference_model_fitted:
+            return np.full(len(positions), 50.0)
+        features = self._build_preference_features(user_width, user_length, user_height, positions)
+        return self.predict_user_preferences(features) * 10
+    
+    def _preference_bounds(self):
+        """선호도 점수(0~100)가 가질 수 있는 (하한, 상한) - 랜덤 포레스트는 트리별 잎 값 범위의 평균
+        
+        예측 실패 시 기본값 50도 포함, 범위를 알 수 없는 모델이면 None
+        """
+        if not self.preference_model_fitted:
+            return 50.0, 50.0
+        estimators = getattr(self.preference_model, 'estimators_', None)
+        if not estimators:
+            return None
+        low = np.mean([estimator.tree_.value.min() for estimator in estimators]) * 10
+        high = np.mean([estimator.tree_.value.max() for estimator in estimators]) * 10
+        return min(low, 50.0), max(high, 50.0)
+    
+    def train_preference_model(self, user_interactions_df=None):
+        """사용자 상호작용 데이터로 선호도 모델 학습 (학습 여부 반환)
+        
+        필수 컬럼: menu_id, rating (0~10 척도)
+        선택 컬럼: container_width, container_length, container_height (없으면 메뉴 크기 사용)
+        """
+        if user_interactions_df is not None:
+            self.user_interactions_df = user_interactions_df
+        interactions = self.user_interactions_df
+        self.preference_model_fitted = False
+        
+        if interactions.empty or not {'menu_id', 'rating'}.issubset(interactions.columns):
+            print("선호도 모델 학습 건너뜀 - 상호작용 데이터 없음")
+            return False
+        
+        menu_ids = self.menus_df['menu_id'].astype(str)
+        menu_positions = pd.Series(np.arange(len(menu_ids)), index=menu_ids)
+        menu_positions = menu_positions[~menu_positions.index.duplicated()]
+        
+        positions = interactions['menu_id'].astype(str).map(menu_positions)
+        ratings = pd.to_numeric(interactions['rating'], errors='coerce')
+        valid = (positions.notna() & ratings.notna()).to_numpy()
+        if valid.sum() < self.min_training_interactions:
+            print(f"선호도 모델 학습 건너뜀 - 유효 상호작용 {int(valid.sum())}개 (최소 {self.min_training_interactions}개)")
+            return False
+        
+        positions = positions[valid].astype(int).to_numpy()
+        container_dims = []
+        for column, menu_values in [('container_width', self.menu_widths),
+                                    ('container_length', self.menu_lengths),
+                                    ('container_height', self.menu_heights)]:
+            if column in interactions.columns:
+                values = pd.to_numeric(interactions[column], errors='coerce').to_numpy(dtype=float)[valid]
+                container_dims.append(np.where(np.isnan(values), menu_values[positions], values))
+            else:
+                container_dims.append(menu_values[positions])
+        
+        features = self._build_preference_features(*container_dims, positions)
+        self.preference_model.fit(features, ratings.to_numpy(dtype=float)[valid])
+        self.preference_model_fitted = True
+        self.invalidate_cache()
+        print(f"선호도 모델 학습 완료 - 상호작용 {len(positions)}개")
+        return True
 
-    def _calculate_diversity_bonus(self, current_recommendations, new_category):
-        """추천 결과의 다양성을 증진하기 위한 보너스 계산"""
-        if not current_recommendations:
-            return 0
+    def _rerank_diverse(self, positions, scores, top_k):
+        """최대 주변 관련성(MMR) 다양성 재정렬 - 점수 상위 MMR_CANDIDATES개 후보에서 top_k개 선택
         
-        category_counts = {}
-        for rec in current_recommendations:
-            cat = rec['category']
-            category_counts[cat] = category_counts.get(cat, 0) + 1
+        매 단계 (점수 - MMR_DIVERSITY_WEIGHT × 이미 고른 메뉴와의 최대 유사도)가 가장 큰 후보를 고름
+        유사도 = 0.5 × 같은 카테고리 여부 + 0.5 × 콘텐츠 코사인 유사도
+        (후보끼리의 콘텐츠 유사도는 밀집 행렬 곱 한 번으로 계산하고, 고른 메뉴의 행으로 최대값을 갱신 - 동점은 점수 순위 우선)
+        """
+        candidates = self._select_top_k(scores, max(top_k, MMR_CANDIDATES))
+        if top_k <= 1 or len(candidates) <= 1 or MMR_DIVERSITY_WEIGHT <= 0:
+            return candidates[:top_k]
         
-        if new_category not in category_counts:
-            return 5
+        candidate_positions = positions[candidates]
+        codes = self.catalog.category_codes[candidate_positions]
+        features = self.content_features[candidate_positions]
+        features = features.toarray() if sparse.issparse(features) else np.asarray(features)
+        content_similarity = features @ features.T
+        relevance = scores[candidates].astype(float)
+        max_similarity = np.zeros(len(candidates))
+        available = np.ones(len(candidates), dtype=bool)
+        
+        selected = []
+        for _ in range(min(top_k, len(candidates))):
+            marginal = np.where(available, relevance - MMR_DIVERSITY_WEIGHT * max_similarity, -np.inf)
+            best = int(np.argmax(marginal))
+            selected.append(best)
+            available[best] = False
+            
+            similarity = 0.5 * (codes == codes[best]) + 0.5 * content_similarity[best]
+            np.maximum(max_similarity, similarity, out=max_similarity)
+        return candidates[selected]
+    
+    @staticmethod
+    def _select_top_k(scores, top_k):
+        """argpartition 기반 상위 k개 선택 - 동점은 후보 순서를 유지 (안정 정렬과 동일한 결과)"""
+        n = len(scores)
+        if top_k <= 0 or n == 0:
+            return np.zeros(0, dtype=int)
+        if top_k < n:
+            partition = np.argpartition(-scores, top_k - 1)[:top_k]
+            threshold = scores[partition].min()
+            above = np.flatnonzero(scores > threshold)
+            ties = np.flatnonzero(scores == threshold)[:top_k - len(above)]
+            selected = np.concatenate([above, ties])
         else:
-            return max(0, 3 - category_counts[new_category])
+            selected = np.arange(n)
+        return selected[np.argsort(-scores[selected], kind='stable')]
     
     def _generate_explanation(self, fit_score, preference_score, content_score, contextual_multiplier):
         """추천 이유 생성"""
@@ -264,177 +825,568 @@ class AdvancedFoodRecommendationAI:
         
         return " • ".join(explanations) if explanations else "균형 잡힌 추천입니다"
     
-    def _log_recommendations(self, user_id, width, length, height, recommendations, timestamp):
-        """추천 결과 로깅"""
+    def _log_recommendations(self, user_id, width, length, height, recommendations, timestamp,
+                             context_bucket=None, filters=None, cache_hit=False):
+        """추천 결과 로깅 (이벤트 로그가 있으면 큐에 넣기만 하고 바로 반환)"""
         log_entry = {
+            "event_type": "recommendation",
             "user_id": user_id,
             "timestamp": timestamp.isoformat() if timestamp else datetime.now().isoformat(),
             "container_size": {"width": width, "length": length, "height": height},
+            "context_bucket": context_bucket,
+            "filters": filters or {},
             "recommendations": [r["menu_id"] for r in recommendations],
+            "items": [
+                {
+                    "menu_id": r["menu_id"],
+                    "rank": rank,
+                    "final_score": r["scores"]["final_score"],
+                    "fit_score": r["scores"]["fit_score"],
+                    "preference_score": r["scores"]["preference_score"]
+                }
+                for rank, r in enumerate(recommendations, 1)
+            ],
+            "cache_hit": cache_hit,
             "algorithm_version": "hybrid_v2.0"
         }
-        print(f"추천 로그: 사용자 {user_id}, 추천 {len(recommendations)}개")
+        if self.event_log is not None:
+            self.event_log.log(log_entry)
+        if user_id:
+            print(f"추천 로그: 사용자 {user_id}, 추천 {len(recommendations)}개")
+    
+    def log_feedback(self, menu_id, rating, user_id=None, width=None, length=None, height=None):
+        """추천 메뉴에 대한 사용자 평점(0~10)을 feedback 이벤트로 기록 (선호도 모델 학습 데이터)"""
+        if self.catalog.position(menu_id) < 0:
+            return {"status": "error", "message": f"메뉴를 찾을 수 없습니다: {menu_id}"}
+        
+        feedback_entry = {
+            "event_type": "feedback",
+            "user_id": user_id,
+            "timestamp": datetime.now().isoformat(),
+            "container_size": {"width": width, "length": length, "height": height},
+            "items": [{"menu_id": str(menu_id), "rating": float(rating)}]
+        }
+        recorded = self.event_log.log(feedback_entry) if self.event_log is not None else False
+        return {"status": "success", "recorded": recorded}
 
+    def _filter_mask(self, positions, preferred_category=None, min_price=None, max_price=None):
+        """주어진 메뉴 위치들에 카테고리/가격 조건을 적용한 불리언 마스크"""
+        return self.catalog.filter_mask(positions, preferred_category, min_price, max_price)
+    
+    def _filter_positions(self, preferred_category=None, min_price=None, max_price=None):
+        """카테고리/가격 조건을 만족하는 메뉴 위치 (필터 인덱스 조회, 조건이 없으면 None)"""
+        category_code = self.catalog.category_code(preferred_category) if preferred_category else None
+        return self.filter_index.query(category_code, min_price, max_price)
+    
+    def _quantize_dimension(self, value):
+        """캐시 키용 용기 크기 양자화 (단위 내림 - 같은 구간의 용기끼리 캐시 항목 공유)"""
+        if not self.cache_quantization or value <= 0:
+            return value
+        quantized = math.floor(value / self.cache_quantization) * self.cache_quantization
+        return quantized if quantized > 0 else value
+    
+    @staticmethod
+    def _cached_result_fits(entry, container):
+        """양자화 키로 찾은 캐시 항목을 이 용기에 쓸 수 있는지 (추천 메뉴가 모두 실제 용기에 들어가야 함)"""
+        scored_container, result = entry
+        if scored_container == container:
+            return True
+        width, length, height = container
+        return all(item["size"]["width"] <= width and item["size"]["length"] <= length and
+                   item["size"]["height"] <= height for item in result["data"])
+    
+    def invalidate_cache(self):
+        """추천 결과 캐시 무효화 (메뉴 데이터나 모델이 바뀐 경우)"""
+        self.result_cache.clear()
+    
+    def cache_stats(self):
+        """추천 결과 캐시 상태와 적중/미스 카운터"""
+        stats = self.result_cache.stats()
+        stats["quantization"] = self.cache_quantization
+        return stats
+    
     def get_hybrid_recommendations(self, user_width, user_length, user_height,
                                  preferred_category=None, top_k=5, user_id=None,
-                                 min_price=None, max_price=None, current_time=None):
-        """하이브리드 추천 시스템"""
+                                 min_price=None, max_price=None, current_time=None, include_timings=False):
+        """하이브리드 추천 시스템 (입력과 상황 구간이 같은 요청은 캐시된 결과 사용)
+        
+        include_timings=True면 metadata["timings_ms"]에 단계별 소요 시간(ms)을 포함
+        """
+        timer = StageTimer()
+        if current_time is None:
+            current_time = datetime.now()
+        context = self.context_engine.resolve(current_time)
+        result, cache_hit = self._cached_hybrid_result(user_width, user_length, user_height, preferred_category,
+                                                       top_k, min_price, max_price, current_time, context, timer)
+        
+        if (user_id or self.event_log is not None) and result["status"] == "success":
+            self._log_recommendations(user_id, user_width, user_length, user_height,
+                                    result["data"], current_time,
+                                    context_bucket=context.label,
+                                    filters={"category": preferred_category,
+                                             "min_price": min_price, "max_price": max_price},
+                                    cache_hit=cache_hit)
+            timer.mark("event_log")
+        
+        if include_timings and "metadata" in result:
+            result["metadata"]["timings_ms"] = timer.as_ms()
+        return result
+    
+    def _cached_hybrid_result(self, user_width, user_length, user_height, preferred_category, top_k,
+                              min_price, max_price, current_time, context, timer):
+        """캐시를 거친 하이브리드 추천 결과 사본과 캐시 적중 여부 (미스면 계산 후 저장)"""
+        container = (user_width, user_length, user_height)
+        
+        # 양자화는 캐시 키에만 적용 - 캐시 항목에는 점수를 계산한 실제 용기 크기를 함께 저장
+        cache_key = (self._quantize_dimension(user_width), self._quantize_dimension(user_length),
+                     self._quantize_dimension(user_height), preferred_category, min_price, max_price,
+                     min(top_k, self.max_recommendations),
+                     context.open_state if FILTER_CLOSED_RESTAURANTS else None, context.label)
+        cached = (self.result_cache.get(cache_key, accept=lambda entry: self._cached_result_fits(entry, container))
+                  if self.result_cache.enabled else None)
+        cache_hit = cached is not None
+        timer.mark("cache_lookup")
+        
+        if cache_hit:
+            scored_container, result = cached
+        else:
+            scored_container = container
+            result = self._compute_hybrid_recommendations(
+                user_width, user_length, user_height, preferred_category, top_k,
+                min_price, max_price, current_time, timer=timer
+            )
+            if result["status"] == "success":
+                self.result_cache.put(cache_key, (container, result))
+        
+        result = self._copy_result(result)
+        if "metadata" in result:
+            result["metadata"]["recommendation_time"] = datetime.now().isoformat()
+            result["metadata"]["cache_hit"] = cache_hit
+            # 같은 양자화 구간의 다른 용기 결과를 재사용한 경우 점수 기준 용기를 함께 알림
+            if scored_container != container:
+                result["metadata"]["container_size"] = f"{user_width}x{user_length}x{user_height}"
+                result["metadata"]["scored_container_size"] = "{}x{}x{}".format(*scored_container)
+        timer.mark("copy")
+        return result, cache_hit
+    
+    @staticmethod
+    def _copy_result(result):
+        """캐시된 추천 결과의 사본 (응답마다 바뀌는 metadata와 메뉴 항목의 dict까지만 복사 - deepcopy보다 빠름)"""
+        copied = dict(result)
+        if "metadata" in copied:
+            copied["metadata"] = dict(copied["metadata"])
+        if "data" in copied:
+            copied["data"] = [{key: dict(value) if isinstance(value, dict) else value for key, value in item.items()}
+                              for item in copied["data"]]
+        return copied
+    
+    def _compute_hybrid_recommendations(self, user_width, user_length, user_height,
+                                        preferred_category=None, top_k=5,
+                                        min_price=None, max_price=None, current_time=None, timer=None):
+        """하이브리드 추천 점수 계산 (캐시 미적용, timer가 있으면 단계별 시간 기록)"""
+        timer = timer or StageTimer()
         try:
             if any(val <= 0 for val in [user_width, user_length, user_height]):
                 return {"status": "error", "message": "용기 크기는 0보다 커야 합니다.", "data": []}
             
             top_k = min(top_k, self.max_recommendations)
             
-            filtered_df = self.menus_df.copy()
-            if preferred_category:
-                filtered_df = filtered_df[filtered_df['category'] == preferred_category]
-            if min_price is not None:
-                filtered_df = filtered_df[filtered_df['price'] >= min_price]
-            if max_price is not None:
-                filtered_df = filtered_df[filtered_df['price'] <= max_price]
-            
-            if len(filtered_df) == 0:
+            # 1. 카테고리/가격 조건은 필터 인덱스로, 용기 크기는 적합성 인덱스로 조회해 교집합
+            selected = self._filter_positions(preferred_category, min_price, max_price)
+            if selected is not None and len(selected) == 0:
                 return {"status": "error", "message": "해당 조건의 메뉴가 없습니다.", "data": []}
+            positions = self.fit_index.query_fitting(user_width, user_length, user_height, within=selected)
             
-            contextual_weights = self.get_contextual_weights(current_time)
-            recommendations = []
+            context = self.context_engine.resolve(current_time)
+            contextual_weights = context.weights
+            positions, closed_excluded = self._exclude_closed(positions, context)
+            total_fitting = len(positions)
+            timer.mark("candidate_filter")
             
-            for idx, menu in filtered_df.iterrows():
-                try:
-                    fit_score = self.calculate_advanced_fit_score(
-                        user_width, user_length, user_height,
-                        menu['width'], menu['length'], menu['height']
-                    )
-                    
-                    if fit_score <= 0:
-                        continue
-                    
-                    original_idx = self.menus_df.index.get_loc(idx)
-                    similar_menus = self.get_content_based_recommendations(original_idx, 5)
-                    content_score = len(similar_menus) * 2
-                    
-                    user_features = [
-                        user_width, user_length, user_height,
-                        menu['price'], menu['popularity_score'],
-                        1 if menu['category'] == '한식' else 0,
-                        1 if menu['category'] == '중식' else 0,
-                        1 if menu['category'] == '일식' else 0,
-                        1 if menu['category'] == '양식' else 0,
-                        1 if menu['category'] == '기타' else 0
-                    ]
-                    preference_score = self.predict_user_preference(user_features) * 10
-                    
-                    contextual_multiplier = contextual_weights.get(menu['category'], 1.0)
-                    
-                    final_score = (
-                        fit_score * 0.4 +
-                        preference_score * 0.25 +
-                        content_score * 0.15 +
-                        menu['popularity_score'] * 2 * 0.2
-                    ) * contextual_multiplier
-                    
-                    category_bonus = self._calculate_diversity_bonus(recommendations, menu['category'])
-                    final_score += category_bonus
-                    
-                    volume_utilization = (menu['width'] * menu['length'] * menu['height']) / \
-                                       (user_width * user_length * user_height) * 100
-                    
-                    restaurant_info = self.restaurants_df[
-                        self.restaurants_df['restaurant_id'] == menu['restaurant_id']
-                    ]
-                    restaurant_name = restaurant_info['name'].iloc[0] if len(restaurant_info) > 0 else "알 수 없음"
-                    place_id = str(restaurant_info['place_id'].iloc[0]) if 'place_id' in restaurant_info.columns and len(restaurant_info) > 0 else None
-                    
-                    explanation = self._generate_explanation(fit_score, preference_score, 
-                                                           content_score, contextual_multiplier)
-                    
-                    recommendation = {
-                        "menu_id": str(menu['menu_id']),
-                        "restaurant_id": str(menu['restaurant_id']),
-                        "restaurant_name": str(restaurant_name),
-                        "menu_name": str(menu['menu_name']),
-                        "category": str(menu['category']),
-                        "price": int(menu['price']),
-                        "size": {
-                            "width": float(menu['width']),
-                            "length": float(menu['length']),
-                            "height": float(menu['height'])
-                        },
-                        "scores": {
-                            "fit_score": round(fit_score, 1),
-                            "preference_score": round(preference_score, 1),
-                            "content_score": round(content_score, 1),
-                            "final_score": round(final_score, 1)
-                        },
-                        "volume_utilization": round(volume_utilization, 1),
-                        "explanation": explanation,
-                        "contextual_boost": round((contextual_multiplier - 1) * 100, 1),
-                        "place_id": place_id
-                    }
-                    
-                    recommendations.append(recommendation)
-                    
-                except Exception as e:
-                    print(f"메뉴 {menu.get('menu_id', 'unknown')} 처리 중 오류: {e}")
+            # 후보가 많으면 활용률 구간 메뉴로 커트라인을 잡고 상위권에 들 수 없는 메뉴 제외
+            if BAND_PRUNE_MIN_CANDIDATES and total_fitting > BAND_PRUNE_MIN_CANDIDATES:
+                positions = self._prune_by_utilization_band(user_width, user_length, user_height, positions,
+                                                            context, max(top_k, MMR_CANDIDATES))
+                timer.mark("band_pruning")
+            
+            # 2. 적합성 점수 일괄 계산
+            fit_scores, volume_utilizations = self.calculate_advanced_fit_scores(
+                user_width, user_length, user_height,
+                self.menu_widths[positions], self.menu_lengths[positions], self.menu_heights[positions]
+            )
+            fitting = fit_scores > 0
+            positions = positions[fitting]
+            fit_scores = fit_scores[fitting]
+            volume_utilizations = volume_utilizations[fitting]
+            timer.mark("fit_scoring")
+            
+            # 3. 콘텐츠, 선호도, 상황, 인기도 점수 컬럼 계산
+            content_terms = self.static_content_terms[positions]
+            popularity_terms = self.static_popularity_terms[positions]
+            timer.mark("content_scoring")
+            
+            preference_scores = self._preference_scores(user_width, user_length, user_height, positions)
+            timer.mark("preference")
+            
+            category_codes = self.catalog.category_codes[positions]
+            contextual_multipliers = self.context_engine.multipliers(context)[category_codes]
+            
+            final_scores = (
+                fit_scores * 0.4 +
+                preference_scores * 0.25 +
+                content_terms +
+                popularity_terms
+            ) * contextual_multipliers
+            timer.mark("ranking")
+            
+            return self._build_hybrid_result(
+                user_width, user_length, user_height, top_k, contextual_weights, positions,
+                fit_scores, preference_scores, contextual_multipliers, final_scores, volume_utilizations,
+                closed_excluded=closed_excluded, total_fitting=total_fitting, timer=timer
+            )
+            
+        except Exception as e:
+            print(f"하이브리드 추천 시스템 오류: {e}")
+            return {"status": "error", "message": f"AI 추천 중 오류 발생: {str(e)}", "data": []}
+
+    def _prune_by_utilization_band(self, user_width, user_length, user_height, positions, context, limit):
+        """활용률 45~90% 구간 메뉴의 점수 하한으로 limit번째 커트라인을 잡고, 구간 밖 메뉴 중
+        점수 상한(균형 점수 만점, 선호도 상한)이 커트라인에 못 미치는 메뉴를 제외한 위치 배열 (원본 순서)
+        
+        반올림 점수 기준으로도 상위 limit개에 들 수 없는 메뉴만 빼므로 MMR 후보와 결과는 전체 계산과 같음
+        """
+        bounds = self._preference_bounds()
+        band = self.fit_index.query_utilization_band(user_width, user_length, user_height, within=positions)
+        if bounds is None or len(band) < limit:
+            return positions
+        preference_low, preference_high = bounds
+        multipliers = self.context_engine.multipliers(context)
+        
+        band_fit, _ = self.calculate_advanced_fit_scores(
+            user_width, user_length, user_height,
+            self.menu_widths[band], self.menu_lengths[band], self.menu_heights[band]
+        )
+        band_scores = (
+            band_fit * 0.4 + preference_low * 0.25 +
+            self.static_content_terms[band] + self.static_popularity_terms[band]
+        ) * multipliers[self.catalog.category_codes[band]]
+        cutoff = np.round(np.partition(band_scores, len(band) - limit)[len(band) - limit] - 1e-6, 1)
+        
+        rest = positions[~np.isin(positions, band, assume_unique=True)]
+        user_volume = user_width * user_length * user_height
+        rest_volumes = self.menu_widths[rest] * self.menu_lengths[rest] * self.menu_heights[rest]
+        fit_high = np.clip(self._volume_scores(rest_volumes / user_volume * 100) * 0.7 + 30, 0, 100)
+        rest_high = (
+            fit_high * 0.4 + preference_high * 0.25 +
+            self.static_content_terms[rest] + self.static_popularity_terms[rest]
+        ) * multipliers[self.catalog.category_codes[rest]]
+        keep = np.round(rest_high + 1e-6, 1) >= cutoff
+        return np.sort(np.concatenate([band, rest[keep]]))
+    
+    def _build_hybrid_result(self, user_width, user_length, user_height, top_k, contextual_weights,
+                             positions, fit_scores, preference_scores, contextual_multipliers,
+                             final_scores, volume_utilizations, closed_excluded=0, total_fitting=None, timer=None):
+        """점수 컬럼으로부터 상위 k개를 골라 하이브리드 추천 응답 생성 (total_fitting: 가지치기 전 후보 수)"""
+        timer = timer or StageTimer()
+        # 반올림된 최종 점수 상위 후보를 MMR로 다양성 재정렬해 k개 선택
+        top_indices = self._rerank_diverse(positions, np.round(final_scores, 1), top_k)
+        timer.mark("ranking")
+        
+        top_recommendations = []
+        for i in top_indices:
+            menu = self.catalog.menu_info(positions[i])
+            fit_score = float(fit_scores[i])
+            preference_score = float(preference_scores[i])
+            content_score = float(self.static_content_scores[positions[i]])
+            contextual_multiplier = float(contextual_multipliers[i])
+            timer.mark("result_build")
+            
+            restaurant_name, place_id = self.restaurant_info_by_code[self.catalog.restaurant_codes[positions[i]]]
+            timer.mark("restaurant_lookup")
+            
+            explanation = self._generate_explanation(fit_score, preference_score,
+                                                   content_score, contextual_multiplier)
+            
+            top_recommendations.append({
+                "menu_id": menu['menu_id'],
+                "restaurant_id": menu['restaurant_id'],
+                "restaurant_name": str(restaurant_name),
+                "menu_name": menu['menu_name'],
+                "category": menu['category'],
+                "price": menu['price'],
+                "size": menu['size'],
+                "scores": {
+                    "fit_score": round(fit_score, 1),
+                    "preference_score": round(preference_score, 1),
+                    "content_score": round(content_score, 1),
+                    "final_score": round(float(final_scores[i]), 1)
+                },
+                "volume_utilization": round(float(volume_utilizations[i]), 1),
+                "explanation": explanation,
+                "contextual_boost": round((contextual_multiplier - 1) * 100, 1),
+                "place_id": place_id
+            })
+        
+        total_fitting = len(positions) if total_fitting is None else total_fitting
+        is_limited = total_fitting > self.max_recommendations
+        
+        if is_limited:
+            message = f"AI가 {len(top_recommendations)}개의 맞춤 메뉴를 추천했습니다. (총 {total_fitting}개 중 상위 {self.max_recommendations}개)"
+        else:
+            message = f"AI가 {len(top_recommendations)}개의 맞춤 메뉴를 추천했습니다."
+        
+        timer.mark("result_build")
+        return {
+            "status": "success",
+            "message": message,
+            "data": top_recommendations,
+            "metadata": {
+                "container_size": f"{user_width}x{user_length}x{user_height}",
+                "algorithm_version": "hybrid_v2.0",
+                "contextual_weights": contextual_weights,
+                "total_candidates": total_fitting,
+                "closed_excluded": closed_excluded,
+                "returned_count": len(top_recommendations),
+                "max_recommendations": self.max_recommendations,
+                "is_limited": is_limited,
+                "recommendation_time": datetime.now().isoformat()
+            }
+        }
+    
+    def get_batch_recommendations(self, containers, current_time=None):
+        """여러 용기의 하이브리드 추천을 한 번에 계산
+        
+        - 같은 조건의 용기는 한 번만 계산하고, 상황 구간은 요청당 한 번 결정
+        - 단일 추천과 같은 결과 캐시를 사용 (표준 용기 목록을 반복 요청하면 캐시에서 응답)
+        - 용기별로 필터/적합성 인덱스가 고른 후보만 점수 계산 (용기 × 전체 메뉴 행렬을 만들지 않음,
+          후보 배열이 CPU 캐시에 머무는 크기라 전체 칸을 이어 붙여 한 번에 계산하는 것보다 빠름)
+        containers: [{"width", "length", "height", "category", "min_price", "max_price", "top_k"}, ...]
+        반환: 용기 순서대로 get_hybrid_recommendations와 같은 형식의 결과 리스트
+        """
+        try:
+            if current_time is None:
+                current_time = datetime.now()
+            context = self.context_engine.resolve(current_time)
+            timer = StageTimer()
+            
+            results, computed = [], {}
+            for container in containers:
+                spec = (container['width'], container['length'], container['height'], container.get('category'),
+                        min(container.get('top_k') or 5, self.max_recommendations),
+                        container.get('min_price'), container.get('max_price'))
+                if spec in computed:
+                    results.append(self._copy_result(computed[spec]))
                     continue
+                result, _ = self._cached_hybrid_result(*spec, current_time, context, timer)
+                computed[spec] = result
+                results.append(result)
+            return results
+            
+        except Exception as e:
+            print(f"일괄 추천 시스템 오류: {e}")
+            error = {"status": "error", "message": f"AI 추천 중 오류 발생: {str(e)}", "data": []}
+            return [dict(error) for _ in containers]
+    
+    def get_packing_recommendations(self, containers, min_price=None, max_price=None, preferred_category=None,
+                                    max_items_per_container=5, keep_upright=True, time_budget_ms=200,
+                                    current_time=None):
+        """여러 용기(또는 가방 하나)를 한 번에 채우는 메뉴 조합 추천
+        
+        containers: [{"width", "length", "height"}, ...]
+        min_price/max_price: 담은 메뉴 총 가격 범위
+        keep_upright: True면 높이 방향은 고정하고 가로/세로 회전만 허용
+        time_budget_ms: 조합 탐색 시간 제한 (넘기면 그때까지의 최선 조합 반환)
+        """
+        try:
+            if not containers:
+                return {"status": "error", "message": "용기가 필요합니다.", "data": []}
+            container_dims = np.array([[c['width'], c['length'], c['height']] for c in containers], dtype=float)
+            if np.any(container_dims <= 0):
+                return {"status": "error", "message": "용기 크기는 0보다 커야 합니다.", "data": []}
             
-            recommendations.sort(key=lambda x: x['scores']['final_score'], reverse=True)
-            top_recommendations = recommendations[:top_k]
+            # 1. 조건(카테고리, 개별 가격 ≤ 총 예산)과 회전 포함 적합성으로 후보 축소
+            selected = self._filter_positions(preferred_category, None, max_price)
+            if selected is not None and len(selected) == 0:
+                return {"status": "error", "message": "해당 조건의 메뉴가 없습니다.", "data": []}
+            positions = np.arange(len(self.catalog)) if selected is None else selected
+            context = self.context_engine.resolve(current_time)
+            positions, closed_excluded = self._exclude_closed(positions, context)
+            if len(positions) == 0:
+                return {"status": "error", "message": "지금 영업 중인 가게의 메뉴가 없습니다.", "data": []}
+            item_dims = np.column_stack([self.menu_widths[positions], self.menu_lengths[positions],
+                                         self.menu_heights[positions]]).astype(float)
+            loads, _ = orientation_loads(item_dims, container_dims, keep_upright)
+            fitting = np.isfinite(loads).any(axis=1)
+            positions, item_dims, loads = positions[fitting], item_dims[fitting], loads[fitting]
+            if len(positions) == 0:
+                return {"status": "error", "message": "용기에 맞는 메뉴가 없습니다.", "data": []}
             
-            if user_id:
-                self._log_recommendations(user_id, user_width, user_length, user_height, 
-                                        top_recommendations, current_time)
+            # 2. 메뉴 가치 (용기와 무관한 콘텐츠/인기도 항 × 상황 가중치) 상위 후보만 탐색
+            contextual_weights = context.weights
+            values = ((self.static_content_terms[positions] + self.static_popularity_terms[positions]) *
+                      self.context_engine.multipliers(context)[self.catalog.category_codes[positions]])
+            order = np.lexsort((positions, -values))[:PACKING_CANDIDATES]
+            positions, item_dims, values, loads = positions[order], item_dims[order], values[order], loads[order]
             
-            total_fitting = len(recommendations)
-            is_limited = total_fitting > self.max_recommendations
+            # 3. 빔 서치로 조합 탐색 (용기마다 실제 배치가 가능한 조합만)
+            assignment, objective, stats = pack_containers(
+                container_dims, item_dims, loads, self.menu_prices[positions].astype(float), values,
+                min_price=min_price, max_price=max_price, max_items=max_items_per_container,
+                beam_width=PACKING_BEAM_WIDTH, time_budget=time_budget_ms / 1000, keep_upright=keep_upright
+            )
+            if not assignment:
+                return {"status": "error", "message": "조건에 맞는 메뉴 조합이 없습니다.", "data": []}
             
-            if is_limited:
-                message = f"AI가 {len(top_recommendations)}개의 맞춤 메뉴를 추천했습니다. (총 {total_fitting}개 중 상위 {self.max_recommendations}개)"
-            else:
-                message = f"AI가 {len(top_recommendations)}개의 맞춤 메뉴를 추천했습니다."
+            packed = [{"container": {"width": float(w), "length": float(l), "height": float(h)},
+                       "items": [], "volume_utilization": 0.0} for w, l, h in container_dims]
+            total_price = 0
+            for candidate, container, orientation in sorted(assignment, key=lambda entry: (entry[1], entry[0])):
+                position = positions[candidate]
+                menu = self.catalog.menu_info(position)
+                restaurant_name, place_id = self.restaurant_info_by_code[self.catalog.restaurant_codes[position]]
+                placed = placed_dimensions(tuple(item_dims[candidate]), orientation)
+                menu.update({
+                    "restaurant_name": str(restaurant_name),
+                    "placed_size": {"width": float(placed[0]), "length": float(placed[1]), "height": float(placed[2])},
+                    "rotated": placed != tuple(item_dims[candidate]),
+                    "score": round(float(values[candidate]), 2),
+                    "place_id": place_id
+                })
+                packed[container]["items"].append(menu)
+                packed[container]["volume_utilization"] += float(item_dims[candidate].prod() / container_dims[container].prod() * 100)
+                total_price += menu['price']
+            for entry in packed:
+                entry["volume_utilization"] = round(entry["volume_utilization"], 1)
             
             return {
                 "status": "success",
-                "message": message,
-                "data": top_recommendations,
+                "message": f"AI가 용기 {len(packed)}개에 메뉴 {len(assignment)}개를 담았습니다.",
+                "data": packed,
                 "metadata": {
-                    "container_size": f"{user_width}x{user_length}x{user_height}",
-                    "algorithm_version": "hybrid_v2.0",
+                    "algorithm_version": "packing_beam_v2",
+                    "total_items": len(assignment),
+                    "total_price": total_price,
+                    "objective": round(float(objective), 2),
+                    "total_candidates": int(fitting.sum()),
+                    "closed_excluded": closed_excluded,
+                    "searched_candidates": len(positions),
+                    "keep_upright": keep_upright,
                     "contextual_weights": contextual_weights,
-                    "total_candidates": total_fitting,
-                    "returned_count": len(top_recommendations),
-                    "max_recommendations": self.max_recommendations,
-                    "is_limited": is_limited,
-                    "recommendation_time": datetime.now().isoformat()
+                    **stats
                 }
             }
             
         except Exception as e:
-            print(f"하이브리드 추천 시스템 오류: {e}")
+            print(f"용기 담기 추천 오류: {e}")
             return {"status": "error", "message": f"AI 추천 중 오류 발생: {str(e)}", "data": []}
+    
+    def get_simple_recommendations(self, width, length, height, top_k=5, preferred_category=None):
+        """간단한 추천 시스템 (기존 호환성, preferred_category를 주면 해당 카테고리만)"""
+        return self.get_simple_recommendation_page(width, length, height, top_k, preferred_category)["recommendations"]
+    
+    def get_simple_recommendation_page(self, width, length, height, top_k=5, preferred_category=None,
+                                       offset=0, cursor=None):
+        """
+        용기에 들어가는 메뉴를 부피 활용률 높은 순으로 한 페이지 반환 (점수 계산 없음)
+        - offset개를 건너뛰거나, 이전 페이지의 next_cursor 다음부터 이어서 조회
+        - 커서는 (부피, 메뉴 위치)라서 같은 모델 안에서만 순서가 보장됨 (리로드 후에는 처음부터)
+        """
+        after = None
+        if cursor:
+            after = decode_page_cursor(cursor)
+            if after is None:
+                return {"status": "error", "message": "잘못된 페이지 커서입니다"}
+    
+        selected = self._filter_positions(preferred_category)
+        # 한 개 더 골라 다음 페이지가 있는지 확인 (들어가는 메뉴 전체를 모으거나 세지 않음)
+        ranked = self.fit_index.query_top_by_volume(width, length, height, offset + top_k + 1,
+                                                    within=selected, after=after)
+        page = ranked[offset:offset + top_k]
+    
+        container_volume = width * length * height
+        recommendations = []
+        for position in page:
+            menu = self.catalog.menu_info(position)
+            menu["volume_utilization"] = round(float(self.fit_index.volumes[position]) / container_volume * 100, 1)
+            recommendations.append(menu)
+    
+        next_cursor = None
+        if len(ranked) > offset + top_k:
+            next_cursor = encode_page_cursor(self.fit_index.volumes[page[-1]], page[-1])
+        return {
+            "status": "success",
+            "recommendations": recommendations,
+            "next_cursor": next_cursor
+        }
+
+def load_feedback_interactions(directory=None):
+    """선호도 모델 학습용 feedback 이벤트 (위치가 비었거나 없으면 빈 DataFrame)"""
+    directory = INTERACTIONS_LOG_DIR if directory is None else directory
+    if not directory or not os.path.isdir(directory):
+        return pd.DataFrame()
+    return read_interaction_log(directory, event_types=("feedback",))
+
+def feedback_fingerprint(directory=None):
+    """feedback 로그 파일 지문 (파일을 읽지 않음, 위치가 비었거나 파일이 없으면 None)"""
+    directory = INTERACTIONS_LOG_DIR if directory is None else directory
+    return log_fingerprint(directory, event_types=("feedback",)) if directory else None
+
+def create_recommendation_ai(artifacts_dir=ARTIFACTS_DIR, use_artifacts=True, rebuild=False,
+                             similarity_neighbors=None, base_model=None, event_log=None,
+                             content_vectorizer=None, interactions_dir=None, train_preferences=True):
+    """
+    추천 모델 생성 팩토리
+    - 원본 CSV와 옵션이 같은 아티팩트 번들이 있으면 학습 없이 로드
+    - 없으면(또는 rebuild=True) CSV로 새로 구축한 뒤 번들 저장 (다음 기동부터 재사용)
+    - base_model을 주면 그 모델의 어휘와 벡터를 재사용해 바뀐 메뉴만 다시 계산 (핫 리로드용)
+    - use_artifacts=False면 디스크 번들을 읽지도 쓰지도 않음
+    - event_log를 주면 추천 결과를 해당 이벤트 로그에 기록
+    - train_preferences=True면 interactions_dir(기본 INTERACTIONS_LOG_DIR)의 feedback 평점으로 선호도 모델을 학습해
+      번들에 저장 (feedback 파일 지문이 번들/base_model과 같으면 로그를 읽지 않고 재사용,
+      평점이 min_training_interactions개 미만이면 기본 선호도 사용)
+    - train_preferences=False면 로그를 읽지 않고 번들에 저장된 선호도 모델만 로드 (프로세스 워커용)
+    """
+    if similarity_neighbors is None:
+        similarity_neighbors = int(os.environ.get("SIMILARITY_NEIGHBORS", "0")) or None
+    if content_vectorizer is None:
+        content_vectorizer = os.environ.get("CONTENT_VECTORIZER", "tfidf")
+    options = {"similarity_neighbors": similarity_neighbors, "content_vectorizer": content_vectorizer}
+    fingerprint = source_fingerprint([MENUS_CSV_PATH, RESTAURANTS_CSV_PATH])
+    feedback = feedback_fingerprint(interactions_dir) if train_preferences else None
+    
+    if use_artifacts and not rebuild:
+        artifacts = load_model_artifacts(artifacts_dir, fingerprint, options)
+        if artifacts is not None:
+            ai = AdvancedFoodRecommendationAI(artifacts.menus_df, artifacts.restaurants_df,
+                                              artifacts=artifacts, event_log=event_log, **options)
+            # 번들을 만든 뒤에 쌓인 평점만 반영해 번들에 다시 저장 (워커는 저장된 모델을 로드만 함)
+            if feedback is not None and feedback != ai.feedback_fingerprint:
+                ai.train_preference_model(load_feedback_interactions(interactions_dir))
+                ai.feedback_fingerprint = feedback
+                try:
+                    save_preference_model(ai, artifacts_dir)
+                except Exception as e:
+                    print(f"선호도 모델 저장 실패: {e}")
+            return ai
+    
+    # base_model이 같은 feedback으로 학습돼 있으면 로그를 읽지 않고 그 모델을 재사용
+    fresh = feedback is not None and (base_model is None or feedback != base_model.feedback_fingerprint)
+    interactions = load_feedback_interactions(interactions_dir) if fresh else None
+    menus_df, restaurants_df = load_menu_data()
+    ai = AdvancedFoodRecommendationAI(menus_df, restaurants_df, user_interactions_df=interactions,
+                                      base_model=base_model, event_log=event_log, **options)
+    if fresh:
+        ai.feedback_fingerprint = feedback
+    
+    # 더미 데이터(원본 CSV 없음)로 만든 모델은 저장하지 않음
+    if use_artifacts and fingerprint is not None:
+        try:
+            save_model_artifacts(ai, artifacts_dir, fingerprint, options)
+        except Exception as e:
+            print(f"모델 아티팩트 저장 실패: {e}")
+    return ai
 
-    def get_simple_recommendations(self, width, length, height, top_k=5):
-        """간단한 추천 시스템 (기존 호환성)"""
-        results = []
-        for idx, menu in self.menus_df.iterrows():
-            if (menu['width'] <= width and menu['length'] <= length and menu['height'] <= height):
-                results.append({
-                    "menu_id": menu['menu_id'],
-                    "menu_name": menu['menu_name'],
-                    "category": menu['category'],
-                    "price": menu['price'],
-                    "size": {
-                        "width": menu['width'],
-                        "length": menu['length'],
-                        "height": menu['height']
-                    }
-                })
-        return results[:top_k]
 
-# 모델 인스턴스 생성
-try:
-    advanced_ai = AdvancedFoodRecommendationAI(menus_df, restaurants_df)
-    print("AI 모델 인스턴스 생성 완료")
-except Exception as e:
-    print(f"AI 모델 인스턴스 생성 실패: {e}")
-    advanced_ai = None
+if __name__ == "__main__":
+    # 배포 빌드 단계: 아티팩트 번들을 새로 구축해 저장
+    create_recommendation_ai(rebuild=True)
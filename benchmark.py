@@ -0,0 +1,432 @@
+"""
+추천 엔진 벤치마크 / 부하 테스트
+
+사용 예:
+    python benchmark.py --sizes 100 1000 10000 --load-menus 1000 --requests 2000 --concurrency 16
+    python benchmark.py --sizes 1000 --baseline benchmark_results/benchmark-20240101-120000.json
+
+- 합성 카탈로그: final_menus_data.csv / restaurants.csv 형태의 데이터를 10² ~ 10⁶개 메뉴로 확장
+- 마이크로벤치마크: _initialize_ai_models, calculate_advanced_fit_score,
+  get_hybrid_recommendations, get_batch_recommendations, get_simple_recommendations
+- 부하 테스트: main.py의 app에 프로세스 내 클라이언트로 동시 요청 (p50/p95/p99, 처리량, 최대 RSS)
+  용기 목록 하나를 단일 요청 반복과 /recommend/batch 한 번으로 보내는 비교 포함
+- 결과는 JSON으로 저장되며 --baseline으로 이전 결과와 비교
+"""
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import shutil
+import tempfile
+import subprocess
+import contextlib
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BASE_DIR, "benchmark_results")
+
+# 이 크기를 넘는 카탈로그는 밀집 유사도 행렬 대신 상위 k 이웃 인덱스 사용
+DENSE_SIMILARITY_LIMIT = 5000
+DEFAULT_NEIGHBORS = 20
+
+# 일괄 추천 비교에 쓰는 용기 수 (표준 용기 목록 한 번 분량)
+BATCH_SIZE = 40
+
+CATEGORIES = ['한식', '중식', '일식', '양식', '기타']
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS (MB)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def summarize(samples_ms):
+    """지연 시간 샘플(ms) 요약 통계"""
+    samples = np.asarray(samples_ms, dtype=float)
+    if len(samples) == 0:
+        return {"count": 0}
+    return {
+        "count": int(len(samples)),
+        "mean_ms": round(float(samples.mean()), 4),
+        "min_ms": round(float(samples.min()), 4),
+        "p50_ms": round(float(np.percentile(samples, 50)), 4),
+        "p95_ms": round(float(np.percentile(samples, 95)), 4),
+        "p99_ms": round(float(np.percentile(samples, 99)), 4),
+        "max_ms": round(float(samples.max()), 4),
+    }
+
+
+def time_calls(fn, args_list):
+    """인자 목록마다 fn을 호출하고 호출별 소요 시간(ms) 반환"""
+    samples = []
+    for args in args_list:
+        started = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+@contextlib.contextmanager
+def quiet():
+    """모델 초기화 중 출력되는 진행 메시지 숨김"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def random_containers(rng, count):
+    """실제 도시락 용기 범위의 무작위 용기 크기 (소수 첫째 자리)"""
+    return np.column_stack([
+        rng.uniform(10, 30, count),
+        rng.uniform(10, 30, count),
+        rng.uniform(3, 15, count),
+    ]).round(1)
+
+
+def _load_seed_data():
+    """원본 CSV를 합성 데이터의 씨앗으로 사용 (없으면 None)"""
+    from ai_model import load_csv_robust, MENUS_CSV_PATH, RESTAURANTS_CSV_PATH
+    try:
+        with quiet():
+            return load_csv_robust(MENUS_CSV_PATH), load_csv_robust(RESTAURANTS_CSV_PATH)
+    except Exception:
+        return None, None
+
+
+def generate_catalog(n_menus, seed=0):
+    """원본 CSV 형태의 합성 메뉴/레스토랑 데이터 생성 (원본 행을 복제하고 크기/가격/인기도를 흔듦)"""
+    rng = np.random.default_rng(seed)
+    seed_menus, seed_restaurants = _load_seed_data()
+    n_restaurants = max(1, n_menus // 4)
+
+    restaurant_ids = np.array([f"R{i:07d}" for i in range(1, n_restaurants + 1)])
+    if seed_restaurants is not None and len(seed_restaurants) > 0:
+        restaurants = seed_restaurants.iloc[rng.integers(0, len(seed_restaurants), n_restaurants)].reset_index(drop=True)
+        restaurants['restaurant_id'] = restaurant_ids
+        restaurants['name'] = restaurants['name'].astype(str) + " " + pd.Series(np.arange(n_restaurants)).astype(str)
+    else:
+        restaurants = pd.DataFrame({
+            'restaurant_id': restaurant_ids,
+            'name': [f'레스토랑_{i}' for i in range(n_restaurants)],
+        })
+
+    if seed_menus is not None and len(seed_menus) > 0:
+        menus = seed_menus.iloc[rng.integers(0, len(seed_menus), n_menus)].reset_index(drop=True)
+        menu_names = menus['menu_name'].astype(str)
+        categories = menus['category'].astype(str)
+        base_width = pd.to_numeric(menus['width'], errors='coerce').fillna(15).to_numpy()
+        base_length = pd.to_numeric(menus['length'], errors='coerce').fillna(15).to_numpy()
+        base_height = pd.to_numeric(menus['height'], errors='coerce').fillna(8).to_numpy()
+        base_price = pd.to_numeric(menus['price'], errors='coerce').fillna(10000).to_numpy()
+    else:
+        menu_names = pd.Series([f'메뉴_{i}' for i in range(n_menus)])
+        categories = pd.Series(rng.choice(CATEGORIES, n_menus))
+        base_width = rng.uniform(10, 25, n_menus)
+        base_length = rng.uniform(10, 25, n_menus)
+        base_height = rng.uniform(3, 10, n_menus)
+        base_price = rng.integers(5000, 20000, n_menus)
+
+    # 메뉴 이름에 변형 번호를 붙여 TF-IDF 어휘가 카탈로그 크기에 따라 달라지게 함
+    variants = pd.Series(rng.integers(1, 50, n_menus)).astype(str)
+    menus = pd.DataFrame({
+        'menu_id': [f"M{i:07d}" for i in range(1, n_menus + 1)],
+        'restaurant_id': restaurant_ids[rng.integers(0, n_restaurants, n_menus)],
+        'menu_name': (menu_names + " " + variants).to_numpy(),
+        'category': categories.to_numpy(),
+        'price': (np.round(base_price * rng.uniform(0.8, 1.2, n_menus) / 100) * 100).astype(int),
+        'width': np.round(base_width * rng.uniform(0.8, 1.2, n_menus), 1),
+        'length': np.round(base_length * rng.uniform(0.8, 1.2, n_menus), 1),
+        'height': np.round(base_height * rng.uniform(0.8, 1.2, n_menus), 1),
+        'popularity_score': np.round(rng.uniform(1, 10, n_menus), 1),
+        'notes': '',
+    })
+    return menus, restaurants
+
+
+def write_catalog(menus, restaurants, directory):
+    """합성 카탈로그를 CSV로 저장하고 (메뉴 경로, 레스토랑 경로) 반환"""
+    os.makedirs(directory, exist_ok=True)
+    menus_path = os.path.join(directory, "final_menus_data.csv")
+    restaurants_path = os.path.join(directory, "restaurants.csv")
+    menus.to_csv(menus_path, index=False, encoding='utf-8')
+    restaurants.to_csv(restaurants_path, index=False, encoding='utf-8')
+    return menus_path, restaurants_path
+
+
+def neighbors_for(n_menus, neighbors):
+    if neighbors is not None:
+        return neighbors or None
+    return DEFAULT_NEIGHBORS if n_menus > DENSE_SIMILARITY_LIMIT else None
+
+
+def run_microbenchmarks(n_menus, iterations, seed=0, neighbors=None):
+    """카탈로그 크기 하나에 대한 마이크로벤치마크"""
+    from ai_model import AdvancedFoodRecommendationAI
+
+    rng = np.random.default_rng(seed)
+    menus, restaurants = generate_catalog(n_menus, seed=seed)
+    similarity_neighbors = neighbors_for(n_menus, neighbors)
+    result = {"menus": n_menus, "restaurants": len(restaurants), "similarity_neighbors": similarity_neighbors}
+
+    started = time.perf_counter()
+    with quiet():
+        ai = AdvancedFoodRecommendationAI(menus, restaurants, similarity_neighbors=similarity_neighbors)
+    result["construct_seconds"] = round(time.perf_counter() - started, 4)
+
+    with quiet():
+        result["initialize_ai_models"] = summarize(time_calls(ai._initialize_ai_models, [()]))
+
+    # 스칼라 적합성 점수: 메뉴 하나씩 (최대 1000개 표본)
+    containers = random_containers(rng, iterations)
+    sample = rng.integers(0, len(ai.menus_df), min(1000, len(ai.menus_df)))
+    rows = [tuple(containers[i % len(containers)]) + (ai.menu_widths[m], ai.menu_lengths[m], ai.menu_heights[m])
+            for i, m in enumerate(sample)]
+    result["calculate_advanced_fit_score"] = summarize(time_calls(ai.calculate_advanced_fit_score, rows))
+
+    # 벡터화 적합성 점수: 전체 메뉴 한 번에
+    result["calculate_advanced_fit_scores"] = summarize(time_calls(
+        lambda w, l, h: ai.calculate_advanced_fit_scores(w, l, h, ai.menu_widths, ai.menu_lengths, ai.menu_heights),
+        [tuple(c) for c in containers]
+    ))
+
+    with quiet():
+        ai.invalidate_cache()
+        cold = time_calls(ai.get_hybrid_recommendations, [tuple(c) for c in containers])
+        warm = time_calls(ai.get_hybrid_recommendations, [tuple(c) for c in containers])
+        ai.invalidate_cache()
+    result["get_hybrid_recommendations"] = summarize(cold)
+    result["get_hybrid_recommendations_cached"] = summarize(warm)
+
+    # 일괄 추천: 같은 용기 목록을 단일 호출 반복과 get_batch_recommendations 한 번으로 비교 (매 회 캐시를 비움)
+    # duplicated는 표준 용기 8종이 섞인 목록 - 일괄 경로는 같은 조건을 한 번만 계산
+    batch_rows = random_containers(rng, BATCH_SIZE)
+    batch_lists = {
+        "distinct": batch_rows,
+        "duplicated": batch_rows[rng.integers(0, 8, BATCH_SIZE)],
+    }
+    repeats = [()] * max(3, min(iterations // BATCH_SIZE, 20))
+    for name, rows in batch_lists.items():
+        batch = [{"width": w, "length": l, "height": h} for w, l, h in rows]
+
+        def loop_calls():
+            ai.invalidate_cache()
+            for w, l, h in rows:
+                ai.get_hybrid_recommendations(w, l, h)
+
+        def batch_call():
+            ai.invalidate_cache()
+            ai.get_batch_recommendations(batch)
+
+        with quiet():
+            loop = summarize(time_calls(loop_calls, repeats))
+            batched = summarize(time_calls(batch_call, repeats))
+            ai.invalidate_cache()
+        result[f"batch_{name}"] = {
+            "containers": BATCH_SIZE,
+            "single_calls": loop,
+            "get_batch_recommendations": batched,
+            "speedup": round(loop["p50_ms"] / max(batched["p50_ms"], 1e-9), 2),
+        }
+
+    result["get_simple_recommendations"] = summarize(time_calls(
+        ai.get_simple_recommendations, [tuple(c) for c in containers]
+    ))
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def run_load_test(n_menus, total_requests, concurrency, seed=0, neighbors=None):
+    """main.py 앱에 대한 HTTP 부하 테스트 (합성 카탈로그를 쓰는 별도 프로세스에서 실행해 RSS를 분리)"""
+    workdir = tempfile.mkdtemp(prefix="food-bench-")
+    menus, restaurants = generate_catalog(n_menus, seed=seed)
+    menus_path, restaurants_path = write_catalog(menus, restaurants, os.path.join(workdir, "data"))
+
+    # 합성 카탈로그와 임시 아티팩트 위치 지정, 이벤트 로그는 끔
+    env = dict(os.environ,
+               MENUS_CSV_PATH=menus_path,
+               RESTAURANTS_CSV_PATH=restaurants_path,
+               MODEL_ARTIFACTS_DIR=os.path.join(workdir, "artifacts"),
+               RECOMMENDATION_LOG_DIR="")
+    similarity_neighbors = neighbors_for(n_menus, neighbors)
+    if similarity_neighbors:
+        env["SIMILARITY_NEIGHBORS"] = str(similarity_neighbors)
+
+    try:
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--load-worker",
+             "--requests", str(total_requests), "--concurrency", str(concurrency), "--seed", str(seed)],
+            env=env, cwd=BASE_DIR, capture_output=True, text=True, check=True
+        )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result.update({"menus": n_menus, "similarity_neighbors": similarity_neighbors})
+    return result
+
+
+def load_test_worker(total_requests, concurrency, seed=0):
+    """부하 테스트 본체 - 환경 변수로 지정된 카탈로그로 앱을 띄우고 프로세스 내 클라이언트로 동시 요청"""
+    from fastapi.testclient import TestClient
+    import main
+
+    rng = np.random.default_rng(seed)
+    containers = random_containers(rng, total_requests)
+    endpoints = rng.choice(["/recommend/advanced", "/recommend/simple"], total_requests, p=[0.8, 0.2])
+
+    def send(client, i):
+        width, length, height = containers[i]
+        started = time.perf_counter()
+        response = client.post(endpoints[i], json={"width": width, "length": length, "height": height})
+        return endpoints[i], response.status_code, (time.perf_counter() - started) * 1000
+
+    with quiet(), TestClient(main.app) as client:
+        load_started = time.perf_counter()
+        main.model_provider.get(timeout=None)
+        model_load_seconds = time.perf_counter() - load_started
+
+        # 워밍업 (첫 요청 경로의 지연 임포트 등 제외)
+        for i in range(min(20, total_requests)):
+            send(client, i)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(lambda i: send(client, i), range(total_requests)))
+        elapsed = time.perf_counter() - started
+
+        # 용기 BATCH_SIZE개를 단일 요청 반복과 /recommend/batch 한 번으로 비교 (매 회 새 용기라 캐시 미적중)
+        single_ms, batch_ms = [], []
+        for _ in range(5):
+            batch = [{"width": w, "length": l, "height": h} for w, l, h in random_containers(rng, BATCH_SIZE)]
+            started = time.perf_counter()
+            for container in batch:
+                client.post("/recommend/advanced", json=container)
+            single_ms.append((time.perf_counter() - started) * 1000)
+
+            batch = [{"width": w, "length": l, "height": h} for w, l, h in random_containers(rng, BATCH_SIZE)]
+            started = time.perf_counter()
+            client.post("/recommend/batch", json={"containers": batch})
+            batch_ms.append((time.perf_counter() - started) * 1000)
+
+    status_counts = {}
+    for _, status, _ in outcomes:
+        status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+
+    return {
+        "requests": total_requests,
+        "concurrency": concurrency,
+        "model_load_seconds": round(model_load_seconds, 4),
+        "elapsed_seconds": round(elapsed, 4),
+        "throughput_rps": round(total_requests / elapsed, 2),
+        "status_counts": status_counts,
+        "latency": summarize([ms for _, _, ms in outcomes]),
+        "latency_by_endpoint": {
+            endpoint: summarize([ms for e, _, ms in outcomes if e == endpoint])
+            for endpoint in sorted(set(endpoints))
+        },
+        "batch": {
+            "containers": BATCH_SIZE,
+            "single_requests": summarize(single_ms),
+            "batch_request": summarize(batch_ms),
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _flatten(prefix, value, out):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(f"{prefix}.{key}" if prefix else str(key), item, out)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        out[prefix] = value
+    return out
+
+
+def compare_results(current, baseline):
+    """이전 결과 대비 지연/처리량/메모리 지표 변화율 출력"""
+    current_metrics = _flatten("", {"micro": current.get("micro", {}), "load": current.get("load", {})}, {})
+    baseline_metrics = _flatten("", {"micro": baseline.get("micro", {}), "load": baseline.get("load", {})}, {})
+    keys = [key for key in current_metrics
+            if key in baseline_metrics and key.endswith(("p50_ms", "p95_ms", "p99_ms", "throughput_rps", "peak_rss_mb"))]
+
+    print(f"\n{'지표':<70} {'이전':>12} {'현재':>12} {'변화':>9}")
+    for key in keys:
+        before, after = baseline_metrics[key], current_metrics[key]
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"{key:<70} {before:>12.3f} {after:>12.3f} {change:>+8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="추천 엔진 벤치마크 / 부하 테스트")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[100, 1000, 10000],
+                        help="마이크로벤치마크 카탈로그 크기 (메뉴 수, 최대 1000000)")
+    parser.add_argument("--iterations", type=int, default=200, help="크기별 추천 호출 횟수")
+    parser.add_argument("--neighbors", type=int, default=None,
+                        help=f"유사도 이웃 수 (0이면 밀집 행렬, 기본: {DENSE_SIMILARITY_LIMIT}개 초과 시 {DEFAULT_NEIGHBORS})")
+    parser.add_argument("--load-menus", type=int, default=1000, help="부하 테스트 카탈로그 크기 (0이면 생략)")
+    parser.add_argument("--requests", type=int, default=2000, help="부하 테스트 총 요청 수")
+    parser.add_argument("--concurrency", type=int, default=16, help="부하 테스트 동시 요청 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmark_results/benchmark-<시각>.json)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--load-worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.load_worker:
+        print(json.dumps(load_test_worker(args.requests, args.concurrency, seed=args.seed)))
+        return
+
+    results = {
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": vars(args),
+        "micro": {},
+    }
+
+    if args.load_menus:
+        print(f"부하 테스트: 메뉴 {args.load_menus}개, 요청 {args.requests}개, 동시 {args.concurrency}")
+        results["load"] = run_load_test(args.load_menus, args.requests, args.concurrency,
+                                        seed=args.seed, neighbors=args.neighbors)
+        latency = results["load"]["latency"]
+        print(f"  p50 {latency['p50_ms']:.2f}ms, p95 {latency['p95_ms']:.2f}ms, p99 {latency['p99_ms']:.2f}ms, "
+              f"{results['load']['throughput_rps']} req/s, 최대 RSS {results['load']['peak_rss_mb']}MB")
+        batch = results["load"]["batch"]
+        print(f"  용기 {batch['containers']}개: /recommend/batch p50 {batch['batch_request']['p50_ms']:.2f}ms, "
+              f"/recommend/advanced 반복 p50 {batch['single_requests']['p50_ms']:.2f}ms")
+
+    for size in args.sizes:
+        print(f"마이크로벤치마크: 메뉴 {size}개")
+        micro = run_microbenchmarks(size, args.iterations, seed=args.seed, neighbors=args.neighbors)
+        results["micro"][str(size)] = micro
+        print(f"  초기화 {micro['construct_seconds']:.3f}s, "
+              f"하이브리드 p50 {micro['get_hybrid_recommendations']['p50_ms']:.2f}ms, "
+              f"간단 p50 {micro['get_simple_recommendations']['p50_ms']:.2f}ms, 최대 RSS {micro['peak_rss_mb']}MB")
+        for name in ("distinct", "duplicated"):
+            batch = micro[f"batch_{name}"]
+            print(f"  일괄 {batch['containers']}개({name}) p50 {batch['get_batch_recommendations']['p50_ms']:.2f}ms, "
+                  f"단일 반복 p50 {batch['single_calls']['p50_ms']:.2f}ms ({batch['speedup']}배)")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"benchmark-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            compare_results(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
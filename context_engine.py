@@ -0,0 +1,217 @@
+import os
+import re
+import json
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# 영업시간 비트맵 해상도 (분) - 일주일을 15분 칸으로 나눔
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOTS_PER_WEEK = 7 * SLOTS_PER_DAY
+
+WEEKDAYS = {'월': 0, '화': 1, '수': 2, '목': 3, '금': 4, '토': 5, '일': 6}
+DAY_TYPES = ('weekday', 'weekend')
+
+# 기본 상황 규칙 (기존 시간대/주말 가중치와 같은 결과)
+# - dayparts: 시간대 이름 → [시작 시, 끝 시), 어디에도 속하지 않으면 default_daypart
+# - weights: 가중치 사전, 구간별로 '{요일 구분}_{시간대}' → 요일 구분(주말만) → 시간대 순으로 찾음
+# - seasons / season_weights: 월 → 계절, 계절별로 곱하는 카테고리 배수 (비어 있으면 계절 무시)
+DEFAULT_CONTEXT_RULES = {
+    "dayparts": {"morning": [6, 11], "lunch": [11, 15]},
+    "default_daypart": "dinner",
+    "weekend_days": [5, 6],
+    "weights": {
+        'morning': {'한식': 1.2, '양식': 0.8, '중식': 0.9, '일식': 1.0, '기타': 0.7},
+        'lunch': {'한식': 1.1, '양식': 1.0, '중식': 1.2, '일식': 1.1, '기타': 0.9},
+        'dinner': {'한식': 1.0, '양식': 1.1, '중식': 1.0, '일식': 1.2, '기타': 0.8},
+        'weekend': {'한식': 0.9, '양식': 1.2, '중식': 1.1, '일식': 1.0, '기타': 1.0}
+    },
+    "seasons": {"spring": [3, 4, 5], "summer": [6, 7, 8], "autumn": [9, 10, 11], "winter": [12, 1, 2]},
+    "season_weights": {},
+}
+
+# 요청 시점의 상황: 가중치 표 행, 캐시/로그용 이름, 가중치 사전, 영업 상태 번호
+ContextState = namedtuple("ContextState", ["bucket", "label", "weights", "open_state"])
+
+_TIME_RANGE = r"(\d{1,2}):(\d{2})\s*~\s*(\d{1,2}):(\d{2})"
+_OVERRIDE_PATTERN = re.compile(r"\(\s*([^():]+?)\s*:\s*" + _TIME_RANGE + r"\s*\)")
+_BREAK_PATTERN = re.compile(r"break\s*time\s*:\s*" + _TIME_RANGE, re.IGNORECASE)
+_LAST_ORDER_PATTERN = re.compile(r"(주말\s*)?last\s*order\s*:\s*(\d{1,2}):(\d{2})", re.IGNORECASE)
+_CLOSED_DAY_PATTERN = re.compile(r"매주\s*([월화수목금토일])요일\s*정기\s*휴무")
+
+
+def load_context_rules(path=None):
+    """상황 규칙 로드 (path 또는 CONTEXT_RULES_PATH의 JSON, 없으면 기본 규칙) - 빠진 항목은 기본값 사용"""
+    path = path or os.environ.get("CONTEXT_RULES_PATH")
+    rules = dict(DEFAULT_CONTEXT_RULES)
+    if path:
+        with open(path, encoding='utf-8') as f:
+            rules.update(json.load(f))
+    return rules
+
+
+def _day_labels(label):
+    """'주말' / '평일' / 'X요일' 표기를 요일 번호 목록으로"""
+    label = label.strip()
+    if label.startswith('주말'):
+        return [5, 6]
+    if label.startswith('평일'):
+        return [0, 1, 2, 3, 4]
+    match = re.match(r"([월화수목금토일])요일", label)
+    return [WEEKDAYS[match.group(1)]] if match else []
+
+
+def _range_minutes(start_hour, start_minute, end_hour, end_minute):
+    start = int(start_hour) * 60 + int(start_minute)
+    end = int(end_hour) * 60 + int(end_minute)
+    # 자정을 넘기는 영업 (예: 18:00~02:00)
+    if end <= start:
+        end += 24 * 60
+    return start, end
+
+
+def _text(value):
+    return '' if value is None or (isinstance(value, float) and np.isnan(value)) else str(value)
+
+
+def parse_business_hours(business_hour, notes=None):
+    """영업시간/비고 문자열을 일주일 영업 여부 배열(SLOTS_PER_WEEK)로 변환 (해석할 수 없으면 None)
+
+    - 'HH:MM~HH:MM' 기본 영업시간, '(주말 : ...)' / '(일요일 : ...)' 요일별 예외
+    - 비고의 break time은 영업 중단, last order는 주문 마감(주말 last order는 주말에만), 'X요일 정기휴무'는 휴무
+    """
+    business_hour, notes = _text(business_hour), _text(notes)
+    main = re.search(_TIME_RANGE, business_hour.split('(')[0])
+    if main is None:
+        return None
+
+    hours = {day: _range_minutes(*main.groups()) for day in range(7)}
+    for label, *range_parts in _OVERRIDE_PATTERN.findall(business_hour):
+        for day in _day_labels(label):
+            hours[day] = _range_minutes(*range_parts)
+
+    # 주문 마감은 영업 종료를 앞당김 (주말 표기가 없는 마감은 모든 요일)
+    for weekend_only, hour, minute in sorted(_LAST_ORDER_PATTERN.findall(notes), key=lambda item: bool(item[0])):
+        for day in ([5, 6] if weekend_only else range(7)):
+            start, end = hours[day]
+            last_order = int(hour) * 60 + int(minute)
+            if last_order <= start:
+                last_order += 24 * 60
+            hours[day] = (start, min(end, last_order))
+
+    closed_days = {WEEKDAYS[day] for day in _CLOSED_DAY_PATTERN.findall(notes)}
+    breaks = [_range_minutes(*parts) for parts in _BREAK_PATTERN.findall(notes)]
+
+    week = np.zeros(SLOTS_PER_WEEK, dtype=bool)
+    slot_starts = np.arange(SLOTS_PER_DAY * 2) * SLOT_MINUTES
+    for day, (start, end) in hours.items():
+        if day in closed_days:
+            continue
+        day_open = (slot_starts >= start) & (slot_starts < end)
+        for break_start, break_end in breaks:
+            day_open &= ~((slot_starts >= break_start) & (slot_starts < break_end))
+        # 이틀 분량 칸을 해당 요일부터 채움 (자정 이후 영업은 다음 요일로, 일요일 다음은 월요일)
+        slots = (day * SLOTS_PER_DAY + np.flatnonzero(day_open)) % SLOTS_PER_WEEK
+        week[slots] = True
+    return week
+
+
+class ContextEngine:
+    """
+    로드 시 컴파일되는 상황 모델
+    - 규칙(시간대, 평일/주말, 계절)을 (상황 구간 × 카테고리 코드) 배수 표로 변환 - 요청당 행 하나를 조회
+    - 레스토랑별 일주일 영업시간 비트맵(15분 칸) - 같은 영업 상태인 시간 칸끼리 묶어 상태 번호로 조회
+    """
+
+    def __init__(self, rules, category_names, restaurant_ids, restaurants_df=None):
+        self.rules = rules
+
+        # 1. 시각 → 시간대/요일 구분/계절 번호 조회 배열
+        dayparts = list(rules["dayparts"].items())
+        self.daypart_names = [name for name, _ in dayparts] + [rules["default_daypart"]]
+        self._hour_daypart = np.full(24, len(dayparts), dtype=np.int64)
+        for index, (_, (start, end)) in reversed(list(enumerate(dayparts))):
+            hours = np.arange(start, end if end > start else end + 24) % 24
+            self._hour_daypart[hours] = index
+
+        weekend_days = set(rules["weekend_days"])
+        self._weekday_type = np.array([int(day in weekend_days) for day in range(7)])
+
+        season_weights = rules.get("season_weights") or {}
+        self.season_names = list(rules["seasons"]) if season_weights else [None]
+        self._month_season = np.zeros(13, dtype=np.int64)
+        if season_weights:
+            for index, months in enumerate(rules["seasons"].values()):
+                self._month_season[months] = index
+
+        # 2. 모든 (요일 구분, 시간대, 계절) 조합의 가중치 사전과 카테고리 코드 순서 배수 표
+        self.labels, self.weights = [], []
+        for day_type in DAY_TYPES:
+            for daypart in self.daypart_names:
+                for season in self.season_names:
+                    label, weights = self._resolve_weights(day_type, daypart, season)
+                    self.labels.append(label)
+                    self.weights.append(weights)
+        self.table = np.array(
+            [[weights.get(category, 1.0) for category in category_names] for weights in self.weights],
+            dtype=float
+        ).reshape(len(self.weights), len(category_names))
+
+        # 3. 영업시간 비트맵 (레스토랑 코드 순서, 정보가 없거나 해석할 수 없으면 항상 영업)
+        open_slots = np.ones((len(restaurant_ids), SLOTS_PER_WEEK), dtype=bool)
+        self.parsed_hours = 0
+        if restaurants_df is not None and 'business_hour' in restaurants_df.columns:
+            rows = (restaurants_df.assign(restaurant_id=restaurants_df['restaurant_id'].astype(str))
+                    .drop_duplicates('restaurant_id').set_index('restaurant_id'))
+            notes = rows['notes'] if 'notes' in rows.columns else pd.Series(None, index=rows.index)
+            for code, restaurant_id in enumerate(restaurant_ids):
+                if restaurant_id not in rows.index:
+                    continue
+                week = parse_business_hours(rows.at[restaurant_id, 'business_hour'], notes.get(restaurant_id))
+                if week is not None:
+                    open_slots[code] = week
+                    self.parsed_hours += 1
+
+        # 같은 영업 상태(열)인 시간 칸끼리 묶음 - 캐시 키와 조회에 상태 번호 사용
+        self._open_states, self._slot_state = np.unique(open_slots.T, axis=0, return_inverse=True)
+        self._slot_state = np.asarray(self._slot_state).reshape(-1)
+
+    @classmethod
+    def compile(cls, rules, catalog, restaurants_df=None):
+        return cls(rules, catalog.categories, catalog.restaurant_ids, restaurants_df)
+
+    def _resolve_weights(self, day_type, daypart, season):
+        weights_by_key = self.rules["weights"]
+        candidates = [f"{day_type}_{daypart}", daypart]
+        if day_type != 'weekday':
+            candidates.insert(1, day_type)
+        key = next((key for key in candidates if key in weights_by_key), None)
+        weights = dict(weights_by_key.get(key, {}))
+        if season is None:
+            return key or daypart, weights
+
+        season_multipliers = self.rules["season_weights"].get(season, {})
+        for category, multiplier in season_multipliers.items():
+            weights[category] = weights.get(category, 1.0) * multiplier
+        return f"{key or daypart}:{season}", weights
+
+    def resolve(self, current_time=None):
+        """시각의 상황 구간과 영업 상태"""
+        if current_time is None:
+            current_time = datetime.now()
+        weekday = current_time.weekday()
+        bucket = ((self._weekday_type[weekday] * len(self.daypart_names) + self._hour_daypart[current_time.hour])
+                  * len(self.season_names) + self._month_season[current_time.month])
+        slot = weekday * SLOTS_PER_DAY + (current_time.hour * 60 + current_time.minute) // SLOT_MINUTES
+        return ContextState(int(bucket), self.labels[bucket], self.weights[bucket], int(self._slot_state[slot]))
+
+    def multipliers(self, state):
+        """카테고리 코드로 인덱싱하는 상황 배수 배열"""
+        return self.table[state.bucket]
+
+    def is_open(self, state, restaurant_codes):
+        """레스토랑 코드 배열의 영업 여부"""
+        return self._open_states[state.open_state][restaurant_codes]
@@ -0,0 +1,330 @@
+import io
+import os
+import csv
+import time
+import codecs
+import hashlib
+
+import chardet
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 - Parquet 캐시용 (선택)
+except ImportError:
+    pyarrow = None
+
+# 인코딩 감지에 쓰는 파일 앞부분 크기
+SAMPLE_SIZE = 64 * 1024
+# 한 번에 파싱하는 행 수
+CHUNK_SIZE = 50000
+# 필드 수 검사용 원시 바이트 스캔 블록 크기
+SCAN_BLOCK_SIZE = 8 * 1024 * 1024
+# 캐시 형식이 바뀌면 올려서 이전 캐시를 무시하게 함
+CACHE_VERSION = 1
+# 보고서에 남기는 건너뛴 행 최대 개수 (전체 개수는 별도 집계)
+MAX_REPORTED_SKIPS = 100
+
+# chardet 결과를 실제 파싱에 쓸 인코딩으로 변환 (EUC-KR 감지는 상위 집합인 CP949로 읽음)
+ENCODING_ALIASES = {'euc-kr': 'cp949', 'ascii': 'utf-8', 'johab': 'cp949'}
+FALLBACK_ENCODING = 'cp949'
+
+# 스키마: 숫자 컬럼과 결측/잘못된 값 기본값 (None이면 컬럼 중앙값), 나머지 컬럼은 문자열
+MENU_SCHEMA = {
+    'name': 'menus',
+    'numeric': {'price': None, 'width': 15, 'length': 15, 'height': 8, 'popularity_score': 5},
+    'integer': ['price'],
+}
+RESTAURANT_SCHEMA = {
+    'name': 'restaurants',
+    'numeric': {},
+    'integer': [],
+}
+
+
+def detect_encoding(path, sample_size=SAMPLE_SIZE):
+    """파일 앞부분 표본으로 인코딩 감지 (BOM → UTF-8 → chardet 순)"""
+    with open(path, 'rb') as f:
+        sample = f.read(sample_size)
+
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        # 표본 끝에서 잘린 멀티바이트 문자는 허용
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    detected = (chardet.detect(sample).get('encoding') or '').lower()
+    encoding = ENCODING_ALIASES.get(detected, detected) or FALLBACK_ENCODING
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+    except (LookupError, UnicodeDecodeError):
+        encoding = FALLBACK_ENCODING
+    return encoding
+
+
+def _cache_path(path, schema, cache_dir):
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}|{schema['name']}|{CACHE_VERSION}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f"{stem}-{digest}.parquet")
+
+
+def _coerce_chunk(chunk, schema, invalid_counts):
+    """숫자 컬럼을 변환하고 숫자가 아닌 값 개수를 집계 (잘못된 값은 결측으로)"""
+    for column in schema['numeric']:
+        if column not in chunk.columns or pd.api.types.is_numeric_dtype(chunk[column]):
+            continue
+        # 파서가 숫자로 읽지 못한 청크만 문자열에서 변환 (천 단위 쉼표/공백 허용)
+        raw = chunk[column].astype(str).where(chunk[column].notna())
+        values = pd.to_numeric(raw.str.replace(',', '', regex=False).str.strip(), errors='coerce')
+        invalid = values.isna() & raw.notna() & (raw.str.strip() != '')
+        invalid_counts[column] = invalid_counts.get(column, 0) + int(invalid.sum())
+        chunk[column] = values
+    return chunk
+
+
+def _compact_chunk(chunk, schema):
+    """모아 두기 전에 청크를 줄임 - 고정 기본값은 바로 채우고, 숫자 컬럼은 값이 그대로 보존될 때만 int32/float32로
+
+    (12.3처럼 float32로 정확히 표현되지 않는 값이 있는 컬럼은 float64 유지, 최종 타입은 _fill_defaults에서 복원)
+    """
+    for column, default in schema['numeric'].items():
+        if column not in chunk.columns or not pd.api.types.is_numeric_dtype(chunk[column]):
+            continue
+        if default is not None:
+            chunk[column] = chunk[column].fillna(default)
+        values = chunk[column].to_numpy()
+        if values.dtype == np.int64:
+            narrowed = values.astype(np.int32)
+        elif values.dtype == np.float64:
+            narrowed = values.astype(np.float32)
+        else:
+            continue
+        if np.array_equal(narrowed, values, equal_nan=values.dtype.kind == 'f'):
+            chunk[column] = narrowed
+    return chunk
+
+
+def _fill_defaults(df, schema):
+    """결측값을 스키마 기본값(또는 중앙값)으로 채움 (기존 _preprocess_data와 같은 규칙)"""
+    for column, default in schema['numeric'].items():
+        if column not in df.columns:
+            continue
+        # 청크 단위로 줄인 타입을 원래 타입(int64/float64)으로 복원
+        if df[column].dtype == np.int32:
+            df[column] = df[column].astype('int64')
+        elif df[column].dtype == np.float32:
+            df[column] = df[column].astype('float64')
+        if default is None:
+            default = df[column].median() if df[column].notna().any() else 0
+        df[column] = df[column].fillna(default)
+        if column in schema['integer']:
+            df[column] = df[column].round().astype('int64')
+    return df
+
+
+def _scan_records(path, n_fields, block_size=SCAN_BLOCK_SIZE):
+    """원시 바이트를 블록 단위로 훑어 레코드 수와 필드 수가 넘치는 레코드의 시작 줄 번호를 셈 (NumPy 벡터 연산)
+
+    - 앞선 따옴표 개수의 홀짝으로 따옴표 안의 쉼표/줄바꿈을 구분 (C 파서와 같은 "" 이스케이프 규칙)
+    - 빈 줄은 레코드로 세지 않고, 첫 레코드(헤더)는 제외
+    - 쉼표/따옴표/줄바꿈 바이트가 멀티바이트 문자 안에 나오지 않는 인코딩(UTF-8, CP949) 전제
+    - 줄 번호는 파일의 물리적 줄(1부터), 행 번호는 C 파서 skiprows 기준 (0부터, 빈 줄은 세고 따옴표 안 줄바꿈은 세지 않음)
+    - C 파서는 건너뛰는 행의 따옴표를 해석하지 않으므로 따옴표가 있는 레코드의 행 번호는 None
+    반환: (데이터 레코드 수, [(줄 번호, 필드 수, 행 번호), ...])
+    """
+    records = 0
+    rows = 0
+    bad = []
+    header_seen = False
+    in_quotes = 0
+    lines = 0
+    # 블록 경계에 걸친 레코드: (쉼표 수, 따옴표 수, 시작 줄 번호, 길이, 마지막 바이트)
+    carry_commas, carry_quotes, carry_line, carry_length, carry_last = 0, 0, 1, 0, 0
+
+    def finish(fields, quoted, start_lines, blank):
+        nonlocal records, rows, header_seen
+        keep = ~blank
+        if not header_seen and keep.any():
+            keep[np.argmax(keep)] = False
+            header_seen = True
+        records += int(keep.sum())
+        overflow = np.flatnonzero(keep & (fields > n_fields))
+        skip_rows = [None if has_quotes else row for row, has_quotes in zip((rows + overflow).tolist(), quoted[overflow])]
+        bad.extend(zip(start_lines[overflow].tolist(), fields[overflow].tolist(), skip_rows))
+        rows += len(fields)
+
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            data = np.frombuffer(block, dtype=np.uint8)
+            newlines = np.flatnonzero(data == 10)
+            commas = np.flatnonzero(data == 44)
+            quotes = np.flatnonzero(data == 34)
+            ends = newlines
+            quote_counts = np.zeros(len(ends) + 1, dtype=np.int64)
+            if len(quotes) or in_quotes:
+                # 앞선 따옴표 수가 홀수인 위치는 따옴표 안
+                ends = newlines[(np.searchsorted(quotes, newlines) + in_quotes) % 2 == 0]
+                commas = commas[(np.searchsorted(quotes, commas) + in_quotes) % 2 == 0]
+                quote_counts = np.diff(np.searchsorted(quotes, ends), prepend=0, append=len(quotes))
+                in_quotes = (in_quotes + len(quotes)) % 2
+            # 레코드별 따옴표 밖 쉼표 수 (마지막 값은 다음 블록으로 넘어가는 레코드)
+            boundaries = np.searchsorted(commas, ends)
+            comma_counts = np.diff(boundaries, prepend=0, append=len(commas))
+
+            if len(ends):
+                starts = np.concatenate([[0], ends[:-1] + 1])
+                lengths = ends - starts
+                lengths[0] += carry_length
+                fields = comma_counts[:len(ends)] + 1
+                fields[0] += carry_commas
+                quoted = quote_counts[:len(ends)] > 0
+                quoted[0] |= carry_quotes > 0
+                start_lines = lines + np.searchsorted(newlines, starts) + 1
+                start_lines[0] = carry_line
+                # 빈 줄: 내용이 없거나 \r 하나뿐인 레코드
+                last = data[np.maximum(ends - 1, 0)]
+                if lengths[0] and ends[0] == 0:
+                    last[0] = carry_last
+                blank = (lengths == 0) | ((lengths == 1) & (last == 13))
+                finish(fields, quoted, start_lines, blank)
+
+                carry_commas, carry_quotes, carry_length = 0, 0, 0
+                carry_line = lines + int(np.searchsorted(newlines, ends[-1], side='right')) + 1
+            carry_commas += int(comma_counts[-1])
+            carry_quotes += int(quote_counts[-1])
+            carry_length += len(data) - (ends[-1] + 1 if len(ends) else 0)
+            carry_last = int(data[-1])
+            lines += len(newlines)
+
+    if carry_length:
+        finish(np.array([carry_commas + 1]), np.array([carry_quotes > 0]), np.array([carry_line]),
+               np.array([carry_length == 1 and carry_last == 13]))
+    return records, bad
+
+
+def _read_checked(path, header, schema, encoding, encoding_errors, dtypes, chunksize):
+    """csv 모듈로 레코드를 나눠 필드 수가 넘치는 레코드를 줄 번호와 함께 빼고, 나머지를 chunksize개씩 C 파서로 읽음 (느린 경로)"""
+    bad = []
+    chunks = []
+    invalid_counts = {}
+
+    def flush(rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        writer.writerows(rows)
+        buffer.seek(0)
+        chunk = pd.read_csv(buffer, dtype=dtypes)
+        chunks.append(_compact_chunk(_coerce_chunk(chunk, schema, invalid_counts), schema))
+
+    with open(path, encoding=encoding, errors=encoding_errors, newline='') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        rows = []
+        start = reader.line_num + 1
+        for row in reader:
+            if len(row) > len(header):
+                bad.append((start, len(row)))
+            elif row:
+                rows.append(row)
+                if len(rows) >= chunksize:
+                    flush(rows)
+                    rows = []
+            start = reader.line_num + 1
+        if rows:
+            flush(rows)
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    return df, bad, invalid_counts
+
+
+def _parse(path, schema, encoding, chunksize, encoding_errors):
+    # 숫자 컬럼은 C 파서가 바로 숫자로 읽고, 나머지 컬럼은 문자열로 고정
+    header = pd.read_csv(path, encoding=encoding, encoding_errors=encoding_errors, nrows=0).columns
+    dtypes = {column: str for column in header if column not in schema['numeric']}
+
+    # 필드 수가 넘치는 레코드는 원시 바이트 스캔으로 찾아 skiprows로 제외한 뒤 C 파서로 읽음
+    # - C 파서의 on_bad_lines는 청크 첫 행 등에서 넘치는 필드를 오류 없이 잘라 읽으므로 검출에 쓰지 않음
+    # - 경고 가로채기는 전역 상태라 모델 리로드 스레드와 요청 스레드가 동시에 쓰면 안전하지 않음
+    records, bad = _scan_records(path, len(header))
+    if all(row is not None for _, _, row in bad):
+        reader = pd.read_csv(path, encoding=encoding, encoding_errors=encoding_errors, dtype=dtypes,
+                             skiprows={row for _, _, row in bad} or None, on_bad_lines='skip', chunksize=chunksize)
+        chunks = []
+        invalid_counts = {}
+        with reader:
+            for chunk in reader:
+                chunks.append(_compact_chunk(_coerce_chunk(chunk, schema, invalid_counts), schema))
+        df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+        if len(df) == records - len(bad):
+            return df, [(line, f"Expected {len(header)} fields, saw {fields}") for line, fields, _ in bad], invalid_counts
+
+    # 따옴표가 있는 레코드를 건너뛰어야 하거나 읽은 행 수가 스캔과 다를 때만 (필드 중간의 따옴표, \r 줄바꿈 등)
+    # csv 모듈로 레코드를 다시 나눠 읽음
+    df, bad, invalid_counts = _read_checked(path, header, schema, encoding, encoding_errors, dtypes, chunksize)
+    return df, [(line, f"Expected {len(header)} fields, saw {fields}") for line, fields in bad], invalid_counts
+
+
+def ingest_csv(path, schema, chunksize=CHUNK_SIZE, cache_dir=None):
+    """
+    CSV 스트리밍 적재
+    - 앞부분 표본으로 인코딩 감지 후 chunksize행씩 파싱 (문자열 컬럼은 str로 고정)
+    - 숫자 컬럼은 청크마다 변환/검증하고 결측값은 스키마 기본값으로 채움
+    - 청크는 고정 기본값을 채우고 값이 보존되는 숫자 컬럼을 32비트로 줄인 뒤 보관
+    - 필드 수가 맞지 않아 건너뛴 행(줄 번호와 사유)과 숫자가 아닌 값 개수를 보고
+    - cache_dir이 있고 pyarrow가 설치되어 있으면 정제 결과를 Parquet으로 캐시
+    반환: (DataFrame, 보고서 dict)
+    """
+    started = time.perf_counter()
+    report = {"path": path, "schema": schema['name'], "cache": "disabled"}
+
+    cache_path = None
+    if cache_dir:
+        if pyarrow is None:
+            report["cache"] = "unavailable"
+        else:
+            cache_path = _cache_path(path, schema, cache_dir)
+            if os.path.exists(cache_path):
+                df = pd.read_parquet(cache_path)
+                report.update({"cache": "hit", "rows": len(df), "seconds": round(time.perf_counter() - started, 4)})
+                return df, report
+            report["cache"] = "miss"
+
+    encoding = detect_encoding(path)
+    encoding_errors = 'strict'
+    try:
+        df, skipped, invalid_counts = _parse(path, schema, encoding, chunksize, encoding_errors)
+    except UnicodeDecodeError:
+        # 표본 이후에 다른 인코딩이 섞인 경우 - 대체 인코딩으로 한 번 더, 그래도 안 되면 문자 치환
+        encoding = FALLBACK_ENCODING if encoding != FALLBACK_ENCODING else 'utf-8'
+        try:
+            df, skipped, invalid_counts = _parse(path, schema, encoding, chunksize, encoding_errors)
+        except UnicodeDecodeError:
+            encoding_errors = 'replace'
+            df, skipped, invalid_counts = _parse(path, schema, encoding, chunksize, encoding_errors)
+
+    df = _fill_defaults(df, schema)
+    report.update({
+        "encoding": encoding,
+        "encoding_errors": encoding_errors,
+        "rows": len(df),
+        "skipped_rows": len(skipped),
+        "skipped": [{"line": line, "reason": reason} for line, reason in skipped[:MAX_REPORTED_SKIPS]],
+        "invalid_values": {column: count for column, count in invalid_counts.items() if count},
+    })
+
+    if cache_path is not None:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.tmp-{os.getpid()}"
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            report["cache"] = f"write failed: {e}"
+
+    report["seconds"] = round(time.perf_counter() - started, 4)
+    return df, report
@@ -0,0 +1,236 @@
+import os
+import json
+import glob
+import hashlib
+import queue
+import atexit
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# 기본 로그 디렉터리 (빈 문자열이면 이벤트 로그 비활성화)
+LOG_DIR = os.environ.get(
+    "RECOMMENDATION_LOG_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+)
+FILE_PREFIX = "recommendations"
+# 이벤트 종류별 파일 접두사 (선호도 학습에 쓰는 feedback은 추천 로그와 따로 기록해 추천 로그를 읽지 않게 함)
+EVENT_FILE_PREFIXES = {"feedback": "feedback"}
+# 추천 로그 보관 일수 (지난 날짜 파일은 새 파일을 열 때 삭제, 0이면 삭제하지 않음 - feedback 파일은 항상 보관)
+RETENTION_DAYS = int(os.environ.get("RECOMMENDATION_LOG_RETENTION_DAYS", "14"))
+
+_default_event_log = None
+_default_lock = threading.Lock()
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _file_prefix(event_type):
+    return EVENT_FILE_PREFIXES.get(event_type, FILE_PREFIX)
+
+
+def _log_files(directory, event_types=None):
+    """이벤트 종류에 해당하는 로그 파일 목록 (event_types가 없으면 모든 종류)"""
+    if event_types:
+        prefixes = sorted({_file_prefix(event_type) for event_type in event_types})
+    else:
+        prefixes = sorted({FILE_PREFIX, *EVENT_FILE_PREFIXES.values()})
+    return sorted(path for prefix in prefixes for path in glob.glob(os.path.join(directory, f"{prefix}-*.jsonl")))
+
+
+class RecommendationEventLog:
+    """
+    추천 이벤트 append-only 로그
+    - 요청 스레드는 제한 크기 큐에 넣기만 함 (가득 차면 버리고 카운트, 디스크 I/O로 막히지 않음)
+    - 백그라운드 스레드가 batch_size개 또는 flush_interval초마다 JSONL 파일에 일괄 기록
+    - 날짜가 바뀌거나 파일이 max_file_bytes를 넘으면 새 파일로 회전 (프로세스별, 이벤트 종류별 파일 분리)
+    - 새 파일을 열 때 retention_days보다 오래된 추천 로그 파일 삭제 (feedback 파일은 학습 데이터라 보관)
+    """
+
+    def __init__(self, directory, max_queue=10000, batch_size=500, flush_interval=1.0,
+                 max_file_bytes=50 * 1024 * 1024, retention_days=RETENTION_DAYS):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        self.retention_days = retention_days
+        self.written = 0
+        self.dropped = 0
+        self.removed_files = 0
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        # 파일 접두사 → [열린 파일, 날짜, 순번]
+        self._files = {}
+        self._stopped = threading.Event()
+
+    def start(self):
+        """백그라운드 기록 스레드 시작"""
+        if self._thread is not None:
+            return self
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def log(self, event):
+        """이벤트를 큐에 추가 (대기하지 않음, 큐가 가득 차면 False)"""
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while not (self._stopped.is_set() and self._queue.empty()):
+            try:
+                batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                pass
+
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                if batch:
+                    self._write(batch)
+                    batch = []
+                deadline = time.monotonic() + self.flush_interval
+        if batch:
+            self._write(batch)
+        for entry in self._files.values():
+            if entry[0] is not None:
+                entry[0].close()
+        self._files = {}
+
+    def _current_file(self, prefix):
+        today = datetime.now().strftime("%Y%m%d")
+        entry = self._files.setdefault(prefix, [None, None, 0])
+        if entry[0] is not None and (entry[1] != today or entry[0].tell() >= self.max_file_bytes):
+            entry[0].close()
+            entry[0] = None
+            entry[2] = entry[2] + 1 if entry[1] == today else 0
+
+        if entry[0] is None:
+            entry[1] = today
+            path = os.path.join(self.directory, f"{prefix}-{today}-{os.getpid()}-{entry[2]:03d}.jsonl")
+            entry[0] = open(path, 'a', encoding='utf-8')
+            self._remove_expired(today)
+        return entry[0]
+
+    def _remove_expired(self, today):
+        """보관 기간이 지난 추천 로그 파일 삭제 (파일 이름의 날짜 기준, 다른 프로세스가 쓴 파일 포함)"""
+        if not self.retention_days:
+            return
+        cutoff = (datetime.strptime(today, "%Y%m%d") - timedelta(days=self.retention_days)).strftime("%Y%m%d")
+        for path in glob.glob(os.path.join(self.directory, f"{FILE_PREFIX}-*.jsonl")):
+            file_date = os.path.basename(path)[len(FILE_PREFIX) + 1:].split("-", 1)[0]
+            if file_date < cutoff:
+                try:
+                    os.remove(path)
+                    self.removed_files += 1
+                except OSError:
+                    pass
+
+    def _write(self, batch):
+        groups = {}
+        for event in batch:
+            groups.setdefault(_file_prefix(event.get("event_type")), []).append(event)
+        for prefix, events in groups.items():
+            try:
+                lines = "".join(json.dumps(event, ensure_ascii=False, default=_json_default) + "\n" for event in events)
+                f = self._current_file(prefix)
+                f.write(lines)
+                f.flush()
+                self.written += len(events)
+            except Exception as e:
+                self.dropped += len(events)
+                print(f"추천 이벤트 로그 기록 실패: {e}")
+
+    def close(self, timeout=5.0):
+        """남은 이벤트를 기록하고 스레드 종료"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            "directory": self.directory,
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "removed_files": self.removed_files
+        }
+
+
+def get_default_event_log():
+    """프로세스 공용 이벤트 로그 (LOG_DIR이 비어 있으면 None)"""
+    global _default_event_log
+    if not LOG_DIR:
+        return None
+    with _default_lock:
+        if _default_event_log is None:
+            _default_event_log = RecommendationEventLog(LOG_DIR).start()
+            atexit.register(_default_event_log.close)
+        return _default_event_log
+
+
+def log_fingerprint(directory=LOG_DIR, event_types=None):
+    """로그 파일 이름/크기/수정 시각 지문 (내용을 읽지 않고 새 이벤트가 쌓였는지 판단, 파일이 없으면 None)"""
+    paths = _log_files(directory, event_types) if directory and os.path.isdir(directory) else []
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest() if paths else None
+
+
+def read_interaction_log(directory=LOG_DIR, event_types=None):
+    """기록된 이벤트를 (이벤트, 메뉴) 단위 행으로 펼친 DataFrame으로 읽기
+
+    AdvancedFoodRecommendationAI의 user_interactions_df로 그대로 쓸 수 있는 형태
+    (rating은 feedback 이벤트에만 있고, rating이 있는 행만 선호도 모델 학습에 사용됨)
+    event_types를 주면 해당 종류의 이벤트만 읽음 (예: ("feedback",))
+    """
+    # 해당 종류의 파일만 열고, 줄 전체를 파싱하기 전에 이벤트 종류 문자열로 먼저 거름 (기록 형식: json.dumps 기본 구분자)
+    markers = [f'"event_type": "{event_type}"' for event_type in event_types] if event_types else None
+    rows = []
+    for path in _log_files(directory, event_types):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if markers is not None and not any(marker in line for marker in markers):
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if event_types and event.get("event_type") not in event_types:
+                    continue
+                container = event.get("container_size", {})
+                for item in event.get("items", []):
+                    rows.append({
+                        "event_type": event.get("event_type"),
+                        "user_id": event.get("user_id"),
+                        "timestamp": event.get("timestamp"),
+                        "context_bucket": event.get("context_bucket"),
+                        "container_width": container.get("width"),
+                        "container_length": container.get("length"),
+                        "container_height": container.get("height"),
+                        "menu_id": item.get("menu_id"),
+                        "rank": item.get("rank"),
+                        "final_score": item.get("final_score"),
+                        "rating": item.get("rating")
+                    })
+    columns = ["event_type", "user_id", "timestamp", "context_bucket", "container_width", "container_length",
+               "container_height", "menu_id", "rank", "final_score", "rating"]
+    return pd.DataFrame(rows, columns=columns)
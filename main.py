@@ -1,24 +1,168 @@
 import os
-from fastapi import FastAPI, HTTPException
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Header, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse 
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 import logging
 from datetime import datetime
 import json 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from model_provider import ModelProvider
+from event_log import get_default_event_log
+from metrics import MetricsRegistry, process_memory
+from scoring_pool import ScoringPool, ScoringPoolBusy, ScoringTimeout, ScoringWorkerLost, ModelUnavailable
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# AI 모델 임포트
-try:
-    from ai_model import advanced_ai
-    logger.info("AI 모델 로드 성공")
-except ImportError as e:
-    logger.error(f"AI 모델 로드 실패: {e}")
-    advanced_ai = None
+# 모델 로딩 대기 최대 시간 (초)
+MODEL_LOAD_TIMEOUT = float(os.environ.get("MODEL_LOAD_TIMEOUT", "120"))
+# CSV 변경 감지 주기 (초, 0이면 감시하지 않음)
+MODEL_RELOAD_INTERVAL = float(os.environ.get("MODEL_RELOAD_INTERVAL", "0"))
+# /admin 엔드포인트 인증 토큰 (미설정 시 관리자 엔드포인트 비활성화)
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+# 점수 계산 풀 설정 (thread | process), 워커 수, 대기 요청 상한, 요청별 시간 제한(초)
+SCORING_EXECUTOR = os.environ.get("SCORING_EXECUTOR", "thread")
+SCORING_WORKERS = int(os.environ.get("SCORING_WORKERS", "0")) or None
+SCORING_MAX_PENDING = int(os.environ.get("SCORING_MAX_PENDING", "64"))
+SCORING_TIMEOUT = float(os.environ.get("SCORING_TIMEOUT", "10"))
+# uvicorn 워커 프로세스 수 (2 이상이면 부모가 아티팩트 번들을 먼저 만들고 워커들이 memory-map으로 공유)
+# python main.py로 실행할 때만 적용 - uvicorn main:app으로 띄우면 무시되므로 uvicorn --workers 사용 (기동 시 오류 로그)
+SERVER_WORKERS = int(os.environ.get("SERVER_WORKERS", "1"))
+# 간단 추천 페이지 크기 상한과 NDJSON 스트리밍 시 한 번에 계산하는 메뉴 수
+SIMPLE_MAX_PAGE_SIZE = int(os.environ.get("SIMPLE_MAX_PAGE_SIZE", "100"))
+SIMPLE_STREAM_PAGE_SIZE = int(os.environ.get("SIMPLE_STREAM_PAGE_SIZE", "1000"))
+
+PROCESS_START_TIME = time.time()
+
+# /metrics로 내보내는 지연 시간 지표
+metrics = MetricsRegistry()
+REQUEST_SECONDS = metrics.histogram(
+    "food_http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "path"))
+REQUESTS_TOTAL = metrics.counter(
+    "food_http_requests_total", "HTTP 요청 수", ("method", "path", "status"))
+SCORING_SECONDS = metrics.histogram(
+    "food_scoring_duration_seconds", "스코어링 풀 대기를 포함한 추천 계산 시간", ("endpoint",))
+SERIALIZATION_SECONDS = metrics.histogram(
+    "food_serialization_duration_seconds", "응답 JSON 직렬화 시간", ("endpoint",))
+STAGE_SECONDS = metrics.histogram(
+    "food_recommendation_stage_duration_seconds", "하이브리드 추천 단계별 소요 시간", ("stage",))
+
+def create_model():
+    """AI 모델 생성 (무거운 임포트와 학습/아티팩트 로드를 기동 이후로 미룸)"""
+    from ai_model import create_recommendation_ai, MENUS_CSV_PATH, RESTAURANTS_CSV_PATH
+    model = create_recommendation_ai(event_log=get_default_event_log())
+    # 번들이 준비된 뒤 프로세스 워커를 미리 띄움 (그동안 요청은 모델 로딩 대기로 처리되어 점수 계산 시간 제한 밖)
+    try:
+        scoring_pool.start()
+    except Exception as e:
+        logger.error(f"스코어링 워커 예열 실패 - 첫 요청 때 워커를 띄웁니다: {e}")
+    model_provider.watch([MENUS_CSV_PATH, RESTAURANTS_CSV_PATH], MODEL_RELOAD_INTERVAL)
+    return model
+
+def reload_model(current):
+    """현재 모델의 어휘와 벡터를 재사용해 바뀐 메뉴만 다시 계산한 새 모델 생성"""
+    from ai_model import create_recommendation_ai
+    model = create_recommendation_ai(base_model=current, event_log=get_default_event_log())
+    # 프로세스 워커는 새로 저장된 아티팩트 번들로 다시 시작 (새 워커 예열이 끝날 때까지 기존 워커가 처리)
+    scoring_pool.restart()
+    return model
+
+model_provider = ModelProvider(create_model, reload_model)
+
+def get_ai():
+    """로딩 중이면 끝날 때까지 기다린 뒤 AI 모델 반환 (실패 시 None)"""
+    return model_provider.get(timeout=MODEL_LOAD_TIMEOUT)
+
+scoring_pool = ScoringPool(
+    get_ai,
+    mode=SCORING_EXECUTOR,
+    workers=SCORING_WORKERS,
+    max_pending=SCORING_MAX_PENDING,
+    timeout=SCORING_TIMEOUT,
+    warmup_timeout=MODEL_LOAD_TIMEOUT
+)
+
+async def run_scoring(method, **kwargs):
+    """추천 계산을 스코어링 풀에서 실행하고 풀 상태를 HTTP 오류로 변환
+
+    기동 직후 모델 로딩 대기(MODEL_LOAD_TIMEOUT)는 풀에 들어가기 전에 끝내 점수 계산 시간 제한(SCORING_TIMEOUT)에 넣지 않음
+    """
+    if model_provider.model is None and await asyncio.to_thread(get_ai) is None:
+        raise HTTPException(status_code=500, detail="AI 모델이 로드되지 않았습니다")
+    try:
+        return await scoring_pool.run(method, **kwargs)
+    except ScoringPoolBusy:
+        raise HTTPException(status_code=503, detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요")
+    except ScoringTimeout:
+        raise HTTPException(status_code=504, detail="추천 계산 시간이 초과되었습니다")
+    except ScoringWorkerLost:
+        raise HTTPException(status_code=503, detail="추천 계산 워커가 재시작되었습니다. 잠시 후 다시 시도해주세요")
+    except ModelUnavailable:
+        raise HTTPException(status_code=500, detail="AI 모델이 로드되지 않았습니다")
+
+async def timed_scoring(endpoint, method, **kwargs):
+    """run_scoring 결과와 소요 시간(초)을 반환하고 스코어링 시간 지표에 기록"""
+    started = time.perf_counter()
+    result = await run_scoring(method, **kwargs)
+    elapsed = time.perf_counter() - started
+    SCORING_SECONDS.observe(elapsed, endpoint=endpoint)
+    return result, elapsed
+
+def timed_response(endpoint, content):
+    """응답을 직렬화하고 직렬화 시간 지표에 기록"""
+    started = time.perf_counter()
+    response = UTF8JSONResponse(content=content)
+    SERIALIZATION_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint)
+    return response
+
+@asynccontextmanager
+async def lifespan(app):
+    if SERVER_WORKERS > 1 and os.environ.get("SERVER_WORKERS_LAUNCHED") != "1":
+        logger.error(f"SERVER_WORKERS={SERVER_WORKERS}는 python main.py로 실행할 때만 적용됩니다 - "
+                     "uvicorn main:app으로 실행 중이면 uvicorn --workers 옵션을 사용하세요")
+    # 서버는 즉시 요청을 받고, 모델은 백그라운드에서 로드
+    model_provider.start()
+    logger.info("AI 모델 백그라운드 로딩 시작")
+    yield
+    scoring_pool.shutdown()
+    event_log = get_default_event_log()
+    if event_log is not None:
+        event_log.close()
+
+def _json_default(value):
+    """기본 JSON 인코더가 모르는 값 처리 (numpy 스칼라/배열은 파이썬 값으로, 나머지는 문자열)"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+def encode_json(content):
+    """JSON 바이트 인코딩 (orjson이 있으면 사용, 한글은 이스케이프 없이 UTF-8)"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_json_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, default=_json_default,
+                      separators=(",", ":")).encode("utf-8")
+
+class UTF8JSONResponse(JSONResponse):
+    """한 번의 인코딩으로 바이트를 만드는 JSON 응답"""
+    media_type = "application/json; charset=utf-8"
+
+    def render(self, content) -> bytes:
+        return encode_json(content)
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -26,7 +170,9 @@ app = FastAPI(
     description="하이브리드 AI 기반 용기 크기 맞춤형 음식 추천 API",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
+    default_response_class=UTF8JSONResponse
 )
 
 # CORS 설정
@@ -38,6 +184,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    REQUEST_SECONDS.observe(time.perf_counter() - started, method=request.method, path=path)
+    REQUESTS_TOTAL.inc(method=request.method, path=path, status=str(response.status_code))
+    return response
+
 # 요청/응답 모델 정의
 class AdvancedRecommendationRequest(BaseModel):
     width: float = Field(..., gt=0)
@@ -45,6 +201,41 @@ class AdvancedRecommendationRequest(BaseModel):
     height: float = Field(..., gt=0)
     category: Optional[str] = None
     top_k: Optional[int] = Field(5, ge=1, le=5)
+    user_id: Optional[str] = None
+
+class SimpleRecommendationRequest(AdvancedRecommendationRequest):
+    top_k: Optional[int] = Field(5, ge=1, le=SIMPLE_MAX_PAGE_SIZE)
+    offset: int = Field(0, ge=0, le=10000)
+    cursor: Optional[str] = Field(None, max_length=200)
+
+class FeedbackRequest(BaseModel):
+    menu_id: str
+    rating: float = Field(..., ge=0, le=10)
+    user_id: Optional[str] = None
+    width: Optional[float] = Field(None, gt=0)
+    length: Optional[float] = Field(None, gt=0)
+    height: Optional[float] = Field(None, gt=0)
+
+class ContainerSpec(AdvancedRecommendationRequest):
+    min_price: Optional[int] = Field(None, ge=0)
+    max_price: Optional[int] = Field(None, ge=0)
+
+class BatchRecommendationRequest(BaseModel):
+    containers: List[ContainerSpec] = Field(..., min_length=1, max_length=200)
+
+class PackingContainer(BaseModel):
+    width: float = Field(..., gt=0)
+    length: float = Field(..., gt=0)
+    height: float = Field(..., gt=0)
+
+class PackingRequest(BaseModel):
+    containers: List[PackingContainer] = Field(..., min_length=1, max_length=10)
+    category: Optional[str] = None
+    min_price: Optional[int] = Field(None, ge=0)
+    max_price: Optional[int] = Field(None, ge=0)
+    max_items_per_container: int = Field(5, ge=1, le=10)
+    keep_upright: bool = True
+    time_budget_ms: int = Field(200, ge=10, le=2000)
 
 class MenuScore(BaseModel):
     fit_score: float
@@ -80,6 +271,7 @@ class AdvancedRecommendationResponse(BaseModel):
 @app.get("/")
 def root():
     try:
+        advanced_ai = get_ai()
         if advanced_ai is None:
             response = {
                 "message": "고도화된 AI 음식 추천 시스템",
@@ -110,13 +302,11 @@ def root():
                     "total_menus": len(advanced_ai.menus_df),
                     "total_restaurants": len(advanced_ai.restaurants_df),
                     "categories": list(advanced_ai.menus_df['category'].unique()),
-                    "max_recommendations": getattr(advanced_ai, 'max_recommendations', 5)
+                    "max_recommendations": getattr(advanced_ai, 'max_recommendations', 5),
+                    "cache": advanced_ai.cache_stats()
                 }
             }
-        return JSONResponse(
-            content=json.loads(json.dumps(response, ensure_ascii=False, default=str)),
-            media_type="application/json; charset=utf-8"
-        )
+        return UTF8JSONResponse(content=response)
     except Exception as e:
         response = {
             "message": "고도화된 AI 음식 추천 시스템",
@@ -130,96 +320,311 @@ def root():
                 "max_recommendations": 5
             }
         }
-        return JSONResponse(
-            content=json.loads(json.dumps(response, ensure_ascii=False, default=str)),
-            media_type="application/json; charset=utf-8"
-        )
+        return UTF8JSONResponse(content=response)
+
+def memory_report():
+    """이 워커와 스코어링 프로세스 워커들의 메모리 사용량 (MB)"""
+    def to_mb(usage):
+        return {kind: round(value / (1024 * 1024), 1) for kind, value in usage.items()} if usage else None
+
+    return {
+        "pid": os.getpid(),
+        "process": to_mb(process_memory()),
+        "scoring_workers": [{"pid": pid, **(to_mb(process_memory(pid)) or {})} for pid in scoring_pool.worker_pids()]
+    }
 
 @app.get("/health")
 def health_check():
+    event_log = get_default_event_log()
     return {
         "status": "healthy",
-        "ai_model_loaded": advanced_ai is not None
+        "ai_model_loaded": model_provider.model is not None,
+        "ai_model_status": model_provider.status,
+        "model_generation": model_provider.generation,
+        "reloading": model_provider.reloading,
+        "scoring_pool": scoring_pool.stats(),
+        "event_log": event_log.stats() if event_log is not None else None,
+        "memory": memory_report()
     }
 
-@app.post("/recommend/advanced")
-def get_advanced_recommendations(request: AdvancedRecommendationRequest):
-    if advanced_ai is None:
-        raise HTTPException(status_code=500, detail="AI 모델이 로드되지 않았습니다")
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Prometheus 텍스트 형식 지표 (요청/단계별 지연 히스토그램, 캐시/모델/풀 상태 게이지)"""
+    model = model_provider.model
+    cache = model.cache_stats() if model is not None else {}
+    pool = scoring_pool.stats()
+    event_log = get_default_event_log()
+    event_log_stats = event_log.stats() if event_log is not None else {}
+    memory = process_memory() or {}
+    worker_memory = {}
+    for pid in scoring_pool.worker_pids():
+        for kind, value in (process_memory(pid) or {}).items():
+            worker_memory[(pid, kind)] = value
+    gauges = [
+        ("food_process_start_time_seconds", "프로세스 시작 시각 (유닉스 시간)", PROCESS_START_TIME, ()),
+        ("food_model_loaded", "AI 모델 로드 여부", int(model is not None), ()),
+        ("food_model_load_seconds", "기동 시 AI 모델 로드 소요 시간", model_provider.load_seconds, ()),
+        ("food_model_generation", "핫 리로드로 교체된 모델 세대", model_provider.generation, ()),
+        ("food_model_reloading", "모델 리로드 진행 여부", int(model_provider.reloading), ()),
+        ("food_model_menus", "모델의 메뉴 수", len(model.menus_df) if model is not None else None, ()),
+        ("food_cache_entries", "추천 결과 캐시 항목 수", cache.get("size"), ()),
+        ("food_cache_hits", "추천 결과 캐시 적중 수", cache.get("hits"), ()),
+        ("food_cache_misses", "추천 결과 캐시 미스 수", cache.get("misses"), ()),
+        ("food_cache_hit_rate", "추천 결과 캐시 적중률", cache.get("hit_rate"), ()),
+        ("food_scoring_pending", "스코어링 풀 대기+실행 중 요청 수", pool["pending"], ()),
+        ("food_scoring_rejected", "스코어링 풀 과부하로 거절된 요청 수", pool["rejected"], ()),
+        ("food_scoring_timed_out", "시간 제한을 넘긴 추천 계산 수", pool["timed_out"], ()),
+        ("food_scoring_workers_lost", "계산 중 워커 프로세스가 죽은 횟수", pool["workers_lost"], ()),
+        ("food_scoring_recovered", "깨진 프로세스 풀을 새로 만든 횟수", pool["recovered"], ()),
+        ("food_event_log_queued", "기록 대기 중인 추천 이벤트 수", event_log_stats.get("queued"), ()),
+        ("food_event_log_written", "기록된 추천 이벤트 수", event_log_stats.get("written"), ()),
+        ("food_event_log_dropped", "버려진 추천 이벤트 수", event_log_stats.get("dropped"), ()),
+        ("food_process_memory_bytes", "이 워커 프로세스의 메모리 (rss/pss/shared/private)",
+         {(kind,): value for kind, value in memory.items()}, ("kind",)),
+        ("food_scoring_worker_memory_bytes", "스코어링 프로세스 워커별 메모리", worker_memory, ("pid", "kind")),
+    ]
+    return PlainTextResponse(metrics.render(gauges), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.post("/admin/reload")
+def reload_ai_model(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="관리자 토큰이 설정되지 않았습니다")
+    if x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=401, detail="관리자 토큰이 올바르지 않습니다")
 
+    started = model_provider.reload()
+    logger.info(f"AI 모델 리로드 요청: {'시작' if started else '이미 진행 중'}")
+    return {
+        "status": "accepted" if started else "already_running",
+        "generation": model_provider.generation,
+        "last_reload": model_provider.last_reload
+    }
+
+# 응답 객체를 직접 반환하므로 response_model은 문서화에만 쓰이고 검증/재직렬화는 하지 않음
+@app.post("/recommend/advanced", response_model=AdvancedRecommendationResponse)
+async def get_advanced_recommendations(
+    request: AdvancedRecommendationRequest,
+    timings: bool = Query(False, description="metadata.timings_ms에 단계별 소요 시간(ms) 포함")
+):
     try:
         logger.info(f"고도화된 추천 요청: {request.width}x{request.length}x{request.height}")
         logger.info(f"카테고리: {request.category or '전체'}")
 
-        result = advanced_ai.get_hybrid_recommendations(
+        result, scoring_seconds = await timed_scoring(
+            "/recommend/advanced",
+            "get_hybrid_recommendations",
             user_width=request.width,
             user_length=request.length,
             user_height=request.height,
             preferred_category=request.category,
-            top_k=request.top_k
+            top_k=request.top_k,
+            user_id=request.user_id,
+            include_timings=True
         )
 
-        for item in result.get("data", []):
-            rest_id = item.get("restaurant_id")
-            if rest_id:
-                row = advanced_ai.restaurants_df[advanced_ai.restaurants_df["restaurant_id"] == rest_id]
-                item["place_id"] = str(row.iloc[0].get("place_id")) if not row.empty else None
-            else:
-                item["place_id"] = None
+        # 단계별 시간은 항상 지표에 기록하고, 요청한 경우에만 응답에 포함
+        stage_timings = result.get("metadata", {}).pop("timings_ms", None)
+        if stage_timings is not None:
+            stage_timings["pool_overhead"] = round(max(scoring_seconds * 1000 - sum(stage_timings.values()), 0.0), 3)
+            for stage, milliseconds in stage_timings.items():
+                STAGE_SECONDS.observe(milliseconds / 1000, stage=stage)
+            if timings:
+                result["metadata"]["timings_ms"] = stage_timings
 
         logger.info(f"추천 결과: {result['status']}")
-        return JSONResponse(
-            content=json.loads(json.dumps(result, ensure_ascii=False, default=str)),
-            media_type="application/json; charset=utf-8"
-        )
+        return timed_response("/recommend/advanced", result)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"고도화된 추천 오류: {e}")
         raise HTTPException(status_code=500, detail=f"AI 추천 중 오류 발생: {str(e)}")
 
-@app.post("/recommend/simple")
-def get_simple_recommendations(request: AdvancedRecommendationRequest):
-    if advanced_ai is None:
-        raise HTTPException(status_code=500, detail="AI 모델이 로드되지 않았습니다")
+@app.post("/recommend/batch")
+async def get_batch_recommendations(request: BatchRecommendationRequest):
+    try:
+        logger.info(f"일괄 추천 요청: 용기 {len(request.containers)}개")
+
+        results, _ = await timed_scoring(
+            "/recommend/batch",
+            "get_batch_recommendations",
+            containers=[container.model_dump() for container in request.containers]
+        )
+
+        response = {
+            "status": "success",
+            "count": len(results),
+            "results": results
+        }
+        return timed_response("/recommend/batch", response)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"일괄 추천 오류: {e}")
+        raise HTTPException(status_code=500, detail=f"AI 추천 중 오류 발생: {str(e)}")
 
+@app.post("/recommend/packing")
+async def get_packing_recommendations(request: PackingRequest):
+    try:
+        logger.info(f"용기 담기 추천 요청: 용기 {len(request.containers)}개, 예산 {request.min_price}~{request.max_price}")
+
+        result, _ = await timed_scoring(
+            "/recommend/packing",
+            "get_packing_recommendations",
+            containers=[container.model_dump() for container in request.containers],
+            min_price=request.min_price,
+            max_price=request.max_price,
+            preferred_category=request.category,
+            max_items_per_container=request.max_items_per_container,
+            keep_upright=request.keep_upright,
+            time_budget_ms=request.time_budget_ms
+        )
+
+        logger.info(f"용기 담기 결과: {result['status']}")
+        return timed_response("/recommend/packing", result)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"용기 담기 추천 오류: {e}")
+        raise HTTPException(status_code=500, detail=f"AI 추천 중 오류 발생: {str(e)}")
+
+async def stream_simple_recommendations(request, first_page):
+    """용기에 맞는 메뉴 전체를 NDJSON 줄로 생성 (페이지 단위로 커서를 이어 계산, 중간 오류는 마지막 줄로 알림)"""
+    page = first_page
+    while True:
+        for menu in page["recommendations"]:
+            yield encode_json(menu) + b"\n"
+        if page["next_cursor"] is None:
+            return
+        try:
+            page, _ = await timed_scoring(
+                "/recommend/simple",
+                "get_simple_recommendation_page",
+                width=request.width,
+                length=request.length,
+                height=request.height,
+                top_k=SIMPLE_STREAM_PAGE_SIZE,
+                preferred_category=request.category,
+                cursor=page["next_cursor"]
+            )
+        except HTTPException as e:
+            logger.error(f"간단한 추천 스트리밍 중단: {e.detail}")
+            yield encode_json({"status": "error", "message": e.detail}) + b"\n"
+            return
+
+@app.post("/recommend/simple")
+async def get_simple_recommendations(
+    request: SimpleRecommendationRequest,
+    stream: bool = Query(False, description="용기에 맞는 메뉴 전체를 활용률 순 NDJSON으로 스트리밍 (top_k 무시)")
+):
     try:
         logger.info(f"간단한 추천 요청: {request.width}x{request.length}x{request.height}")
 
-        result = advanced_ai.get_simple_recommendations(
+        result, _ = await timed_scoring(
+            "/recommend/simple",
+            "get_simple_recommendation_page",
             width=request.width,
             length=request.length,
             height=request.height,
-            top_k=request.top_k
+            top_k=SIMPLE_STREAM_PAGE_SIZE if stream else request.top_k,
+            preferred_category=request.category,
+            offset=request.offset,
+            cursor=request.cursor
         )
+        if result["status"] == "error":
+            raise HTTPException(status_code=400, detail=result["message"])
+
+        if stream:
+            return StreamingResponse(stream_simple_recommendations(request, result),
+                                     media_type="application/x-ndjson")
 
         response = {
             "status": "success",
-            "count": len(result),
-            "recommendations": result,
+            "count": len(result["recommendations"]),
+            "next_cursor": result["next_cursor"],
+            "recommendations": result["recommendations"],
             "query": {
                 "width": request.width,
                 "length": request.length,
                 "height": request.height,
-                "top_k": request.top_k
+                "category": request.category,
+                "top_k": request.top_k,
+                "offset": request.offset,
+                "cursor": request.cursor
             }
         }
-        return JSONResponse(
-            content=json.loads(json.dumps(response, ensure_ascii=False, default=str)),
-            media_type="application/json; charset=utf-8"
-        )
+        return timed_response("/recommend/simple", response)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"간단한 추천 처리 중 오류: {e}")
         raise HTTPException(status_code=500, detail=f"추천 처리 중 오류가 발생했습니다: {str(e)}")
 
+# 추천 메뉴 평점은 이벤트 로그에 쌓였다가 다음 모델 로드/리로드 때 선호도 모델 학습에 사용됨
+@app.post("/feedback")
+async def record_feedback(request: FeedbackRequest):
+    result = await run_scoring("log_feedback", **request.model_dump())
+    if result["status"] == "error":
+        raise HTTPException(status_code=404, detail=result["message"])
+    return result
+
+async def find_similar_menus(endpoint, **kwargs):
+    """유사 메뉴 검색을 스코어링 풀에서 실행 (없는 메뉴는 404)"""
+    result, _ = await timed_scoring(endpoint, "get_similar_menus", **kwargs)
+    if result["status"] == "error":
+        status_code = 404 if kwargs.get("menu_id") is not None and "찾을 수 없습니다" in result["message"] else 400
+        raise HTTPException(status_code=status_code, detail=result["message"])
+    return timed_response(endpoint, result)
+
+@app.get("/menus/similar")
+async def search_similar_menus(
+    text: str = Query(..., min_length=1, description="메뉴명 등 자유 텍스트"),
+    top_k: int = Query(10, ge=1, le=100),
+    n_probe: Optional[int] = Query(None, ge=1, description="탐색할 클러스터 수 (클수록 정확하지만 느림)"),
+    exact: bool = Query(False, description="ANN 대신 전체 메뉴와 비교")
+):
+    logger.info(f"유사 메뉴 검색 요청: '{text}'")
+    return await find_similar_menus("/menus/similar", text=text, top_k=top_k, n_probe=n_probe, exact=exact)
+
+@app.get("/menus/{menu_id}/similar")
+async def get_similar_menus(
+    menu_id: str,
+    top_k: int = Query(10, ge=1, le=100),
+    n_probe: Optional[int] = Query(None, ge=1, description="탐색할 클러스터 수 (클수록 정확하지만 느림)"),
+    exact: bool = Query(False, description="ANN 대신 전체 메뉴와 비교")
+):
+    logger.info(f"유사 메뉴 요청: {menu_id}")
+    return await find_similar_menus("/menus/{menu_id}/similar", menu_id=menu_id, top_k=top_k,
+                                    n_probe=n_probe, exact=exact)
+
 if __name__ == "__main__":
     import uvicorn
     print("고도화된 AI 추천 시스템 서버 시작...")
     print("서버 주소: http://0.0.0.0:8000")
     print("API 문서: http://<PC_IP>:8000/docs (예: http://10.50.98.201:8000/docs)")
-    uvicorn.run(
-        app,
-        host="0.0.0.0", 
-        port=8000,
-        log_level="info"
-    )
+    if SERVER_WORKERS > 1:
+        # 번들은 별도 프로세스에서 만들어 부모(감독 프로세스)에는 모델을 올리지 않음
+        import subprocess
+        import sys
+        subprocess.run([sys.executable, "-c", "from ai_model import create_recommendation_ai; create_recommendation_ai()"],
+                       cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+        print(f"워커 {SERVER_WORKERS}개 시작 - 아티팩트 번들을 memory-map으로 공유")
+        # 워커 프로세스에 SERVER_WORKERS가 실제로 적용됐음을 알림 (lifespan의 경고 생략)
+        os.environ["SERVER_WORKERS_LAUNCHED"] = "1"
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            log_level="info",
+            workers=SERVER_WORKERS
+        )
+    else:
+        uvicorn.run(
+            app,
+            host="0.0.0.0", 
+            port=8000,
+            log_level="info"
+        )
 
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+# 전처리 단계와 같은 결측값 기본값
+DEFAULT_DIMENSIONS = {'width': 15, 'length': 15, 'height': 8}
+DEFAULT_POPULARITY = 5
+
+
+def _freeze(array):
+    """읽기 전용 연속 배열로 변환 (카탈로그는 생성 후 바뀌지 않음)"""
+    array = np.ascontiguousarray(array)
+    if array.flags.writeable and array.flags.owndata:
+        array.setflags(write=False)
+    return array
+
+
+def _intern(values):
+    """문자열 컬럼을 (코드 배열, 고유 문자열 테이블)로 변환"""
+    codes, table = pd.factorize(pd.Series(values).astype(str), sort=False)
+    return codes.astype(np.int32), np.asarray(table, dtype=object)
+
+
+class MenuCatalog:
+    """
+    불변 컬럼형 메뉴 카탈로그 (로드 시 한 번 구축)
+    - 크기는 float64 (용기 크기와 정확히 같은 메뉴도 들어가도록 입력값 그대로), 가격은 int32, 인기도는 float32 배열
+    - category / restaurant_id는 int32 코드 + 고유 문자열 테이블
+    - 필터는 위치(인덱스) 배열을 돌려주며 DataFrame 복사를 만들지 않음
+    """
+
+    # 아티팩트 번들에 .npy로 저장하는 컬럼
+    ARRAY_COLUMNS = ('widths', 'lengths', 'heights', 'prices', 'popularity', 'category_codes', 'restaurant_codes')
+
+    def __init__(self, menu_ids, menu_names, categories, category_codes, restaurant_ids, restaurant_codes,
+                 prices, widths, lengths, heights, popularity):
+        self.menu_ids = _freeze(np.asarray(menu_ids, dtype=object))
+        self.menu_names = _freeze(np.asarray(menu_names, dtype=object))
+        self.categories = _freeze(np.asarray(categories, dtype=object))
+        self.category_codes = _freeze(np.asarray(category_codes, dtype=np.int32))
+        self.restaurant_ids = _freeze(np.asarray(restaurant_ids, dtype=object))
+        self.restaurant_codes = _freeze(np.asarray(restaurant_codes, dtype=np.int32))
+        self.prices = _freeze(np.asarray(prices, dtype=np.int32))
+        self.widths = _freeze(np.asarray(widths, dtype=np.float64))
+        self.lengths = _freeze(np.asarray(lengths, dtype=np.float64))
+        self.heights = _freeze(np.asarray(heights, dtype=np.float64))
+        self.popularity = _freeze(np.asarray(popularity, dtype=np.float32))
+        self._category_lookup = {category: code for code, category in enumerate(self.categories)}
+        self._position_lookup = None
+
+    @classmethod
+    def from_frame(cls, menus_df):
+        """전처리된 메뉴 DataFrame으로 카탈로그 구축"""
+        def numeric(column, default):
+            values = pd.to_numeric(menus_df[column], errors='coerce') if column in menus_df.columns \
+                else pd.Series(np.nan, index=menus_df.index)
+            return values.fillna(default).to_numpy()
+
+        prices = pd.to_numeric(menus_df['price'], errors='coerce')
+        category_codes, categories = _intern(menus_df['category'])
+        restaurant_codes, restaurant_ids = _intern(menus_df['restaurant_id'])
+        return cls(
+            menu_ids=menus_df['menu_id'].astype(str).to_numpy(dtype=object),
+            menu_names=menus_df['menu_name'].astype(str).to_numpy(dtype=object),
+            categories=categories,
+            category_codes=category_codes,
+            restaurant_ids=restaurant_ids,
+            restaurant_codes=restaurant_codes,
+            prices=prices.fillna(prices.median() if prices.notna().any() else 0).round().to_numpy(),
+            widths=numeric('width', DEFAULT_DIMENSIONS['width']),
+            lengths=numeric('length', DEFAULT_DIMENSIONS['length']),
+            heights=numeric('height', DEFAULT_DIMENSIONS['height']),
+            popularity=numeric('popularity_score', DEFAULT_POPULARITY),
+        )
+
+    @classmethod
+    def from_arrays(cls, arrays, menus_df, categories, restaurant_ids):
+        """아티팩트 번들에서 복원 (숫자 배열은 memory-map 그대로 사용)"""
+        return cls(
+            menu_ids=menus_df['menu_id'].astype(str).to_numpy(dtype=object),
+            menu_names=menus_df['menu_name'].astype(str).to_numpy(dtype=object),
+            categories=categories,
+            restaurant_ids=restaurant_ids,
+            **{name: arrays[name] for name in cls.ARRAY_COLUMNS}
+        )
+
+    def __len__(self):
+        return len(self.menu_ids)
+
+    @property
+    def nbytes(self):
+        """숫자 컬럼이 차지하는 바이트 수"""
+        return sum(getattr(self, name).nbytes for name in self.ARRAY_COLUMNS)
+
+    def category_code(self, category):
+        """카테고리 이름의 코드 (카탈로그에 없으면 -1)"""
+        return self._category_lookup.get(category, -1)
+
+    def position(self, menu_id):
+        """menu_id의 위치 (카탈로그에 없으면 -1, 조회 테이블은 첫 호출 때 구축)"""
+        if self._position_lookup is None:
+            lookup = {}
+            for position, value in enumerate(self.menu_ids):
+                lookup.setdefault(value, position)
+            self._position_lookup = lookup
+        return self._position_lookup.get(str(menu_id), -1)
+
+    def filter_mask(self, positions, category=None, min_price=None, max_price=None):
+        """주어진 위치들에 카테고리/가격 조건을 적용한 불리언 마스크"""
+        mask = np.ones(len(positions), dtype=bool)
+        if category:
+            mask &= self.category_codes[positions] == self.category_code(category)
+        if min_price is not None:
+            mask &= self.prices[positions] >= min_price
+        if max_price is not None:
+            mask &= self.prices[positions] <= max_price
+        return mask
+
+    def menu_info(self, position):
+        """응답용 메뉴 기본 정보"""
+        return {
+            "menu_id": self.menu_ids[position],
+            "restaurant_id": self.restaurant_ids[self.restaurant_codes[position]],
+            "menu_name": self.menu_names[position],
+            "category": self.categories[self.category_codes[position]],
+            "price": int(self.prices[position]),
+            "size": {
+                "width": float(self.widths[position]),
+                "length": float(self.lengths[position]),
+                "height": float(self.heights[position])
+            }
+        }
@@ -0,0 +1,443 @@
+import numpy as np
+from scipy import sparse
+from sklearn.metrics.pairwise import cosine_similarity
+
+
+class ContainerFitIndex:
+    """
+    용기 크기 기반 후보 탐색용 3차원 지배(dominance) 인덱스
+    - 가로/세로/높이별 정렬 배열을 한 번만 구축
+    - 질의 시 가장 선택적인 차원의 접두 구간만 방문
+    - 부피 정렬 배열로 활용률 구간(45~90%) 후보 조회, 활용률 높은 순 상위 k개 조회
+    """
+
+    # 아티팩트 번들에 .npy로 저장하는 배열 (워커는 memory-map으로 공유)
+    ARRAY_NAMES = ('dimensions', 'volumes', 'orders', 'sorted_dimensions', 'volume_order', 'sorted_volumes')
+
+    def __init__(self, widths, lengths, heights):
+        self.dimensions = np.column_stack([widths, lengths, heights]).astype(float)
+        self.volumes = self.dimensions.prod(axis=1)
+
+        # 차원별 정렬 순서와 정렬된 값 (차원마다 한 행)
+        self._orders = np.stack([np.argsort(column, kind='stable') for column in self.dimensions.T])
+        self._sorted_dimensions = np.take_along_axis(self.dimensions.T, self._orders, axis=1)
+
+        # 부피 정렬 순서와 정렬된 값
+        self._volume_order = np.argsort(self.volumes, kind='stable')
+        self._sorted_volumes = self.volumes[self._volume_order]
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """저장된 배열로 복원 (정렬 없이 그대로 사용)"""
+        index = cls.__new__(cls)
+        index.dimensions, index.volumes = arrays['dimensions'], arrays['volumes']
+        index._orders, index._sorted_dimensions = arrays['orders'], arrays['sorted_dimensions']
+        index._volume_order, index._sorted_volumes = arrays['volume_order'], arrays['sorted_volumes']
+        return index
+
+    def arrays(self):
+        return {
+            'dimensions': self.dimensions, 'volumes': self.volumes,
+            'orders': self._orders, 'sorted_dimensions': self._sorted_dimensions,
+            'volume_order': self._volume_order, 'sorted_volumes': self._sorted_volumes,
+        }
+
+    def __len__(self):
+        return len(self.dimensions)
+
+    def query_fitting(self, width, length, height, within=None):
+        """용기 안에 들어가는 메뉴 위치 배열 반환 (원본 행 순서로 정렬)
+
+        within(정렬된 위치 배열)을 주면 그 안에서만 찾음 - within이 가장 선택적인 차원의
+        접두 구간보다 작으면 within만 직접 검사하고, 아니면 접두 구간 결과와 교집합
+        """
+        bounds = np.array([width, length, height], dtype=float)
+        counts = [np.searchsorted(values, bound, side='right')
+                  for values, bound in zip(self._sorted_dimensions, bounds)]
+
+        # 통과 후보가 가장 적은 차원의 접두 구간만 나머지 차원으로 검사
+        axis = int(np.argmin(counts))
+        if within is not None and len(within) <= counts[axis]:
+            return within[np.all(self.dimensions[within] <= bounds, axis=1)]
+
+        prefix = self._orders[axis][:counts[axis]]
+        keep = np.all(self.dimensions[prefix] <= bounds, axis=1)
+        fitting = np.sort(prefix[keep])
+        return fitting if within is None else intersect_sorted(fitting, within)
+
+    def query_utilization_band(self, width, length, height, min_rate=45, max_rate=90, within=None):
+        """용기에 들어가면서 부피 활용률이 [min_rate, max_rate]% 구간인 메뉴 위치 배열 반환 (원본 행 순서)
+
+        within(정렬된 위치 배열)을 주면 그 안에서만 찾음
+        """
+        bounds = np.array([width, length, height], dtype=float)
+        container_volume = bounds.prod()
+
+        start = np.searchsorted(self._sorted_volumes, container_volume * min_rate / 100, side='left')
+        end = np.searchsorted(self._sorted_volumes, container_volume * max_rate / 100, side='right')
+        band = self._volume_order[start:end]
+        keep = np.all(self.dimensions[band] <= bounds, axis=1)
+        band = np.sort(band[keep])
+        return band if within is None else intersect_sorted(band, within)
+
+    def top_by_volume(self, positions, limit, after=None):
+        """positions 중 부피가 큰 순(같은 용기면 활용률 높은 순, 동률은 위치 순)으로 상위 limit개 위치 배열
+
+        전체 정렬 없이 limit번째 부피를 partition으로 찾고 그 이상인 메뉴만 정렬
+        after=(부피, 위치)를 주면 그 순위 다음부터 (커서 페이지네이션)
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        volumes = self.volumes[positions]
+        if after is not None:
+            after_volume, after_position = after
+            keep = (volumes < after_volume) | ((volumes == after_volume) & (positions > after_position))
+            positions, volumes = positions[keep], volumes[keep]
+
+        if limit < len(positions):
+            threshold = np.partition(volumes, len(volumes) - limit)[len(volumes) - limit]
+            keep = volumes >= threshold
+            positions, volumes = positions[keep], volumes[keep]
+        order = np.lexsort((positions, -volumes))[:limit]
+        return positions[order]
+
+    def query_top_by_volume(self, width, length, height, limit, within=None, after=None, chunk_size=1024):
+        """용기에 들어가는 메뉴 중 부피가 큰 순 상위 limit개 위치 배열 (top_by_volume과 같은 순서)
+
+        부피 정렬 배열을 용기 부피 이하 구간의 큰 쪽부터 구간을 두 배씩 늘려 가며 검사하고,
+        limit개를 채우면 경계 부피와 동률인 메뉴까지만 더 보고 멈춤 (들어가는 메뉴 전체를 모으지 않음)
+        within(정렬된 위치 배열)을 주면 그 안에서만 - 작으면 within만 직접 검사
+        """
+        bounds = np.array([width, length, height], dtype=float)
+        if within is not None and len(within) <= chunk_size:
+            candidates = within[np.all(self.dimensions[within] <= bounds, axis=1)]
+            return self.top_by_volume(candidates, limit, after)
+
+        upper_volume = bounds.prod() if after is None else min(bounds.prod(), after[0])
+        end = int(np.searchsorted(self._sorted_volumes, upper_volume, side='right'))
+        found, count = [], 0
+        while end > 0:
+            if count >= limit:
+                # 경계 부피와 같은 메뉴는 위치 순으로 갈리므로 동률 구간을 마저 검사
+                volumes = self.volumes[np.concatenate(found)]
+                boundary = np.partition(volumes, len(volumes) - limit)[len(volumes) - limit]
+                start = int(np.searchsorted(self._sorted_volumes, boundary, side='left'))
+                if start >= end:
+                    break
+            else:
+                start = max(end - chunk_size, 0)
+            chunk = self._volume_order[start:end]
+            keep = np.all(self.dimensions[chunk] <= bounds, axis=1)
+            if within is not None:
+                slots = np.minimum(np.searchsorted(within, chunk), len(within) - 1)
+                keep &= within[slots] == chunk
+            if after is not None:
+                volumes = self.volumes[chunk]
+                keep &= (volumes < after[0]) | ((volumes == after[0]) & (chunk > after[1]))
+            found.append(chunk[keep])
+            count += int(keep.sum())
+            end, chunk_size = start, chunk_size * 2
+
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return self.top_by_volume(np.concatenate(found), limit)
+
+
+class MenuFilterIndex:
+    """
+    카테고리/가격 조건 필터 인덱스 (로드 시 한 번 구축)
+    - 카테고리별 포스팅 리스트: 위치 오름차순 배열의 연속 구간 (조회 시 복사 없이 슬라이스)
+    - 가격 정렬 배열: 가격 범위는 이진 탐색
+    - 카테고리 안에서 가격순으로 정렬한 배열: 카테고리+가격 조건은 해당 카테고리 메뉴만 방문
+    """
+
+    # 아티팩트 번들에 .npy로 저장하는 배열
+    ARRAY_NAMES = ('offsets', 'category_positions', 'price_order', 'sorted_prices',
+                   'category_price_order', 'category_sorted_prices')
+
+    def __init__(self, category_codes, prices):
+        category_codes = np.asarray(category_codes)
+        prices = np.asarray(prices)
+        n_categories = int(category_codes.max()) + 1 if len(category_codes) else 0
+
+        # 카테고리 코드별 구간 경계 (offsets[c]:offsets[c + 1])
+        self._offsets = np.concatenate([[0], np.cumsum(np.bincount(category_codes, minlength=n_categories))])
+        self._category_positions = np.argsort(category_codes, kind='stable')
+
+        # 전체 가격 정렬과 카테고리 내 가격 정렬
+        self._price_order = np.argsort(prices, kind='stable')
+        self._sorted_prices = prices[self._price_order]
+        self._category_price_order = np.lexsort((prices, category_codes))
+        self._category_sorted_prices = prices[self._category_price_order]
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """저장된 배열로 복원"""
+        index = cls.__new__(cls)
+        for name in cls.ARRAY_NAMES:
+            setattr(index, f"_{name}", arrays[name])
+        return index
+
+    def arrays(self):
+        return {name: getattr(self, f"_{name}") for name in self.ARRAY_NAMES}
+
+    def category_positions(self, category_code):
+        """카테고리에 속한 메뉴 위치 (오름차순, 읽기 전용 뷰)"""
+        if category_code < 0 or category_code + 1 >= len(self._offsets):
+            return self._category_positions[:0]
+        return self._category_positions[self._offsets[category_code]:self._offsets[category_code + 1]]
+
+    def query(self, category_code=None, min_price=None, max_price=None):
+        """조건을 만족하는 메뉴 위치 배열 (오름차순), 조건이 없으면 None (전체)"""
+        if category_code is None and min_price is None and max_price is None:
+            return None
+        if min_price is None and max_price is None:
+            return self.category_positions(category_code)
+
+        if category_code is None:
+            order, sorted_prices, start, stop = self._price_order, self._sorted_prices, 0, len(self._price_order)
+        elif category_code < 0 or category_code + 1 >= len(self._offsets):
+            return self._category_positions[:0]
+        else:
+            order, sorted_prices = self._category_price_order, self._category_sorted_prices
+            start, stop = self._offsets[category_code], self._offsets[category_code + 1]
+
+        if min_price is not None:
+            start = start + np.searchsorted(sorted_prices[start:stop], min_price, side='left')
+        if max_price is not None:
+            stop = start + np.searchsorted(sorted_prices[start:stop], max_price, side='right')
+        return np.sort(order[start:max(start, stop)])
+
+
+def intersect_sorted(a, b):
+    """중복 없는 두 오름차순 위치 배열의 교집합 (작은 배열의 원소를 큰 배열에서 이진 탐색)"""
+    if len(a) > len(b):
+        a, b = b, a
+    if len(a) == 0 or len(b) == 0:
+        return a[:0]
+    slots = np.minimum(np.searchsorted(b, a), len(b) - 1)
+    return a[b[slots] == a]
+
+
+class SimilarityNeighborIndex:
+    """
+    콘텐츠 유사도 상위 k개 이웃 인덱스
+    - 밀집 N×N 유사도 행렬 대신 메뉴별 상위 k개 이웃 위치와 점수만 저장 (O(N·k) 메모리)
+    - TF-IDF 벡터를 청크 단위로 비교해 구축하므로 구축 중 메모리도 청크 크기에 비례
+    """
+
+    def __init__(self, indices, scores):
+        self.indices = indices
+        self.scores = scores
+
+    @classmethod
+    def build(cls, features, k=20, chunk_size=256):
+        """특성 행렬(희소/밀집)로부터 메뉴별 상위 k개 이웃 계산 (자기 자신 제외)"""
+        n = features.shape[0]
+        k = max(0, min(k, n - 1))
+        indices, scores = _neighbor_rows(features, np.arange(n), k, chunk_size)
+        return cls(indices, scores)
+
+    def updated(self, features, reused_rows, k=None, chunk_size=256, rebuild_fraction=0.3):
+        """메뉴 추가/변경/삭제 후의 이웃 인덱스 (영향받은 행만 다시 계산)
+
+        features: 새 메뉴 목록의 특성 행렬
+        reused_rows: 새 메뉴별로 특성이 그대로인 이전 행 위치 (신규/변경 메뉴는 -1)
+        - 신규/변경 메뉴: 전체와 비교해 이웃 계산
+        - 그대로인 메뉴: 남아 있는 기존 이웃과 신규/변경 메뉴만 후보로 병합
+          (삭제/변경된 이웃 때문에 후보가 k개 미만이 된 행만 전체 재계산)
+        - 다시 계산할 행이 rebuild_fraction을 넘으면 전체 재구축
+        """
+        n = features.shape[0]
+        k = max(0, min(self.k if k is None else k, n - 1))
+        reused_rows = np.asarray(reused_rows)
+        if k > self.k:
+            return SimilarityNeighborIndex.build(features, k, chunk_size)
+
+        # 이전 행 -> 새 행 (같은 이전 행을 여러 새 행이 재사용하면 첫 행만 유지)
+        old_to_new = np.full(len(self), -1, dtype=np.int64)
+        candidates = np.flatnonzero(reused_rows >= 0)
+        old_to_new[reused_rows[candidates[::-1]]] = candidates[::-1]
+        carried = np.zeros(n, dtype=bool)
+        carried[candidates] = old_to_new[reused_rows[candidates]] == candidates
+        fresh = np.flatnonzero(~carried)
+        carried_rows = np.flatnonzero(carried)
+
+        mapped = old_to_new[self.indices[reused_rows[carried_rows]]]
+        valid = mapped >= 0
+        enough = valid.sum(axis=1) >= k
+        dirty = carried_rows[~enough]
+        if len(fresh) + len(dirty) > n * rebuild_fraction:
+            return SimilarityNeighborIndex.build(features, k, chunk_size)
+
+        indices = np.empty((n, k), dtype=np.int32)
+        scores = np.empty((n, k), dtype=np.float32)
+        recompute = np.concatenate([fresh, dirty])
+        indices[recompute], scores[recompute] = _neighbor_rows(features, recompute, k, chunk_size)
+
+        # 유효한 기존 이웃(점수 순서 유지)을 앞으로 모은 뒤 신규/변경 메뉴와의 유사도를 후보로 추가
+        keep_rows = carried_rows[enough]
+        if len(keep_rows) and k > 0:
+            front = np.argsort(~valid[enough], axis=1, kind='stable')[:, :k]
+            kept_indices = np.take_along_axis(mapped[enough], front, axis=1)
+            kept_scores = np.take_along_axis(self.scores[reused_rows[keep_rows]], front, axis=1)
+            if len(fresh):
+                fresh_scores = cosine_similarity(features[keep_rows], features[fresh]).astype(np.float32)
+                kept_indices = np.hstack([kept_indices, np.broadcast_to(fresh, (len(keep_rows), len(fresh)))])
+                kept_scores = np.hstack([kept_scores, fresh_scores])
+            indices[keep_rows], scores[keep_rows] = _top_k(kept_scores, kept_indices, k)
+        return SimilarityNeighborIndex(indices, scores)
+
+    def __len__(self):
+        return len(self.indices)
+
+    @property
+    def k(self):
+        return self.indices.shape[1]
+
+    def neighbors(self, menu_idx, top_k=10):
+        """유사도 내림차순 이웃 위치 배열 (저장된 k개를 넘는 요청은 k개까지만 반환)"""
+        return self.indices[menu_idx, :top_k]
+
+    def neighbor_scores(self, menu_idx, top_k=10):
+        """neighbors와 같은 순서의 유사도 점수 배열"""
+        return self.scores[menu_idx, :top_k]
+
+
+class ClusteredVectorIndex:
+    """
+    유사 메뉴 근사 최근접 이웃(ANN) 검색용 IVF(역 리스트) 인덱스 - 순수 NumPy
+    - 정규화한 벡터를 구면 k-means로 n_lists개 클러스터로 나누고 클러스터별 위치 목록 저장
+    - 질의 시 중심이 가까운 n_probe개 클러스터의 메뉴만 내적 비교
+      (n_probe가 클수록 재현율이 오르고 지연도 늘어남, n_probe = n_lists면 전체 비교와 같음)
+    """
+
+    ARRAY_NAMES = ('vectors', 'centroids', 'order', 'offsets')
+
+    def __init__(self, vectors, centroids, order, offsets):
+        self.vectors = vectors
+        self.centroids = centroids
+        self._order = order
+        self._offsets = offsets
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """저장된 배열로 복원 (k-means 재학습 없음)"""
+        return cls(arrays['vectors'], arrays['centroids'], arrays['order'], arrays['offsets'])
+
+    def arrays(self):
+        return {'vectors': self.vectors, 'centroids': self.centroids, 'order': self._order, 'offsets': self._offsets}
+
+    @classmethod
+    def build(cls, vectors, n_lists=None, iterations=10, sample_size=50000, seed=0, chunk_size=65536,
+              centroids=None):
+        """벡터 행렬로 인덱스 구축 (n_lists 기본값 √N, 중심 학습은 최대 sample_size개 표본으로)
+
+        centroids를 주면 학습 없이 그 중심에 배정만 함 (점진 갱신용)
+        """
+        vectors = _normalize_rows(np.asarray(vectors, dtype=np.float32))
+        n = len(vectors)
+        if centroids is not None and len(centroids):
+            centroids = np.asarray(centroids, dtype=np.float32)
+            n_lists, iterations = len(centroids), 0
+        else:
+            n_lists = max(1, min(n_lists or int(np.sqrt(n)), n))
+            rng = np.random.default_rng(seed)
+            sample = vectors[np.sort(rng.choice(n, min(n, max(sample_size, n_lists)), replace=False))] if n else vectors
+            centroids = sample[rng.choice(len(sample), n_lists, replace=False)] if n else vectors[:0]
+        for _ in range(iterations if n else 0):
+            labels = _nearest_rows(sample, centroids, chunk_size)
+            membership = sparse.csr_matrix(
+                (np.ones(len(sample), dtype=np.float32), (labels, np.arange(len(sample)))),
+                shape=(n_lists, len(sample))
+            )
+            sums = np.asarray(membership @ sample)
+            # 빈 클러스터는 기존 중심 유지
+            empty = np.bincount(labels, minlength=n_lists) == 0
+            sums[empty] = centroids[empty]
+            centroids = _normalize_rows(sums)
+
+        labels = _nearest_rows(vectors, centroids, chunk_size)
+        order = np.argsort(labels, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=n_lists))])
+        return cls(vectors, centroids, order, offsets)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    def search(self, vector, top_k=10, n_probe=8, exclude=None):
+        """질의 벡터와 코사인 유사도 상위 top_k개 (위치 배열, 점수 배열) - 가까운 클러스터만 탐색
+
+        탐색한 클러스터의 메뉴가 top_k개보다 적으면 다음으로 가까운 클러스터까지 넓힘
+        """
+        vector = _normalize_rows(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+        if len(self) == 0:
+            return self._rank(vector, self._order, top_k, exclude)
+
+        ranked = np.argsort(-(self.centroids @ vector), kind='stable')
+        sizes = np.cumsum(np.diff(self._offsets)[ranked])
+        needed = int(np.searchsorted(sizes, top_k + (exclude is not None))) + 1
+        probe = ranked[:max(1, n_probe, needed)]
+        candidates = np.concatenate([self._order[self._offsets[c]:self._offsets[c + 1]] for c in probe])
+        return self._rank(vector, candidates, top_k, exclude)
+
+    def search_exact(self, vector, top_k=10, exclude=None):
+        """전체 메뉴와 비교한 정확한 상위 top_k개 (재현율 측정/소규모 카탈로그용)"""
+        vector = _normalize_rows(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+        return self._rank(vector, np.arange(len(self)), top_k, exclude)
+
+    def _rank(self, vector, candidates, top_k, exclude):
+        if exclude is not None:
+            candidates = candidates[candidates != exclude]
+        k = min(top_k, len(candidates))
+        if k <= 0:
+            return candidates[:0], np.zeros(0, dtype=np.float32)
+        scores = self.vectors[candidates] @ vector
+        top = np.argpartition(-scores, k - 1)[:k]
+        # 점수 내림차순, 동점은 위치 오름차순 (탐색 순서와 무관하게 결정적)
+        top = top[np.lexsort((candidates[top], -scores[top]))]
+        return candidates[top], scores[top]
+
+
+def _normalize_rows(matrix):
+    """행 단위 L2 정규화 (영벡터는 그대로)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return (matrix / np.where(norms > 0, norms, 1)).astype(np.float32)
+
+
+def _nearest_rows(vectors, centroids, chunk_size=65536):
+    """벡터별로 내적이 가장 큰 중심 위치 (청크 단위)"""
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk_size):
+        labels[start:start + chunk_size] = np.argmax(vectors[start:start + chunk_size] @ centroids.T, axis=1)
+    return labels
+
+
+def _top_k(block, candidates, k):
+    """행별로 점수 상위 k개 후보와 점수 (점수 내림차순)"""
+    top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(block, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind='stable')
+    return (np.take_along_axis(np.take_along_axis(candidates, top, axis=1), order, axis=1),
+            np.take_along_axis(top_scores, order, axis=1))
+
+
+def _neighbor_rows(features, rows, k, chunk_size=256):
+    """주어진 행들의 상위 k개 이웃을 전체 메뉴와 비교해 계산 (청크 단위, 자기 자신 제외)"""
+    n = features.shape[0]
+    indices = np.empty((len(rows), k), dtype=np.int32)
+    scores = np.empty((len(rows), k), dtype=np.float32)
+    if k == 0:
+        return indices, scores
+
+    all_positions = np.arange(n)
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        block = cosine_similarity(features[chunk], features)
+        block[np.arange(len(chunk)), chunk] = -np.inf
+        candidates = np.broadcast_to(all_positions, block.shape)
+        indices[start:start + len(chunk)], scores[start:start + len(chunk)] = _top_k(block, candidates, k)
+    return indices, scores
@@ -0,0 +1,250 @@
+import io
+import os
+import json
+import shutil
+import hashlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import joblib
+import sklearn
+from scipy import sparse
+
+from menu_index import SimilarityNeighborIndex, ContainerFitIndex, MenuFilterIndex, ClusteredVectorIndex
+from menu_catalog import MenuCatalog
+
+# 번들 구조가 바뀌면 올려서 이전 번들을 자동으로 재구축하게 함
+BUNDLE_FORMAT_VERSION = 5
+MANIFEST_FILE = "manifest.json"
+
+# .npy 파일로 저장하는 모델 속성 (로드 시 memory-map)
+ARRAY_ATTRIBUTES = [
+    'normalized_size_features', 'normalized_popularity',
+    'static_content_scores', 'static_content_terms', 'static_popularity_terms',
+    'category_one_hot',
+]
+
+# 매니페스트에 저장하는 스케일러 학습 파라미터
+SCALER_ATTRIBUTES = {
+    'size_scaler': ['mean_', 'var_', 'scale_', 'n_features_in_', 'n_samples_seen_'],
+    'popularity_scaler': ['min_', 'scale_', 'data_min_', 'data_max_', 'data_range_',
+                          'n_features_in_', 'n_samples_seen_'],
+}
+
+
+def source_fingerprint(paths):
+    """원본 CSV 파일들의 SHA-256 지문 (파일이 하나라도 없으면 None)"""
+    digest = hashlib.sha256()
+    for path in paths:
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _to_json_value(value):
+    """numpy 값을 JSON 직렬화 가능한 값으로 변환"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def save_model_artifacts(ai, directory, fingerprint, options=None):
+    """학습된 모델 아티팩트를 버전 관리되는 디렉터리 번들로 저장 (임시 디렉터리에 쓴 뒤 교체)"""
+    tmp_directory = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_directory, ignore_errors=True)
+    os.makedirs(tmp_directory)
+
+    for name in ARRAY_ATTRIBUTES:
+        np.save(os.path.join(tmp_directory, f"{name}.npy"), np.ascontiguousarray(getattr(ai, name)))
+    for name in MenuCatalog.ARRAY_COLUMNS:
+        np.save(os.path.join(tmp_directory, f"catalog_{name}.npy"), getattr(ai.catalog, name))
+    for prefix, index in (("fit", ai.fit_index), ("filter", ai.filter_index), ("ann", ai.similar_index)):
+        for name, array in index.arrays().items():
+            np.save(os.path.join(tmp_directory, f"{prefix}_{name}.npy"), np.ascontiguousarray(array))
+
+    content_features = sparse.csr_matrix(ai.content_features)
+    np.save(os.path.join(tmp_directory, "content_data.npy"), content_features.data)
+    np.save(os.path.join(tmp_directory, "content_indices.npy"), content_features.indices)
+    np.save(os.path.join(tmp_directory, "content_indptr.npy"), content_features.indptr)
+
+    if ai.similar_projection is not None:
+        np.save(os.path.join(tmp_directory, "ann_projection.npy"), np.ascontiguousarray(ai.similar_projection))
+
+    if ai.neighbor_index is not None:
+        np.save(os.path.join(tmp_directory, "neighbor_indices.npy"), ai.neighbor_index.indices)
+        np.save(os.path.join(tmp_directory, "neighbor_scores.npy"), ai.neighbor_index.scores)
+    else:
+        np.save(os.path.join(tmp_directory, "similarity_matrix.npy"), ai.menu_similarity_matrix)
+
+    if ai.preference_model_fitted:
+        joblib.dump(ai.preference_model, os.path.join(tmp_directory, "preference_model.joblib"))
+
+    ai.menus_df.to_json(os.path.join(tmp_directory, "menus.json"), orient='split', force_ascii=False)
+    ai.restaurants_df.to_json(os.path.join(tmp_directory, "restaurants.json"), orient='split', force_ascii=False)
+
+    manifest = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "source_fingerprint": fingerprint,
+        "sklearn_version": sklearn.__version__,
+        "options": options or {},
+        "content_shape": list(content_features.shape),
+        "catalog": {
+            "categories": ai.catalog.categories.tolist(),
+            "restaurant_ids": ai.catalog.restaurant_ids.tolist(),
+        },
+        "content_vectorizer": ai.content_vectorizer_kind,
+        "content_changes_since_fit": int(ai.content_changes_since_fit),
+        "vocabulary": ({term: int(index) for term, index in ai.content_vectorizer.vocabulary_.items()}
+                       if ai.content_vectorizer_kind == 'tfidf' else None),
+        "idf": ai.content_vectorizer.idf_.tolist() if ai.content_vectorizer_kind == 'tfidf' else None,
+        "scalers": {
+            scaler_name: {attr: _to_json_value(getattr(getattr(ai, scaler_name), attr)) for attr in attrs}
+            for scaler_name, attrs in SCALER_ATTRIBUTES.items()
+        },
+        "preference_model_fitted": bool(ai.preference_model_fitted),
+        "feedback_fingerprint": ai.feedback_fingerprint,
+    }
+    with open(os.path.join(tmp_directory, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+    # 기존 번들을 치우고 새 번들로 교체
+    old_directory = f"{directory}.old-{os.getpid()}"
+    if os.path.exists(directory):
+        os.replace(directory, old_directory)
+    os.replace(tmp_directory, directory)
+    shutil.rmtree(old_directory, ignore_errors=True)
+    print(f"모델 아티팩트 저장 완료: {directory}")
+
+
+def save_preference_model(ai, directory):
+    """번들의 선호도 모델과 feedback 지문만 교체 (파일마다 임시 파일에 쓴 뒤 교체 - 읽는 쪽은 이전 또는 새 상태만 봄)"""
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if ai.preference_model_fitted:
+        model_path = os.path.join(directory, "preference_model.joblib")
+        joblib.dump(ai.preference_model, f"{model_path}.tmp-{os.getpid()}")
+        os.replace(f"{model_path}.tmp-{os.getpid()}", model_path)
+    manifest["preference_model_fitted"] = bool(ai.preference_model_fitted)
+    manifest["feedback_fingerprint"] = ai.feedback_fingerprint
+
+    with open(f"{manifest_path}.tmp-{os.getpid()}", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(f"{manifest_path}.tmp-{os.getpid()}", manifest_path)
+    print(f"선호도 모델 저장 완료: {directory}")
+
+
+class ModelArtifacts:
+    """디스크에서 읽은 모델 아티팩트 번들 (배열은 읽기 전용 memory-map - 같은 번들을 연 프로세스끼리 페이지 캐시 공유)"""
+
+    def __init__(self, directory, manifest, mmap=True):
+        self.directory = directory
+        self.manifest = manifest
+        self.mmap_mode = 'r' if mmap else None
+
+        self.menus_df = self._read_frame("menus.json")
+        self.restaurants_df = self._read_frame("restaurants.json")
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _read_frame(self, name):
+        with open(self._path(name), encoding='utf-8') as f:
+            return pd.read_json(io.StringIO(f.read()), orient='split', dtype=False)
+
+    def load_array(self, name):
+        return np.load(self._path(f"{name}.npy"), mmap_mode=self.mmap_mode)
+
+    def has_array(self, name):
+        return os.path.exists(self._path(f"{name}.npy"))
+
+    def content_features(self):
+        """저장된 TF-IDF 희소 행렬 복원"""
+        return sparse.csr_matrix(
+            (self.load_array("content_data"), self.load_array("content_indices"), self.load_array("content_indptr")),
+            shape=tuple(self.manifest["content_shape"])
+        )
+
+    def apply_to(self, ai):
+        """모델 인스턴스에 학습된 상태를 복원 (재학습 없음)"""
+        for name in ARRAY_ATTRIBUTES:
+            setattr(ai, name, self.load_array(name))
+        ai.catalog = MenuCatalog.from_arrays(
+            {name: self.load_array(f"catalog_{name}") for name in MenuCatalog.ARRAY_COLUMNS},
+            ai.menus_df, self.manifest["catalog"]["categories"], self.manifest["catalog"]["restaurant_ids"]
+        )
+        # 후보 탐색 인덱스도 정렬 없이 memory-map 그대로 사용 (워커 간 페이지 공유)
+        ai.fit_index = ContainerFitIndex.from_arrays(
+            {name: self.load_array(f"fit_{name}") for name in ContainerFitIndex.ARRAY_NAMES}
+        )
+        ai.filter_index = MenuFilterIndex.from_arrays(
+            {name: self.load_array(f"filter_{name}") for name in MenuFilterIndex.ARRAY_NAMES}
+        )
+        # 유사 메뉴 ANN 인덱스 (투영된 벡터, k-means 중심과 클러스터 배정)
+        ai.similar_index = ClusteredVectorIndex.from_arrays(
+            {name: self.load_array(f"ann_{name}") for name in ClusteredVectorIndex.ARRAY_NAMES}
+        )
+        ai.similar_projection = self.load_array("ann_projection") if self.has_array("ann_projection") else None
+
+        # 고정 어휘 + 저장된 idf로 학습 없이 transform 가능한 상태 복원 (해시 어휘는 복원할 상태 없음)
+        if ai.content_vectorizer_kind == 'tfidf':
+            ai.content_vectorizer.vocabulary = self.manifest["vocabulary"]
+            ai.content_vectorizer.idf_ = np.asarray(self.manifest["idf"], dtype=float)
+        ai.content_changes_since_fit = self.manifest.get("content_changes_since_fit", 0)
+        ai.content_features = self.content_features()
+
+        for scaler_name, state in self.manifest["scalers"].items():
+            scaler = getattr(ai, scaler_name)
+            for attr, value in state.items():
+                setattr(scaler, attr, np.asarray(value) if isinstance(value, list) else value)
+
+        if self.has_array("neighbor_indices"):
+            ai.neighbor_index = SimilarityNeighborIndex(self.load_array("neighbor_indices"),
+                                                        self.load_array("neighbor_scores"))
+            ai.menu_similarity_matrix = None
+        else:
+            ai.neighbor_index = None
+            ai.menu_similarity_matrix = self.load_array("similarity_matrix")
+
+        ai.preference_model_fitted = False
+        ai.feedback_fingerprint = self.manifest.get("feedback_fingerprint")
+        if self.manifest.get("preference_model_fitted"):
+            ai.preference_model = joblib.load(self._path("preference_model.joblib"))
+            ai.preference_model_fitted = True
+
+
+def load_model_artifacts(directory, fingerprint, options=None, mmap=True):
+    """유효한 번들이면 ModelArtifacts 반환 (없거나 원본/버전/옵션이 다르면 None)"""
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"모델 아티팩트 매니페스트 읽기 실패: {e}")
+        return None
+
+    if manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+        print("모델 아티팩트 형식 버전 불일치 - 재구축 필요")
+        return None
+    if manifest.get("sklearn_version") != sklearn.__version__:
+        print("scikit-learn 버전 불일치 - 재구축 필요")
+        return None
+    if fingerprint is None or manifest.get("source_fingerprint") != fingerprint:
+        print("원본 CSV 변경 감지 - 재구축 필요")
+        return None
+    if manifest.get("options", {}) != (options or {}):
+        print("모델 옵션 변경 감지 - 재구축 필요")
+        return None
+
+    return ModelArtifacts(directory, manifest, mmap=mmap)
@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+from datetime import datetime
+
+
+class ModelProvider:
+    """
+    추천 모델 인스턴스 수명 관리
+    - 앱 기동 시 백그라운드 스레드에서 모델 생성 (기동 즉시 /health 응답 가능)
+    - 요청 처리 시 로딩이 끝날 때까지 대기 후 모델 반환
+    - 핫 리로드: 새 인스턴스를 백그라운드에서 만든 뒤 참조만 원자적으로 교체
+      (진행 중인 요청은 이미 받은 기존 인스턴스로 끝까지 처리됨)
+    """
+
+    def __init__(self, factory, reload_factory=None):
+        self._factory = factory
+        self._reload_factory = reload_factory or (lambda current: factory())
+        self._model = None
+        self._error = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.load_seconds = None
+
+        # 리로드 상태
+        self._reload_lock = threading.Lock()
+        self.generation = 0
+        self.reloading = False
+        self.last_reload = None
+        self._watcher = None
+
+    @property
+    def model(self):
+        """현재 모델 (로딩 중이거나 실패 시 None, 대기하지 않음)"""
+        return self._model
+
+    @property
+    def status(self):
+        if not self._ready.is_set():
+            return "loading" if self._thread is not None else "idle"
+        return "ready" if self._model is not None else "failed"
+
+    @property
+    def error(self):
+        return self._error
+
+    def start(self):
+        """백그라운드 로딩 시작 (이미 시작했으면 무시)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._load, name="model-loader", daemon=True)
+            self._thread.start()
+
+    def _load(self):
+        started = time.perf_counter()
+        try:
+            self._model = self._factory()
+            self.generation = 1
+            print(f"AI 모델 인스턴스 생성 완료 ({time.perf_counter() - started:.2f}초)")
+        except Exception as e:
+            self._error = e
+            print(f"AI 모델 인스턴스 생성 실패: {e}")
+        finally:
+            self.load_seconds = time.perf_counter() - started
+            self._ready.set()
+
+    def get(self, timeout=None):
+        """로딩이 끝날 때까지(최대 timeout초) 기다린 뒤 모델 반환 (실패/시간 초과 시 None)"""
+        self.start()
+        self._ready.wait(timeout)
+        return self._model
+
+    def reload(self, wait=False):
+        """새 모델을 백그라운드에서 생성해 교체 (이미 리로드 중이면 False)"""
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        self.reloading = True
+        thread = threading.Thread(target=self._reload, name="model-reloader", daemon=True)
+        thread.start()
+        if wait:
+            thread.join()
+        return True
+
+    def _reload(self):
+        started = time.perf_counter()
+        try:
+            current = self.get()
+            model = self._reload_factory(current)
+            with self._lock:
+                self._model = model
+                self._error = None
+                self.generation += 1
+            self.last_reload = {
+                "status": "success",
+                "finished_at": datetime.now().isoformat(),
+                "seconds": round(time.perf_counter() - started, 3),
+                "generation": self.generation
+            }
+            print(f"AI 모델 리로드 완료 (세대 {self.generation}, {time.perf_counter() - started:.2f}초)")
+        except Exception as e:
+            # 실패 시 기존 모델을 계속 사용
+            self.last_reload = {
+                "status": "failed",
+                "finished_at": datetime.now().isoformat(),
+                "error": str(e),
+                "generation": self.generation
+            }
+            print(f"AI 모델 리로드 실패 - 기존 모델 유지: {e}")
+        finally:
+            self.reloading = False
+            self._reload_lock.release()
+
+    def watch(self, paths, interval=30.0):
+        """파일 수정 시각을 주기적으로 확인해 바뀌면 리로드하는 감시 스레드 시작"""
+        if self._watcher is not None or interval <= 0:
+            return
+        self._watcher = threading.Thread(target=self._watch, args=(list(paths), interval),
+                                         name="model-file-watcher", daemon=True)
+        self._watcher.start()
+
+    def _watch(self, paths, interval):
+        def snapshot():
+            return tuple(os.path.getmtime(path) if os.path.exists(path) else None for path in paths)
+
+        last_seen = snapshot()
+        while True:
+            time.sleep(interval)
+            current = snapshot()
+            if current != last_seen:
+                print("데이터 파일 변경 감지 - AI 모델 리로드 시작")
+                if self.reload():
+                    last_seen = current
@@ -0,0 +1,218 @@
+import time
+
+import numpy as np
+
+# 용기를 가득 채웠을 때 목적 함수에 더해지는 점수 (메뉴 점수와 같은 척도)
+FILL_WEIGHT = 10.0
+
+# 축 정렬 90도 회전 방향 (원래 방향 우선), 세워 두는 경우는 가로/세로 교환만
+ORIENTATIONS = ((0, 1, 2), (1, 0, 2), (0, 2, 1), (2, 0, 1), (1, 2, 0), (2, 1, 0))
+UPRIGHT_ORIENTATIONS = ORIENTATIONS[:2]
+
+
+def orientation_loads(item_dims, container_dims, keep_upright=True):
+    """메뉴 × 용기 부피 점유율 행렬과 들어가는 첫 회전 방향
+
+    - 점유율 = 메뉴 부피 / 용기 부피 (목적 함수의 채움 점수용, 여러 메뉴의 실제 배치는 place_items로 확인)
+    - 어떤 회전으로도 들어가지 않는 조합은 inf, 방향은 들어가는 첫 회전 (원래 방향 우선)
+    keep_upright=True면 높이는 고정하고 가로/세로만 바꿔 봄 (국물 등 세워야 하는 음식)
+    반환: (점유율 (N, K), ORIENTATIONS 위치 (N, K))
+    """
+    items = np.asarray(item_dims, dtype=float)
+    containers = np.asarray(container_dims, dtype=float)
+    orientations = UPRIGHT_ORIENTATIONS if keep_upright else ORIENTATIONS
+
+    fits = np.stack([
+        np.all(items[:, orientation][:, None, :] <= containers[None, :, :], axis=2)
+        for orientation in orientations
+    ])
+    share = items.prod(axis=1)[:, None] / containers.prod(axis=1)[None, :]
+    loads = np.where(fits.any(axis=0), share, np.inf)
+    return loads, np.argmax(fits, axis=0)
+
+
+def placed_dimensions(item, orientation):
+    """ORIENTATIONS[orientation] 방향으로 놓인 메뉴 치수"""
+    return tuple(item[axis] for axis in ORIENTATIONS[orientation])
+
+
+def place_items(item_dims, container, keep_upright=True):
+    """메뉴 여러 개를 용기 하나에 실제로 놓을 수 있는지 확인 (층 + 선반 배치)
+
+    - 높이가 큰 메뉴부터 아래 층에 넣고, 층 바닥은 가로 줄(선반) 단위로 나눠 씀 (guillotine 분할)
+    - 기존 층에 자리가 없으면 층 높이 합이 용기 높이 이하일 때만 위에 새 층을 쌓음
+    - 찾은 배치가 곧 증거이므로 들어가지 않는 조합은 받지 않음 (드물게 들어가는 조합을 놓칠 수는 있음)
+    반환: 메뉴별 ORIENTATIONS 위치 목록, 배치를 찾지 못하면 None
+    """
+    width, length, height = container
+    orientations = range(len(UPRIGHT_ORIENTATIONS) if keep_upright else len(ORIENTATIONS))
+    if keep_upright:
+        order = sorted(range(len(item_dims)), key=lambda i: (-item_dims[i][2], -item_dims[i][0] * item_dims[i][1], i))
+    else:
+        order = sorted(range(len(item_dims)), key=lambda i: (-max(item_dims[i]), -np.prod(item_dims[i]), i))
+
+    # 층: [층 높이, 사용한 깊이, 선반 목록 [선반 깊이, 사용한 너비]]
+    layers = []
+    stacked = 0.0
+    placements = [None] * len(item_dims)
+    for i in order:
+        placed = [placed_dimensions(item_dims[i], o) for o in orientations]
+        done = False
+        for layer in layers:
+            for o, (w, l, h) in zip(orientations, placed):
+                if h > layer[0] or w > width:
+                    continue
+                shelf = next((s for s in layer[2] if l <= s[0] and s[1] + w <= width), None)
+                if shelf is not None:
+                    shelf[1] += w
+                elif layer[1] + l <= length:
+                    layer[2].append([l, w])
+                    layer[1] += l
+                else:
+                    continue
+                placements[i], done = o, True
+                break
+            if done:
+                break
+        if done:
+            continue
+
+        # 새 층은 가장 낮게 놓이는 회전으로 (동률이면 원래 방향)
+        fitting = [(h, o, l) for o, (w, l, h) in zip(orientations, placed) if w <= width and l <= length]
+        if not fitting:
+            return None
+        h, o, l = min(fitting)
+        if stacked + h > height:
+            return None
+        stacked += h
+        layers.append([h, l, [[l, placed[o][0]]]])
+        placements[i] = o
+    return placements
+
+
+def pack_containers(containers, item_dims, loads, prices, values, min_price=None, max_price=None,
+                    max_items=5, beam_width=32, time_budget=0.2, keep_upright=True):
+    """
+    여러 용기에 담을 메뉴 조합 탐색 (가치 순 후보에 대한 빔 서치 + 상한 가지치기)
+    - 목적: 담은 메뉴 가치 합 + FILL_WEIGHT × 용기별 부피 점유율 합
+    - 제약: 메뉴는 한 번만, 용기마다 place_items로 실제 배치가 가능한 조합만,
+      용기당 max_items개 이하, 총 가격 ≤ max_price, 결과 총 가격 ≥ min_price
+    - 같은 (가격, 용기별 담긴 메뉴 치수) 상태는 가치가 가장 큰 것만 남김 (메모이제이션, 같은 크기 용기는 구분하지 않음)
+    - time_budget(초)을 넘기면 그때까지 찾은 최선 조합 반환
+
+    containers: (K, 3) 용기 치수, item_dims: (N, 3) 후보 메뉴 치수,
+    loads: orientation_loads의 (N, K) 점유율 행렬, prices/values: 후보 메뉴 배열 (가치 내림차순 정렬 가정)
+    반환: (담긴 (후보 위치, 용기 위치, ORIENTATIONS 위치) 목록, 목적 값, 탐색 통계 dict)
+    """
+    started = time.perf_counter()
+    containers = np.asarray(containers, dtype=float)
+    n_containers = len(containers)
+    max_price = float('inf') if max_price is None else max_price
+    min_price = 0 if min_price is None else min_price
+    dims = [tuple(row) for row in np.asarray(item_dims, dtype=float).tolist()]
+    container_dims = [tuple(row) for row in containers.tolist()]
+
+    # 같은 크기 용기끼리는 교환해도 같은 상태 (회전 허용 여부에 맞춘 치수 서명)
+    if keep_upright:
+        signatures = [(min(w, l), max(w, l), h) for w, l, h in container_dims]
+    else:
+        signatures = [tuple(sorted(size)) for size in container_dims]
+    fit_containers = [np.flatnonzero(np.isfinite(row)).tolist() for row in loads]
+
+    # 배치 확인 결과 캐시 (용기 치수, 담긴 메뉴 치수 묶음) → 메뉴 치수 순서의 회전 방향 목록 또는 None
+    placements = {}
+
+    def place(container, content):
+        shapes = tuple(sorted(dims[candidate] for candidate in content))
+        key = (container_dims[container], shapes)
+        if key not in placements:
+            placements[key] = place_items(shapes, container_dims[container], keep_upright)
+        return placements[key]
+
+    # 상한: 남은 후보는 가치 내림차순이므로 남은 슬롯 수만큼 다음 후보 가치를 더한 값 이하
+    value_prefix = np.concatenate([[0.0], np.cumsum(values)])
+    slots = max_items * n_containers
+
+    def state_key(price, contents):
+        return (round(price, 2),) + tuple(sorted(
+            (signature, tuple(sorted(dims[candidate] for candidate in content)))
+            for signature, content in zip(signatures, contents)
+        ))
+
+    def fill_score(used):
+        return FILL_WEIGHT * sum(min(load, 1.0) for load in used)
+
+    # 상태: (가치 합, 가격 합, 용기별 점유율, 용기별 담은 후보, 담은 (후보, 용기) 목록)
+    empty = (0.0, 0.0, (0.0,) * n_containers, ((),) * n_containers, ())
+    states = [empty]
+    best, best_objective = (empty if min_price <= 0 else None), 0.0
+    explored = 0
+    visited = 0
+    timed_out = False
+
+    for candidate in range(len(values)):
+        if time.perf_counter() - started > time_budget:
+            timed_out = True
+            break
+        visited += 1
+
+        price, value = float(prices[candidate]), float(values[candidate])
+        memo = {}
+        for state in states:
+            total_value, total_price, used, contents, items = state
+            memo.setdefault(state_key(total_price, contents), state)
+            if total_price + price > max_price:
+                continue
+            for container in fit_containers[candidate]:
+                content = contents[container]
+                if len(content) >= max_items:
+                    continue
+                new_content = content + (candidate,)
+                if len(content) and place(container, new_content) is None:
+                    continue
+                new_used = used[:container] + (used[container] + float(loads[candidate, container]),) + used[container + 1:]
+                new_contents = contents[:container] + (new_content,) + contents[container + 1:]
+                new_state = (total_value + value, total_price + price, new_used, new_contents,
+                             items + ((candidate, container),))
+                key = state_key(new_state[1], new_contents)
+                current = memo.get(key)
+                if current is None or new_state[0] > current[0]:
+                    memo[key] = new_state
+                explored += 1
+
+        # 조건을 만족하는 최선 조합 갱신
+        for state in memo.values():
+            if state[1] >= min_price:
+                objective = state[0] + fill_score(state[2])
+                if best is None or objective > best_objective:
+                    best, best_objective = state, objective
+
+        # 남은 후보를 모두 담아도 최선 조합을 넘지 못하는 상태 제거 후 상위 beam_width개 유지
+        remaining = []
+        for state in memo.values():
+            free_slots = slots - sum(len(content) for content in state[3])
+            upper = (state[0] + value_prefix[min(len(values), candidate + 1 + free_slots)] -
+                     value_prefix[candidate + 1] + FILL_WEIGHT * n_containers)
+            if best is None or upper > best_objective:
+                remaining.append((state[0] + fill_score(state[2]), state))
+        remaining.sort(key=lambda pair: (-pair[0], pair[1][4]))
+        states = [state for _, state in remaining[:beam_width]]
+        if not states:
+            break
+
+    stats = {
+        "states_explored": explored,
+        "candidates_visited": visited,
+        "placement_checks": len(placements),
+        "timed_out": timed_out,
+        "search_ms": round((time.perf_counter() - started) * 1000, 3)
+    }
+    if best is None:
+        return None, 0.0, stats
+
+    # 용기별로 찾은 배치의 회전 방향을 붙여 반환
+    assignment = []
+    for container, content in enumerate(best[3]):
+        content = sorted(content, key=lambda candidate: dims[candidate])
+        assignment.extend(zip(content, [container] * len(content), place(container, content)))
+    return sorted(assignment), best_objective, stats
@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class RecommendationCache:
+    """
+    추천 결과 LRU/TTL 캐시
+    - 최대 크기를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+    - ttl_seconds가 지난 항목은 조회 시 만료 처리
+    - 스레드 안전 (FastAPI 동기 핸들러는 스레드풀에서 실행됨)
+    """
+
+    def __init__(self, max_size=256, ttl_seconds=300):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    def get(self, key, accept=None):
+        """캐시 조회 (없거나 만료되면 None, accept(value)가 거짓이면 미스로 처리)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if self.ttl_seconds is None or time.monotonic() - stored_at <= self.ttl_seconds:
+                    if accept is None or accept(value):
+                        self._entries.move_to_end(key)
+                        self.hits += 1
+                        return value
+                else:
+                    del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """캐시 저장 (크기 초과 시 LRU 항목 제거)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """전체 무효화 (카운터는 유지)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """캐시 상태와 적중/미스 카운터"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
@@ -0,0 +1,213 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+
+class ScoringPoolBusy(Exception):
+    """대기 중인 점수 계산 요청이 상한을 넘음 (503)"""
+
+
+class ScoringTimeout(Exception):
+    """점수 계산이 요청 시간 제한을 넘음 (504)"""
+
+
+class ModelUnavailable(Exception):
+    """AI 모델이 로드되지 않음 (500)"""
+
+
+class ScoringWorkerLost(Exception):
+    """계산 중 워커 프로세스가 비정상 종료됨 (503, 실행기는 새로 만들어 둠)"""
+
+
+# 프로세스 워커마다 하나씩 갖는 모델 인스턴스와 예열용 배리어
+_worker_ai = None
+_worker_barrier = None
+
+
+def _init_process_worker(barrier=None):
+    """프로세스 워커 초기화 - 아티팩트 번들을 memory-map으로 열어 워커 전용 모델 생성
+
+    선호도 모델은 부모 프로세스가 학습해 번들에 저장한 것을 로드만 함 (feedback 로그를 읽지 않음)
+    """
+    global _worker_ai, _worker_barrier
+    _worker_barrier = barrier
+    from ai_model import create_recommendation_ai
+    from event_log import get_default_event_log
+    _worker_ai = create_recommendation_ai(event_log=get_default_event_log(), train_preferences=False)
+
+
+def _warm_up_worker(timeout):
+    """예열용 빈 작업 - 모든 워커가 하나씩 잡을 때까지 배리어에서 대기 (워커마다 정확히 하나씩 실행되게 함)"""
+    if _worker_barrier is not None:
+        _worker_barrier.wait(timeout)
+    return os.getpid()
+
+
+def _call_in_process(method, kwargs):
+    if _worker_ai is None:
+        raise ModelUnavailable()
+    return getattr(_worker_ai, method)(**kwargs)
+
+
+def _call_in_thread(model_getter, method, kwargs):
+    model = model_getter()
+    if model is None:
+        raise ModelUnavailable()
+    return getattr(model, method)(**kwargs)
+
+
+class ScoringPool:
+    """
+    추천 점수 계산 오프로딩 풀
+    - mode='thread': 공유 모델을 스레드풀에서 실행 (NumPy 연산 중 GIL 해제 구간 활용)
+    - mode='process': 워커 프로세스마다 아티팩트 번들에서 모델을 로드해 코어 수만큼 확장
+    - 대기+실행 중 요청이 max_pending을 넘으면 즉시 ScoringPoolBusy (백프레셔)
+    - 요청별 시간 제한 초과 시 ScoringTimeout (아직 시작 전이면 취소, 이미 시작된 계산은 끝까지 실행되며
+      끝날 때까지 대기 수에 포함)
+    - 프로세스 워커는 start()/restart()에서 미리 띄워 모델 로드까지 마침 (요청 시간 제한에 워커 기동이 들어가지 않음)
+    - 워커가 죽어 실행기가 깨지면(BrokenProcessPool) 새 실행기를 예열해 교체
+    """
+
+    def __init__(self, model_getter, mode='thread', workers=None, max_pending=64, timeout=10.0,
+                 warmup_timeout=300.0):
+        if mode not in ('thread', 'process'):
+            raise ValueError(f"지원하지 않는 스코어링 풀 모드: {mode}")
+        self.model_getter = model_getter
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.warmup_timeout = warmup_timeout
+        self.pending = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.workers_lost = 0
+        self.recovered = 0
+        self._lock = threading.Lock()
+        self._executor_lock = threading.Lock()
+        self._executor = self._create_executor()
+
+    def _create_executor(self):
+        if self.mode == 'process':
+            # fork는 로더/감시 스레드가 잡고 있던 락을 복제할 수 있으므로 spawn 사용
+            context = multiprocessing.get_context('spawn')
+            return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_process_worker,
+                                       initargs=(context.Barrier(self.workers),), mp_context=context)
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scoring")
+
+    def _warm_up(self, executor):
+        """워커 수만큼 빈 작업을 보내 모든 워커가 뜨고 모델 로드를 마칠 때까지 대기 (실패하면 실행기를 내리고 예외)"""
+        try:
+            futures = [executor.submit(_warm_up_worker, self.warmup_timeout) for _ in range(self.workers)]
+            return sorted(future.result(self.warmup_timeout * 2) for future in futures)
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def start(self):
+        """프로세스 워커를 미리 띄우고 모델 로드까지 대기 (모델/번들 준비 후, 요청 시간 제한 밖에서 호출)"""
+        if self.mode != 'process':
+            return
+        with self._executor_lock:
+            try:
+                self._warm_up(self._executor)
+            except BaseException:
+                # 예열에 실패해도 요청 때 워커를 띄울 수 있게 빈 실행기로 바꿔 둠
+                self._executor = self._create_executor()
+                raise
+
+    def _recover(self, broken):
+        """깨진 실행기를 예열한 새 실행기로 교체 (다른 요청이 이미 교체했으면 그대로 둠)"""
+        with self._executor_lock:
+            if self._executor is not broken:
+                return
+            executor = self._create_executor()
+            self._warm_up(executor)
+            self._executor = executor
+            self.recovered += 1
+        broken.shutdown(wait=False)
+
+    async def run(self, method, **kwargs):
+        """모델 메서드를 풀에서 실행하고 결과 반환"""
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise ScoringPoolBusy()
+            self.pending += 1
+
+        executor = self._executor
+        try:
+            if self.mode == 'process':
+                call = partial(_call_in_process, method, kwargs)
+            else:
+                call = partial(_call_in_thread, self.model_getter, method, kwargs)
+            try:
+                future = executor.submit(call)
+            except BrokenProcessPool:
+                # 이전에 워커가 죽은 실행기 - 교체를 기다린 뒤(시간 제한 밖) 새 실행기에 제출
+                await asyncio.to_thread(self._recover, executor)
+                executor = self._executor
+                future = executor.submit(call)
+        except BaseException:
+            self._release()
+            raise
+        # 슬롯은 작업이 실제로 끝나거나 취소될 때 반납 (시간 초과 후에도 실행 중인 작업은 계속 대기 수에 남음)
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise ScoringTimeout()
+        except BrokenProcessPool:
+            # 계산 중 워커가 죽음 - 이 요청의 계산은 잃지만 다음 요청을 위해 실행기를 교체
+            self.workers_lost += 1
+            await asyncio.to_thread(self._recover, executor)
+            raise ScoringWorkerLost()
+
+    def _release(self, future=None):
+        with self._lock:
+            self.pending -= 1
+
+    def restart(self):
+        """프로세스 워커 재시작 (모델 리로드 후 새 번들을 읽게 함)
+
+        새 워커를 모두 예열한 뒤 교체하므로 그동안의 요청은 기존 워커가 처리하고, 진행 중인 작업도 기존 워커에서 완료
+        """
+        if self.mode != 'process':
+            return
+        with self._executor_lock:
+            executor = self._create_executor()
+            self._warm_up(executor)
+            old_executor, self._executor = self._executor, executor
+        old_executor.shutdown(wait=False)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def worker_pids(self):
+        """현재 실행기의 프로세스 워커 pid 목록 (스레드 모드나 start()/첫 요청 전에는 빈 목록)
+
+        restart()로 내려가는 중인 이전 워커나 다른 자식 프로세스는 포함하지 않음
+        """
+        if self.mode != 'process':
+            return []
+        processes = getattr(self._executor, '_processes', None) or {}
+        return sorted(process.pid for process in list(processes.values()))
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "timeout_seconds": self.timeout,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "workers_lost": self.workers_lost,
+            "recovered": self.recovered
+        }
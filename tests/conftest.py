@@ -0,0 +1,49 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# 테스트 중에는 추천 이벤트 로그를 쓰지 않음 (event_log 임포트 전에 설정)
+os.environ.setdefault("RECOMMENDATION_LOG_DIR", "")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CATEGORIES = ['한식', '중식', '일식', '양식', '기타']
+MENU_WORDS = ['김치', '찌개', '짜장', '짬뽕', '초밥', '우동', '파스타', '피자', '샐러드', '떡볶이', '덮밥', '볶음밥']
+
+
+def make_menus(n, seed=0, restaurants=20):
+    """치수가 정수/소수가 섞인 합성 메뉴 카탈로그 (부피 동률이 자주 생기도록)"""
+    rng = np.random.default_rng(seed)
+    names = [f"{rng.choice(MENU_WORDS)}{rng.choice(MENU_WORDS)}" for _ in range(n)]
+    return pd.DataFrame({
+        'menu_id': [f"M{i:05d}" for i in range(n)],
+        'restaurant_id': [f"R{i % restaurants:03d}" for i in range(n)],
+        'menu_name': names,
+        'category': rng.choice(CATEGORIES, n),
+        'price': rng.integers(5, 40, n) * 500,
+        'width': np.round(rng.uniform(5, 30, n) * 2) / 2,
+        'length': np.round(rng.uniform(5, 30, n) * 2) / 2,
+        'height': rng.integers(2, 15, n).astype(float),
+        'popularity_score': np.round(rng.uniform(1, 10, n), 1),
+    })
+
+
+def make_restaurants(n=20):
+    return pd.DataFrame({
+        'restaurant_id': [f"R{i:03d}" for i in range(n)],
+        'name': [f"레스토랑_{i}" for i in range(n)],
+    })
+
+
+@pytest.fixture
+def build_ai():
+    """합성 카탈로그로 모델 생성 (디스크 번들/로그 없음)"""
+    from ai_model import AdvancedFoodRecommendationAI
+
+    def build(menus_df=None, restaurants_df=None, **kwargs):
+        menus_df = make_menus(300) if menus_df is None else menus_df
+        restaurants_df = make_restaurants() if restaurants_df is None else restaurants_df
+        return AdvancedFoodRecommendationAI(menus_df, restaurants_df, **kwargs)
+    return build
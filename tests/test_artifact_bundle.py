@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from ai_model import create_recommendation_ai
+
+NOW = datetime(2024, 5, 15, 12, 30)
+CONTAINERS = [(20.0, 20.0, 8.0), (12.3, 10.7, 5.3), (30.0, 30.0, 15.0), (15.0, 12.0, 6.0)]
+
+
+def _without_times(result):
+    metadata = {key: value for key, value in result.get("metadata", {}).items()
+                if key not in ("recommendation_time", "cache_hit", "search_ms")}
+    return {**result, "metadata": metadata}
+
+
+@pytest.mark.parametrize("similarity_neighbors", [None, 10])
+def test_loaded_bundle_matches_built_model(tmp_path, similarity_neighbors):
+    options = {"artifacts_dir": str(tmp_path), "interactions_dir": "", "similarity_neighbors": similarity_neighbors}
+    built = create_recommendation_ai(**options)
+    loaded = create_recommendation_ai(**options)
+
+    # 두 번째 모델은 학습 없이 memory-map 번들에서 복원
+    assert isinstance(loaded.fit_index.arrays()['volumes'], np.memmap)
+    assert isinstance(loaded.static_content_terms, np.memmap)
+    assert isinstance(loaded.similar_index.centroids, np.memmap)
+    assert loaded.catalog.widths.dtype == np.float64
+    assert (loaded.neighbor_index is not None) == (similarity_neighbors is not None)
+
+    for width, length, height in CONTAINERS:
+        assert (_without_times(loaded.get_hybrid_recommendations(width, length, height, current_time=NOW))
+                == _without_times(built.get_hybrid_recommendations(width, length, height, current_time=NOW)))
+        assert (loaded.get_simple_recommendations(width, length, height, top_k=10)
+                == built.get_simple_recommendations(width, length, height, top_k=10))
+        assert (_without_times(loaded.get_hybrid_recommendations(width, length, height, preferred_category='한식',
+                                                                 min_price=8000, current_time=NOW))
+                == _without_times(built.get_hybrid_recommendations(width, length, height, preferred_category='한식',
+                                                                   min_price=8000, current_time=NOW)))
+
+    menu_id = built.menus_df['menu_id'].iloc[0]
+    assert (loaded.get_similar_menus(menu_id=menu_id, top_k=5, exact=True)["data"]
+            == built.get_similar_menus(menu_id=menu_id, top_k=5, exact=True)["data"])
+    # ANN 인덱스도 다시 학습하지 않고 저장된 중심/배정을 그대로 사용
+    assert (loaded.get_similar_menus(menu_id=menu_id, top_k=5)["data"]
+            == built.get_similar_menus(menu_id=menu_id, top_k=5)["data"])
+    assert loaded.get_similar_menus(text="김치찌개", top_k=5) == built.get_similar_menus(text="김치찌개", top_k=5)
+    assert loaded.get_content_based_recommendations(3, top_k=5) == built.get_content_based_recommendations(3, top_k=5)
+
+    packing = {"containers": [{"width": 25, "length": 25, "height": 10}], "time_budget_ms": 10000, "current_time": NOW}
+    assert (loaded.get_packing_recommendations(**packing)["data"]
+            == built.get_packing_recommendations(**packing)["data"])
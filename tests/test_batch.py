@@ -0,0 +1,38 @@
+from datetime import datetime
+
+NOW = datetime(2024, 5, 15, 12, 30)
+
+
+def _comparable(result):
+    """요청 시각/캐시 여부처럼 호출마다 달라지는 metadata를 뺀 결과"""
+    metadata = {key: value for key, value in result.get("metadata", {}).items()
+                if key not in ("recommendation_time", "cache_hit")}
+    return {**result, "metadata": metadata}
+
+
+def test_batch_matches_single_calls(build_ai):
+    containers = [
+        {"width": 20.0, "length": 18.5, "height": 8.0},
+        {"width": 12.0, "length": 30.0, "height": 5.0, "category": "한식", "top_k": 3},
+        {"width": 25.0, "length": 25.0, "height": 12.0, "min_price": 5000, "max_price": 12000},
+        {"width": 20.0, "length": 18.5, "height": 8.0},
+        {"width": 1.0, "length": 1.0, "height": 1.0},
+        {"width": 15.0, "length": 15.0, "height": 6.0, "category": "없는카테고리"},
+    ]
+    batch = build_ai(cache_size=0).get_batch_recommendations(containers, current_time=NOW)
+
+    single_ai = build_ai(cache_size=0)
+    singles = [
+        single_ai.get_hybrid_recommendations(
+            c["width"], c["length"], c["height"], preferred_category=c.get("category"),
+            top_k=c.get("top_k", 5), min_price=c.get("min_price"), max_price=c.get("max_price"),
+            current_time=NOW)
+        for c in containers
+    ]
+    assert [_comparable(r) for r in batch] == [_comparable(r) for r in singles]
+    assert batch[0]["status"] == "success" and batch[0]["data"]
+    assert batch[-1]["status"] == "error"
+
+    # 중복 용기는 한 번만 계산하지만 응답은 서로 독립된 사본
+    batch[3]["data"][0]["scores"]["final_score"] = -1
+    assert batch[0]["data"][0]["scores"]["final_score"] != -1
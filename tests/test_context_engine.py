@@ -0,0 +1,65 @@
+from datetime import datetime
+
+import ai_model
+from conftest import make_menus, make_restaurants
+from context_engine import parse_business_hours, SLOT_MINUTES, SLOTS_PER_DAY
+
+# 2024-05-13은 월요일
+MONDAY = 13
+
+
+def is_open(week, day, hour, minute=0):
+    """요일(0=월)과 시각이 영업 칸에 드는지"""
+    return bool(week[day * SLOTS_PER_DAY + (hour * 60 + minute) // SLOT_MINUTES])
+
+
+def test_break_time_and_last_order():
+    week = parse_business_hours("09:10~19:00", "break time : 16:00~17:00")
+    assert not is_open(week, 0, 9, 0) and is_open(week, 0, 9, 15)
+    assert is_open(week, 2, 15, 45) and not is_open(week, 2, 16, 30) and is_open(week, 2, 17, 0)
+    assert is_open(week, 6, 18, 45) and not is_open(week, 6, 19, 0)
+
+    week = parse_business_hours("11:00~23:00", "last order : 21:30")
+    assert is_open(week, 4, 21, 15) and not is_open(week, 4, 21, 30)
+
+
+def test_weekend_override_and_weekend_last_order():
+    week = parse_business_hours("10:00~23:00 (주말 : 10:00~22:00)", "last order : 22:50 (주말 last order : 21:50)")
+    assert is_open(week, 2, 22, 30) and not is_open(week, 2, 23, 0)
+    assert is_open(week, 5, 21, 30) and not is_open(week, 5, 22, 0)
+    assert not is_open(week, 6, 22, 0)
+
+    week = parse_business_hours("10:50~23:00 (일요일 : 10:50~21:25)")
+    assert is_open(week, 5, 22, 0) and not is_open(week, 6, 22, 0)
+
+
+def test_regular_closing_day_and_overnight_hours():
+    week = parse_business_hours("12:00~24:00", "last order : 23:30 (매주 일요일 정기휴무)")
+    assert not is_open(week, 6, 13, 0)
+    assert is_open(week, 0, 23, 15) and not is_open(week, 0, 23, 30)
+
+    # 자정을 넘기는 영업은 다음 요일 새벽으로, 일요일 밤은 월요일 새벽으로 이어짐
+    week = parse_business_hours("18:00~02:00")
+    assert is_open(week, 4, 1, 0) and is_open(week, 0, 1, 45) and not is_open(week, 0, 2, 0)
+    assert not is_open(week, 0, 12, 0)
+
+
+def test_unparseable_hours_are_none():
+    assert parse_business_hours("연중무휴") is None
+    assert parse_business_hours(float("nan")) is None
+
+
+def test_closed_restaurants_are_kept_unless_filter_enabled(build_ai, monkeypatch):
+    restaurants = make_restaurants()
+    restaurants['business_hour'] = "10:00~20:00"
+    ai = build_ai(make_menus(300), restaurants, cache_size=0)
+    late_night = datetime(2024, 5, MONDAY + 5, 0, 14)
+
+    result = ai.get_hybrid_recommendations(25.0, 25.0, 12.0, current_time=late_night)
+    assert result["data"] and result["metadata"]["closed_excluded"] == 0
+
+    monkeypatch.setattr(ai_model, "FILTER_CLOSED_RESTAURANTS", True)
+    result = ai.get_hybrid_recommendations(25.0, 25.0, 12.0, current_time=late_night)
+    assert result["data"] == [] and result["metadata"]["closed_excluded"] > 0
+    daytime = ai.get_hybrid_recommendations(25.0, 25.0, 12.0, current_time=datetime(2024, 5, MONDAY + 5, 12, 0))
+    assert daytime["data"] and daytime["metadata"]["closed_excluded"] == 0
@@ -0,0 +1,45 @@
+from csv_ingest import ingest_csv, MENU_SCHEMA
+
+HEADER = "menu_id,restaurant_id,menu_name,category,price,width,length,height,popularity_score"
+
+
+def test_bad_lines_are_counted_and_numeric_columns_keep_their_values(tmp_path):
+    rows = [
+        "M1,R1,김치찌개,한식,\"9,000\",12.3,10.7,5,8.5",
+        "M2,R1,짜장면,중식,7000,10,10,5,",
+        "M3,R2,초밥,일식,15000,12,10,5,9,extra",
+        "M4,R2,우동,일식,abc,,10.5,4,7",
+    ]
+    path = tmp_path / "menus.csv"
+    path.write_text("\n".join([HEADER] + rows) + "\n", encoding="utf-8")
+
+    df, report = ingest_csv(str(path), MENU_SCHEMA, chunksize=2)
+    assert list(df['menu_id']) == ['M1', 'M2', 'M4']
+    assert report["skipped_rows"] == 1
+    # 청크 첫 행(M3)이라도 넘치는 필드를 잘라 읽지 않고 줄 번호와 함께 보고
+    assert report["skipped"] == [{"line": 4, "reason": "Expected 9 fields, saw 10"}]
+    assert report["invalid_values"] == {"price": 1}
+
+    # 청크 단위로 줄인 타입은 원래 타입으로 복원되고 소수 크기는 그대로
+    assert df['price'].dtype == 'int64' and list(df['price']) == [9000, 7000, 8000]
+    assert df['width'].dtype == 'float64' and list(df['width']) == [12.3, 10.0, 15.0]
+    assert list(df['height']) == [5, 5, 4] and df['height'].dtype == 'int64'
+    assert list(df['popularity_score']) == [8.5, 5.0, 7.0]
+
+
+def test_skipped_line_numbers_count_physical_lines_inside_quoted_fields(tmp_path):
+    rows = [
+        "M1,R1,\"김치\n찌개\",한식,9000,12,10,5,8",
+        "M2,R1,짜장면,중식,7000,10,10,5,7,extra",
+        "",
+        "M3,R2,\"초밥, 세트\",일식,15000,12,10,5,9,\"x\ny\"",
+        "M4,R2,우동,일식,8000,10,10,4,7",
+    ]
+    path = tmp_path / "menus.csv"
+    path.write_text("\n".join([HEADER] + rows) + "\n", encoding="utf-8")
+
+    for chunksize in (1, 2, 50):
+        df, report = ingest_csv(str(path), MENU_SCHEMA, chunksize=chunksize)
+        assert list(df['menu_id']) == ['M1', 'M4']
+        assert df['menu_name'].tolist() == ['김치\n찌개', '우동']
+        assert [skip["line"] for skip in report["skipped"]] == [4, 6]
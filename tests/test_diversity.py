@@ -0,0 +1,62 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import ai_model
+from conftest import make_menus, make_restaurants
+
+
+def _menus():
+    names = [('김치찌개', '한식'), ('김치찌개', '한식'), ('초밥', '일식'), ('짜장면', '중식'), ('파스타', '양식'),
+             ('떡볶이', '한식'), ('우동', '일식'), ('샐러드', '기타')]
+    return pd.DataFrame({
+        'menu_id': [f"M{i}" for i in range(len(names))],
+        'restaurant_id': [f"R{i:03d}" for i in range(len(names))],
+        'menu_name': [name for name, _ in names],
+        'category': [category for _, category in names],
+        'price': 9000,
+        'width': 15.0, 'length': 15.0, 'height': 6.0,
+        'popularity_score': 8.0,
+    })
+
+
+SCORES = np.array([90.0, 89.9, 85.0, 84.0, 83.0, 82.0, 81.0, 80.0])
+
+
+def test_near_duplicate_is_demoted(build_ai):
+    ai = build_ai(_menus(), make_restaurants(8))
+    positions = np.arange(len(SCORES))
+
+    selected = ai._rerank_diverse(positions, SCORES, top_k=3)
+    # 같은 이름/카테고리인 1번은 점수가 두 번째로 높아도 뒤로 밀림
+    assert selected[0] == 0
+    assert 1 not in selected
+    assert list(selected) == [0, 2, 3]
+
+
+def test_zero_diversity_weight_keeps_relevance_order(build_ai, monkeypatch):
+    ai = build_ai(_menus(), make_restaurants(8))
+    monkeypatch.setattr(ai_model, "MMR_DIVERSITY_WEIGHT", 0)
+
+    assert list(ai._rerank_diverse(np.arange(len(SCORES)), SCORES, top_k=5)) == [0, 1, 2, 3, 4]
+    scores = np.round(np.random.default_rng(4).uniform(0, 100, 500), 1)
+    np.testing.assert_array_equal(ai._rerank_diverse(np.arange(500), scores, top_k=5),
+                                  np.argsort(-scores, kind='stable')[:5])
+
+
+def test_selection_is_deterministic(build_ai):
+    menus = make_menus(500, seed=6)
+    first, second = build_ai(menus, cache_size=0), build_ai(menus, cache_size=0)
+    # 반올림 점수라 동점이 많음 - 동점은 후보 순서로 정해져야 함
+    scores = np.round(np.random.default_rng(8).uniform(60, 62, 500), 1)
+    positions = np.arange(500)
+
+    selected = first._rerank_diverse(positions, scores, top_k=5)
+    assert len(set(selected)) == 5
+    for _ in range(3):
+        np.testing.assert_array_equal(first._rerank_diverse(positions, scores, top_k=5), selected)
+    np.testing.assert_array_equal(second._rerank_diverse(positions, scores, top_k=5), selected)
+    now = datetime(2024, 5, 15, 12, 30)
+    assert (first.get_hybrid_recommendations(20, 20, 8, current_time=now)["data"]
+            == second.get_hybrid_recommendations(20, 20, 8, current_time=now)["data"])
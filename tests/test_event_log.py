@@ -0,0 +1,54 @@
+from event_log import RecommendationEventLog, read_interaction_log
+
+
+def test_feedback_rating_round_trip(build_ai, tmp_path):
+    event_log = RecommendationEventLog(str(tmp_path), flush_interval=0.05).start()
+    ai = build_ai(event_log=event_log)
+
+    ai.get_hybrid_recommendations(25, 25, 10, top_k=3, user_id="u1")
+    assert ai.log_feedback("M00001", 8, user_id="u1", width=25, length=25, height=10)["recorded"]
+    assert ai.log_feedback("M00002", 3.5)["recorded"]
+    assert ai.log_feedback("NOPE", 5)["status"] == "error"
+    event_log.close()
+
+    everything = read_interaction_log(str(tmp_path))
+    assert set(everything["event_type"]) == {"recommendation", "feedback"}
+
+    feedback = read_interaction_log(str(tmp_path), event_types=("feedback",))
+    assert feedback["menu_id"].tolist() == ["M00001", "M00002"]
+    assert feedback["rating"].tolist() == [8.0, 3.5]
+    assert feedback["container_width"].tolist()[0] == 25
+    assert feedback["user_id"].tolist()[0] == "u1"
+
+
+def test_feedback_without_event_log_is_not_recorded(build_ai):
+    ai = build_ai()
+    assert ai.log_feedback("M00001", 7) == {"status": "success", "recorded": False}
+
+
+def test_feedback_events_are_written_to_their_own_files(tmp_path):
+    event_log = RecommendationEventLog(str(tmp_path), flush_interval=0.05).start()
+    event_log.log({"event_type": "recommendation", "items": [{"menu_id": "M1"}]})
+    event_log.log({"event_type": "feedback", "items": [{"menu_id": "M2", "rating": 4}]})
+    event_log.close()
+
+    names = sorted(path.name.split("-")[0] for path in tmp_path.iterdir())
+    assert names == ["feedback", "recommendations"]
+    feedback_file = next(tmp_path.glob("feedback-*.jsonl"))
+    assert '"recommendation"' not in feedback_file.read_text(encoding='utf-8')
+    assert read_interaction_log(str(tmp_path), event_types=("feedback",))["menu_id"].tolist() == ["M2"]
+
+
+def test_expired_recommendation_logs_are_removed(tmp_path):
+    old_recommendations = tmp_path / "recommendations-20000101-1-000.jsonl"
+    old_feedback = tmp_path / "feedback-20000101-1-000.jsonl"
+    for path in (old_recommendations, old_feedback):
+        path.write_text('{"event_type": "feedback", "items": []}\n', encoding='utf-8')
+
+    event_log = RecommendationEventLog(str(tmp_path), flush_interval=0.05, retention_days=7).start()
+    event_log.log({"event_type": "recommendation", "items": []})
+    event_log.close()
+
+    assert not old_recommendations.exists()
+    assert old_feedback.exists()
+    assert event_log.stats()["removed_files"] == 1
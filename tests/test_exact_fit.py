@@ -0,0 +1,33 @@
+import pandas as pd
+
+from conftest import make_restaurants
+
+
+def _menus():
+    return pd.DataFrame({
+        'menu_id': ['A', 'B', 'C'],
+        'restaurant_id': ['R000', 'R001', 'R002'],
+        'menu_name': ['김치찌개', '짜장면', '초밥'],
+        'category': ['한식', '중식', '일식'],
+        'price': [9000, 7000, 15000],
+        'width': [12.3, 10.1, 12.4],
+        'length': [10.7, 10.0, 10.7],
+        'height': [5.3, 5.0, 5.3],
+        'popularity_score': [8.0, 7.0, 9.0],
+    })
+
+
+def test_menu_with_container_dimensions_fits(build_ai):
+    ai = build_ai(_menus(), make_restaurants(3))
+
+    hybrid = ai.get_hybrid_recommendations(12.3, 10.7, 5.3)
+    assert sorted(menu["menu_id"] for menu in hybrid["data"]) == ['A', 'B']
+    exact = next(menu for menu in hybrid["data"] if menu["menu_id"] == 'A')
+    assert exact["size"] == {"width": 12.3, "length": 10.7, "height": 5.3}
+    assert exact["volume_utilization"] == 100.0
+
+    simple = ai.get_simple_recommendations(12.3, 10.7, 5.3)
+    assert [menu["menu_id"] for menu in simple] == ['A', 'B']
+
+    batch = ai.get_batch_recommendations([{"width": 12.3, "length": 10.7, "height": 5.3}])
+    assert sorted(menu["menu_id"] for menu in batch[0]["data"]) == ['A', 'B']
@@ -0,0 +1,63 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ai_model
+from conftest import make_menus
+from menu_index import ContainerFitIndex
+
+NOW = datetime(2024, 5, 15, 12, 30)
+CONTAINERS = [(20.0, 20.0, 8.0), (25.0, 18.5, 10.0), (30.0, 30.0, 15.0), (12.0, 10.0, 6.0)]
+
+
+def test_utilization_band_matches_brute_force():
+    menus = make_menus(3000, seed=9)
+    index = ContainerFitIndex(menus['width'], menus['length'], menus['height'])
+    dimensions = menus[['width', 'length', 'height']].to_numpy()
+    within = np.arange(0, 3000, 3)
+
+    for container in CONTAINERS:
+        fits = np.all(dimensions <= container, axis=1)
+        rate = dimensions.prod(axis=1) / np.prod(container) * 100
+        expected = np.flatnonzero(fits & (rate >= 45) & (rate <= 90))
+        np.testing.assert_array_equal(index.query_utilization_band(*container), expected)
+        np.testing.assert_array_equal(index.query_utilization_band(*container, within=within),
+                                      np.intersect1d(expected, within))
+
+
+@pytest.mark.parametrize("trained", [False, True])
+def test_band_pruning_keeps_hybrid_results(build_ai, monkeypatch, trained):
+    menus = make_menus(6000, seed=12)
+    ai = build_ai(menus, cache_size=0)
+    if trained:
+        rng = np.random.default_rng(0)
+        ai.train_preference_model(pd.DataFrame({
+            'menu_id': menus['menu_id'].sample(200, random_state=1).to_numpy(),
+            'rating': rng.uniform(0, 10, 200).round(1),
+        }))
+        assert ai.preference_model_fitted
+
+    pruned_sizes = []
+    prune = ai._prune_by_utilization_band
+
+    def spy(*args, **kwargs):
+        kept = prune(*args, **kwargs)
+        pruned_sizes.append((len(args[3]), len(kept)))
+        return kept
+    monkeypatch.setattr(ai, "_prune_by_utilization_band", spy)
+
+    for container in CONTAINERS[:3]:
+        for category in (None, '한식'):
+            monkeypatch.setattr(ai_model, "BAND_PRUNE_MIN_CANDIDATES", 0)
+            full = ai.get_hybrid_recommendations(*container, preferred_category=category, current_time=NOW)
+            monkeypatch.setattr(ai_model, "BAND_PRUNE_MIN_CANDIDATES", 100)
+            pruned = ai.get_hybrid_recommendations(*container, preferred_category=category, current_time=NOW)
+
+            assert pruned["data"] == full["data"]
+            assert pruned["metadata"]["total_candidates"] == full["metadata"]["total_candidates"]
+
+    # 상위권에 들 수 없는 구간 밖 메뉴는 선호도 예측 전에 빠짐 (선호도 범위가 좁을수록 많이)
+    total, kept = np.sum(pruned_sizes, axis=0)
+    assert kept < (0.9 if trained else 0.3) * total
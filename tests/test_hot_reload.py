@@ -0,0 +1,125 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics.pairwise import cosine_similarity
+
+from conftest import make_menus
+from model_provider import ModelProvider
+
+CONTAINER = (20.0, 20.0, 8.0)
+
+
+def test_reload_swaps_model_while_requests_are_in_flight():
+    old, new = object(), object()
+    reload_started, finish_reload = threading.Event(), threading.Event()
+
+    def reload_factory(current):
+        assert current is old
+        reload_started.set()
+        assert finish_reload.wait(5)
+        return new
+
+    provider = ModelProvider(lambda: old, reload_factory)
+    assert provider.get(timeout=5) is old
+
+    # 리로드 전에 모델을 받은 요청은 교체 뒤에도 그 인스턴스로 끝까지 처리
+    in_flight = provider.get()
+    seen, stop = [], threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            seen.append((provider.get(), provider.generation))
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+
+    assert provider.reload()
+    assert reload_started.wait(5)
+    # 새 모델을 만드는 동안에는 기존 모델로 응답하고 중복 리로드는 거절
+    assert provider.model is old and provider.reloading
+    assert not provider.reload()
+
+    finish_reload.set()
+    while provider.reloading:
+        time.sleep(0.01)
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    assert provider.model is new and provider.generation == 2
+    assert in_flight is old
+    # 요청은 항상 완성된 모델 하나만 봄 (None 없음, 세대 2부터는 새 모델)
+    assert {model for model, _ in seen} <= {old, new}
+    assert all(model is new for model, generation in seen if generation == 2)
+
+
+def test_failed_reload_keeps_the_current_model():
+    old = object()
+
+    def broken(current):
+        raise ValueError("bad csv")
+
+    provider = ModelProvider(lambda: old, broken)
+    provider.get(timeout=5)
+    assert provider.reload(wait=True)
+
+    assert provider.model is old and provider.generation == 1
+    assert provider.last_reload["status"] == "failed" and "bad csv" in provider.last_reload["error"]
+
+
+def test_reloaded_model_serves_requests_during_swap(build_ai):
+    base = build_ai(make_menus(300, seed=2), cache_size=0)
+    expected_old = base.get_simple_recommendations(*CONTAINER, top_k=10)
+    provider = ModelProvider(lambda: base, lambda current: current.with_menu_changes(removed_ids=["M00000", "M00001"]))
+    provider.get(timeout=30)
+
+    results, stop = [], threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            model = provider.get()
+            results.append((model, model.get_simple_recommendations(*CONTAINER, top_k=10)))
+
+    readers = [threading.Thread(target=reader) for _ in range(3)]
+    for thread in readers:
+        thread.start()
+    provider.reload(wait=True)
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    new = provider.model
+    assert new is not base and len(new.menus_df) == 298
+    expected_new = new.get_simple_recommendations(*CONTAINER, top_k=10)
+    for model, result in results:
+        assert result == (expected_old if model is base else expected_new)
+
+
+@pytest.mark.parametrize("content_vectorizer", ["tfidf", "hashing"])
+def test_incremental_content_update_matches_full_rebuild(build_ai, content_vectorizer):
+    options = {"content_vectorizer": content_vectorizer, "cache_size": 0}
+    base = build_ai(make_menus(300, seed=4), **options)
+    renamed = {**base.menus_df.iloc[10].to_dict(), "menu_name": "해물 크림 파스타"}
+    added = {"menu_id": "NEW1", "restaurant_id": "R003", "menu_name": "참치 김밥", "category": "한식",
+             "price": 4500, "width": 18.0, "length": 6.0, "height": 5.0, "popularity_score": 7.5}
+    changed = base.with_menu_changes(upserts=pd.DataFrame([renamed, added]), removed_ids=["M00000", "M00200"])
+
+    # 바뀐 두 메뉴만 변환하고 나머지 행은 재사용
+    assert changed.content_changes_since_fit == 2
+    assert len(changed.menus_df) == 299
+    assert changed.menus_df.set_index('menu_id').loc[renamed['menu_id'], 'menu_name'] == "해물 크림 파스타"
+
+    # 같은 어휘로 전체 메뉴를 다시 변환한 결과와 일치
+    features = base.content_vectorizer.transform(changed.menu_texts)
+    assert abs(changed.content_features - features).max() < 1e-12
+    np.testing.assert_allclose(changed.menu_similarity_matrix, cosine_similarity(features), atol=1e-12)
+
+    # 해시 어휘는 학습 상태가 없으므로 처음부터 만든 모델과도 같아야 함
+    if content_vectorizer == "hashing":
+        rebuilt = build_ai(changed.menus_df, **options)
+        assert abs(changed.content_features - rebuilt.content_features).max() < 1e-12
+        np.testing.assert_allclose(changed.menu_similarity_matrix, rebuilt.menu_similarity_matrix, atol=1e-12)
@@ -0,0 +1,77 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ai_model
+from conftest import make_menus
+
+NOW = datetime(2024, 5, 15, 12, 30)
+
+
+def _reference_scores(ai, width, length, height, category=None, min_price=None, max_price=None):
+    """메뉴별로 한 행씩 계산하는 기존 방식의 최종 점수 {위치: (적합성, 선호도, 최종 점수)}"""
+    weights = ai.get_contextual_weights(NOW)
+    scores = {}
+    for idx, menu in ai.menus_df.reset_index(drop=True).iterrows():
+        if category is not None and menu['category'] != category:
+            continue
+        if (min_price is not None and menu['price'] < min_price) or (max_price is not None and menu['price'] > max_price):
+            continue
+        fit_score = ai.calculate_advanced_fit_score(width, length, height, menu['width'], menu['length'], menu['height'])
+        if fit_score <= 0:
+            continue
+        content_score = len(ai.get_content_based_recommendations(idx, 5)) * 2
+        user_features = [width, length, height, menu['price'], menu['popularity_score']] + [
+            1 if menu['category'] == name else 0 for name in ai.PREFERENCE_CATEGORIES
+        ]
+        preference_score = ai.predict_user_preference(user_features) * 10
+        final_score = (
+            fit_score * 0.4 +
+            preference_score * 0.25 +
+            content_score * 0.15 +
+            menu['popularity_score'] * 2 * 0.2
+        ) * weights.get(menu['category'], 1.0)
+        scores[idx] = (fit_score, preference_score, final_score)
+    return scores
+
+
+@pytest.mark.parametrize("trained", [False, True])
+@pytest.mark.parametrize("container, filters", [
+    ((20.0, 20.0, 8.0), {}),
+    ((25.0, 18.5, 10.0), {"category": "한식"}),
+    ((30.0, 30.0, 15.0), {"min_price": 8000, "max_price": 15000}),
+])
+def test_vectorized_scores_match_per_row_reference(build_ai, monkeypatch, trained, container, filters):
+    menus = make_menus(300, seed=21)
+    ai = build_ai(menus, cache_size=0)
+    if trained:
+        ai.train_preference_model(pd.DataFrame({
+            'menu_id': menus['menu_id'].sample(60, random_state=3).to_numpy(),
+            'rating': np.random.default_rng(5).uniform(0, 10, 60).round(1),
+        }))
+    monkeypatch.setattr(ai_model, "BAND_PRUNE_MIN_CANDIDATES", 0)
+
+    captured = {}
+    build_result = ai._build_hybrid_result
+
+    def spy(width, length, height, top_k, weights, positions, fit_scores, preference_scores, multipliers,
+            final_scores, *args, **kwargs):
+        captured.update(positions=positions, fit=fit_scores, preference=preference_scores, final=final_scores)
+        return build_result(width, length, height, top_k, weights, positions, fit_scores, preference_scores,
+                            multipliers, final_scores, *args, **kwargs)
+    monkeypatch.setattr(ai, "_build_hybrid_result", spy)
+
+    result = ai._compute_hybrid_recommendations(*container, preferred_category=filters.get("category"),
+                                                min_price=filters.get("min_price"),
+                                                max_price=filters.get("max_price"), current_time=NOW)
+    assert result["status"] == "success"
+
+    reference = _reference_scores(ai, *container, **filters)
+    assert sorted(captured["positions"].tolist()) == sorted(reference)
+    expected = np.array([reference[position] for position in captured["positions"]])
+    np.testing.assert_allclose(captured["fit"], expected[:, 0], rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(captured["preference"], expected[:, 1], rtol=1e-9, atol=1e-9)
+    # 카탈로그 인기도는 float32로 저장되므로 최종 점수는 그만큼의 오차 허용 (응답 점수는 소수 첫째 자리)
+    np.testing.assert_allclose(captured["final"], expected[:, 2], rtol=1e-6, atol=1e-6)
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+from sklearn.metrics.pairwise import cosine_similarity
+
+from conftest import make_menus
+from menu_index import SimilarityNeighborIndex, ClusteredVectorIndex
+
+
+def test_incremental_update_matches_full_rebuild(monkeypatch):
+    rng = np.random.default_rng(7)
+    old_features = rng.normal(size=(400, 16))
+    old_index = SimilarityNeighborIndex.build(old_features, k=8)
+
+    # 3개 삭제, 2개 변경, 6개 추가
+    kept = np.setdiff1d(np.arange(400), [5, 17, 100])
+    features = old_features[kept].copy()
+    reused_rows = kept.copy()
+    features[[30, 31]] = rng.normal(size=(2, 16))
+    reused_rows[[30, 31]] = -1
+    features = np.vstack([features, rng.normal(size=(6, 16))])
+    reused_rows = np.concatenate([reused_rows, np.full(6, -1)])
+
+    expected = SimilarityNeighborIndex.build(features, k=8)
+
+    # 영향받은 행만 다시 계산해야 함 (전체 재구축 경로로 빠지지 않음)
+    def no_rebuild(*args, **kwargs):
+        raise AssertionError("full rebuild")
+    monkeypatch.setattr(SimilarityNeighborIndex, "build", classmethod(no_rebuild))
+    updated = old_index.updated(features, reused_rows)
+
+    np.testing.assert_array_equal(updated.indices, expected.indices)
+    np.testing.assert_allclose(updated.scores, expected.scores, atol=1e-6)
+
+
+def test_model_menu_changes_match_a_model_built_from_scratch(build_ai):
+    options = {"content_vectorizer": "hashing", "similarity_neighbors": 10, "cache_size": 0}
+    base = build_ai(make_menus(400, seed=11), **options)
+    upserts = pd.DataFrame([
+        {**base.menus_df.iloc[20].to_dict(), "menu_name": "해물 크림 파스타", "price": 13500},
+        {"menu_id": "NEW1", "restaurant_id": "R001", "menu_name": "참치 김밥", "category": "한식",
+         "price": 4500, "width": 18.0, "length": 6.0, "height": 5.0, "popularity_score": 7.5},
+        {"menu_id": "NEW2", "restaurant_id": "R002", "menu_name": "마라 짬뽕", "category": "중식",
+         "price": 11000, "width": 20.0, "length": 20.0, "height": 9.0, "popularity_score": 8.0},
+    ])
+    changed = base.with_menu_changes(upserts=upserts, removed_ids=["M00003", "M00150"])
+    rebuilt = build_ai(changed.menus_df, **options)
+
+    assert len(changed.menus_df) == 400 - 2 + 2
+    assert (changed.content_features != rebuilt.content_features).nnz == 0
+    # 같은 이름의 메뉴가 많아 동점 이웃 순서는 다를 수 있으므로 점수로 비교
+    np.testing.assert_allclose(changed.neighbor_index.scores, rebuilt.neighbor_index.scores, atol=1e-6)
+    # 이웃 위치도 실제 유사도와 맞고 자기 자신은 없음
+    similarity = cosine_similarity(changed.content_features)
+    indices = changed.neighbor_index.indices
+    np.testing.assert_allclose(np.take_along_axis(similarity, indices, axis=1), changed.neighbor_index.scores,
+                               atol=1e-6)
+    assert not np.any(indices == np.arange(len(indices))[:, None])
+
+
+def _recall(index, queries, top_k, n_probe):
+    """ANN 결과 중 정확한 top_k의 k번째 점수 이상인 비율 (동점 순서와 무관)"""
+    hits = 0
+    for query in queries:
+        _, exact_scores = index.search_exact(index.vectors[query], top_k, exclude=query)
+        _, scores = index.search(index.vectors[query], top_k, n_probe=n_probe, exclude=query)
+        hits += int(np.sum(scores >= exact_scores[-1] - 1e-6))
+    return hits / (len(queries) * top_k)
+
+
+def test_ivf_recall_against_exact_top_k():
+    rng = np.random.default_rng(3)
+    centers = rng.normal(size=(40, 32))
+    vectors = centers[rng.integers(0, 40, 6000)] + rng.normal(scale=1.0, size=(6000, 32))
+    index = ClusteredVectorIndex.build(vectors)
+    queries = rng.choice(len(vectors), 200, replace=False)
+
+    assert _recall(index, queries, top_k=10, n_probe=8) >= 0.97
+    # 클러스터 하나만 보면 재현율이 눈에 띄게 떨어짐 (탐색 폭이 실제로 재현율을 좌우)
+    assert _recall(index, queries, top_k=10, n_probe=1) < 0.9
+    # 모든 클러스터를 탐색하면 정확한 검색과 같음
+    assert _recall(index, queries, top_k=10, n_probe=index.n_lists) == 1.0
+
+
+def test_model_builds_ann_index_up_front(build_ai):
+    options = {"content_vectorizer": "hashing", "cache_size": 0}
+    base = build_ai(make_menus(2000, seed=5), **options)
+
+    # 첫 질의 전에 SVD 투영과 IVF 인덱스가 준비돼 있음
+    assert base.similar_index is not None and len(base.similar_index) == 2000
+    assert base.similar_projection.shape[0] == 64
+    queries = np.arange(0, 2000, 20)
+    assert _recall(base.similar_index, queries, top_k=10, n_probe=8) >= 0.9
+    for menu_id in base.menus_df['menu_id'].iloc[:5]:
+        ann = base.get_similar_menus(menu_id=menu_id, top_k=10)
+        exact = base.get_similar_menus(menu_id=menu_id, top_k=10, exact=True)
+        assert ann["metadata"]["search"] == "ivf"
+        assert ann["data"][0]["similarity"] == exact["data"][0]["similarity"]
+
+    # 점진 갱신은 기존 투영과 중심을 재사용해 새 벡터만 배정
+    changed = base.with_menu_changes(removed_ids=["M00001"], upserts=[
+        {"menu_id": "NEW1", "restaurant_id": "R001", "menu_name": "참치 김밥", "category": "한식",
+         "price": 4500, "width": 18.0, "length": 6.0, "height": 5.0, "popularity_score": 7.5},
+    ])
+    assert changed.similar_projection is base.similar_projection
+    np.testing.assert_array_equal(changed.similar_index.centroids, base.similar_index.centroids)
+    assert changed.get_similar_menus(text="참치 김밥 한식", top_k=1)["data"][0]["menu_id"] == "NEW1"
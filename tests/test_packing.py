@@ -0,0 +1,56 @@
+import pandas as pd
+
+from conftest import make_restaurants
+from packing import orientation_loads, pack_containers, place_items
+
+
+def _pack(item_dims, containers, values=None, keep_upright=True):
+    loads, _ = orientation_loads(item_dims, containers, keep_upright)
+    values = [1.0] * len(item_dims) if values is None else values
+    return pack_containers(containers, item_dims, loads, [1000] * len(item_dims), values,
+                           time_budget=10, keep_upright=keep_upright)
+
+
+def test_two_items_that_cannot_share_the_floor_or_stack_are_rejected():
+    # 바닥 20×20에 15×12 두 개는 나란히도, 위로도(8 + 8 > 10) 놓을 수 없음
+    assert place_items([(15, 12, 8), (15, 12, 8)], (20, 20, 10)) is None
+    assert place_items([(15, 12, 8), (15, 12, 8)], (20, 20, 10), keep_upright=False) is None
+
+    for keep_upright in (True, False):
+        assignment, _, _ = _pack([(15, 12, 8), (15, 12, 8)], [(20, 20, 10)], keep_upright=keep_upright)
+        assert len(assignment) == 1
+
+
+def test_items_share_the_floor_and_stack_when_heights_fit():
+    assert place_items([(10, 20, 5), (10, 20, 5)], (20, 20, 10)) == [0, 0]
+    # 가로로 돌려야 나란히 들어감
+    assert place_items([(20, 10, 5), (10, 20, 5)], (20, 20, 5)) is not None
+    # 바닥을 다 쓴 뒤 높이 합(5 + 5 ≤ 10)이 맞을 때만 위에 쌓음
+    assert place_items([(20, 20, 5), (20, 20, 5)], (20, 20, 10)) is not None
+    assert place_items([(20, 20, 5), (20, 20, 6)], (20, 20, 10)) is None
+    # 눕히면 들어가는 메뉴는 회전을 허용할 때만
+    assert place_items([(5, 5, 12)], (20, 20, 10)) is None
+    assert place_items([(5, 5, 12)], (20, 20, 10), keep_upright=False) is not None
+
+
+def test_packing_recommendations_only_return_placeable_containers(build_ai):
+    menus = pd.DataFrame({
+        'menu_id': ['A', 'B', 'C', 'D'],
+        'restaurant_id': ['R000', 'R001', 'R002', 'R003'],
+        'menu_name': ['김치찌개', '짜장면', '초밥', '샐러드'],
+        'category': ['한식', '중식', '일식', '양식'],
+        'price': [9000, 7000, 15000, 8000],
+        'width': [15.0, 15.0, 10.0, 10.0],
+        'length': [12.0, 12.0, 20.0, 20.0],
+        'height': [8.0, 8.0, 4.0, 4.0],
+        'popularity_score': [9.0, 8.5, 3.0, 2.0],
+    })
+    ai = build_ai(menus, make_restaurants(4))
+
+    result = ai.get_packing_recommendations([{"width": 20, "length": 20, "height": 10}], time_budget_ms=10000)
+    assert result["status"] == "success"
+    (container,) = result["data"]
+    sizes = [tuple(item["placed_size"].values()) for item in container["items"]]
+    assert place_items(sizes, (20, 20, 10)) is not None
+    assert sum(menu_id in ('A', 'B') for menu_id in (item["menu_id"] for item in container["items"])) <= 1
+    assert container["volume_utilization"] <= 100.0
@@ -0,0 +1,72 @@
+import numpy as np
+
+from ai_model import create_recommendation_ai
+from event_log import RecommendationEventLog
+
+
+def write_feedback(directory, menu_ids, ratings):
+    event_log = RecommendationEventLog(str(directory), flush_interval=0.05).start()
+    for menu_id, rating in zip(menu_ids, ratings):
+        event_log.log({"event_type": "feedback", "user_id": "u", "container_size": {},
+                       "items": [{"menu_id": menu_id, "rating": rating}]})
+    event_log.close()
+
+
+def test_factory_trains_preference_model_from_feedback_log(tmp_path):
+    untrained = create_recommendation_ai(use_artifacts=False, interactions_dir=str(tmp_path))
+    assert not untrained.preference_model_fitted
+
+    menu_ids = untrained.menus_df['menu_id'].astype(str).tolist()[:30]
+    write_feedback(tmp_path, menu_ids, [i % 10 for i in range(len(menu_ids))])
+
+    trained = create_recommendation_ai(use_artifacts=False, interactions_dir=str(tmp_path))
+    assert trained.preference_model_fitted
+    features = trained._build_preference_features(20, 20, 10, np.arange(len(menu_ids)))
+    assert len(set(np.round(trained.predict_user_preferences(features), 6))) > 1
+
+
+def test_preference_model_survives_artifact_round_trip(tmp_path):
+    log_dir, bundle_dir = tmp_path / "logs", tmp_path / "bundle"
+    base = create_recommendation_ai(use_artifacts=False, interactions_dir="")
+    write_feedback(log_dir, base.menus_df['menu_id'].astype(str).tolist()[:20], [7] * 10 + [2] * 10)
+
+    built = create_recommendation_ai(artifacts_dir=str(bundle_dir), interactions_dir=str(log_dir))
+    loaded = create_recommendation_ai(artifacts_dir=str(bundle_dir), interactions_dir="")
+    assert built.preference_model_fitted and loaded.preference_model_fitted
+
+    features = built._build_preference_features(20, 20, 10, np.arange(20))
+    np.testing.assert_allclose(built.predict_user_preferences(features), loaded.predict_user_preferences(features))
+
+
+def test_feedback_log_is_read_once_and_workers_only_load_the_bundle(tmp_path, monkeypatch):
+    import ai_model
+
+    log_dir, bundle_dir = tmp_path / "logs", tmp_path / "bundle"
+    base = create_recommendation_ai(use_artifacts=False, interactions_dir="")
+    menu_ids = base.menus_df['menu_id'].astype(str).tolist()[:20]
+    write_feedback(log_dir, menu_ids, [7] * 10 + [2] * 10)
+    create_recommendation_ai(artifacts_dir=str(bundle_dir), interactions_dir=str(log_dir))
+
+    reads = []
+    original = ai_model.load_feedback_interactions
+    monkeypatch.setattr(ai_model, "load_feedback_interactions",
+                        lambda directory=None: reads.append(directory) or original(directory))
+
+    # 지문이 같으면 재시작해도 로그를 읽지 않고, 워커는 지문도 보지 않음
+    restarted = create_recommendation_ai(artifacts_dir=str(bundle_dir), interactions_dir=str(log_dir))
+    worker = create_recommendation_ai(artifacts_dir=str(bundle_dir), interactions_dir=str(log_dir),
+                                      train_preferences=False)
+    assert reads == [] and restarted.preference_model_fitted and worker.preference_model_fitted
+
+    # 새 평점이 쌓이면 부모가 한 번 다시 학습해 번들에 저장하고, 이후 워커는 그 모델을 로드
+    write_feedback(log_dir, menu_ids, [10] * 20)
+    retrained = create_recommendation_ai(artifacts_dir=str(bundle_dir), interactions_dir=str(log_dir))
+    worker = create_recommendation_ai(artifacts_dir=str(bundle_dir), interactions_dir=str(log_dir),
+                                      train_preferences=False)
+    assert len(reads) == 1
+
+    features = retrained._build_preference_features(20, 20, 10, np.arange(20))
+    np.testing.assert_allclose(worker.predict_user_preferences(features),
+                               retrained.predict_user_preferences(features))
+    assert not np.allclose(worker.predict_user_preferences(features),
+                           restarted.predict_user_preferences(features))
@@ -0,0 +1,37 @@
+from result_cache import RecommendationCache
+
+
+def test_cache_evicts_least_recently_used_and_counts():
+    cache = RecommendationCache(max_size=2, ttl_seconds=None)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.get("x", accept=lambda value: False) is None
+    cache.put("x", 4)
+    assert cache.get("x", accept=lambda value: False) is None
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+def test_quantized_cache_scores_exact_container(build_ai):
+    ai = build_ai(cache_quantization=5)
+    first = ai.get_hybrid_recommendations(21.0, 21.0, 9.0, top_k=5)
+    exact = build_ai().get_hybrid_recommendations(21.0, 21.0, 9.0, top_k=5)
+    assert [m["menu_id"] for m in first["data"]] == [m["menu_id"] for m in exact["data"]]
+    assert first["metadata"]["container_size"] == "21.0x21.0x9.0"
+
+    # 같은 양자화 구간의 더 큰 용기: 추천 메뉴가 모두 들어가므로 재사용하고 점수 기준 용기를 알림
+    larger = ai.get_hybrid_recommendations(21.4, 21.4, 9.0, top_k=5)
+    assert larger["metadata"]["cache_hit"]
+    assert larger["metadata"]["container_size"] == "21.4x21.4x9.0"
+    assert larger["metadata"]["scored_container_size"] == "21.0x21.0x9.0"
+
+    # 더 작은 용기: 안 들어가는 메뉴가 있으면 재사용하지 않고 실제 크기로 다시 계산
+    assert any(menu["size"]["width"] > 20.2 or menu["size"]["length"] > 20.2 for menu in first["data"])
+    smaller = ai.get_hybrid_recommendations(20.2, 20.2, 9.0, top_k=5)
+    assert not smaller["metadata"]["cache_hit"]
+    assert "scored_container_size" not in smaller["metadata"]
+    for menu in smaller["data"]:
+        assert menu["size"]["width"] <= 20.2 and menu["size"]["length"] <= 20.2
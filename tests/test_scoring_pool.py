@@ -0,0 +1,142 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from scoring_pool import ScoringPool, ScoringPoolBusy, ScoringTimeout, ScoringWorkerLost
+
+
+class SlowModel:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def score(self, value):
+        self.release.wait(5)
+        return value
+
+
+def test_timed_out_job_keeps_its_slot_until_it_finishes():
+    model = SlowModel()
+    pool = ScoringPool(lambda: model, workers=1, max_pending=1, timeout=0.05)
+
+    async def scenario():
+        with pytest.raises(ScoringTimeout):
+            await pool.run("score", value=1)
+        # 시간 초과된 계산이 아직 워커에서 실행 중이므로 슬롯을 돌려받지 않음
+        assert pool.pending == 1
+        with pytest.raises(ScoringPoolBusy):
+            await pool.run("score", value=2)
+
+        model.release.set()
+        for _ in range(100):
+            if pool.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.pending == 0
+        assert await pool.run("score", value=3) == 3
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        model.release.set()
+        pool.shutdown()
+    assert (pool.timed_out, pool.rejected) == (1, 1)
+
+
+def test_worker_pids_lists_only_current_executor_processes(tmp_path, monkeypatch):
+    monkeypatch.setenv("MODEL_ARTIFACTS_DIR", str(tmp_path / "artifacts"))
+    pool = ScoringPool(None, mode='process', workers=1, timeout=120)
+    # 스코어링 풀과 무관한 자식 프로세스는 목록에 없어야 함
+    unrelated = multiprocessing.get_context('spawn').Process(target=time.sleep, args=(30,))
+    unrelated.start()
+    try:
+        assert pool.worker_pids() == []
+        result = asyncio.run(pool.run("get_simple_recommendations", width=20, length=20, height=8))
+        assert result
+        first = pool.worker_pids()
+        assert len(first) == 1 and unrelated.pid not in first
+
+        # 재시작 후에는 새 실행기의 워커만 (내려가는 중인 이전 워커 제외)
+        pool.restart()
+        asyncio.run(pool.run("get_simple_recommendations", width=20, length=20, height=8))
+        second = pool.worker_pids()
+        assert len(second) == 1 and not set(first) & set(second)
+    finally:
+        unrelated.terminate()
+        pool.shutdown()
+
+
+@pytest.fixture
+def bundle_dir(tmp_path, monkeypatch):
+    """부모 프로세스가 번들을 먼저 만들어 두는 기동 순서 (워커는 로드만 함)"""
+    from ai_model import create_recommendation_ai
+    directory = str(tmp_path / "artifacts")
+    monkeypatch.setenv("MODEL_ARTIFACTS_DIR", directory)
+    create_recommendation_ai(artifacts_dir=directory, interactions_dir="")
+    return directory
+
+
+def test_start_and_restart_warm_every_worker_outside_the_request_timeout(bundle_dir):
+    pool = ScoringPool(None, mode='process', workers=2, timeout=1)
+    try:
+        pool.start()
+        first = pool.worker_pids()
+        assert len(first) == 2
+        # 워커 기동과 모델 로드가 끝났으므로 짧은 시간 제한 안에 첫 요청이 끝남
+        assert asyncio.run(pool.run("get_simple_recommendations", width=20, length=20, height=8))
+
+        pool.restart()
+        second = pool.worker_pids()
+        assert len(second) == 2 and not set(first) & set(second)
+        assert asyncio.run(pool.run("get_simple_recommendations", width=20, length=20, height=8))
+        assert pool.timed_out == 0
+    finally:
+        pool.shutdown()
+
+
+def test_pool_recovers_after_a_worker_crash(bundle_dir):
+    pool = ScoringPool(None, mode='process', workers=1, timeout=1)
+    try:
+        pool.start()
+        (pid,) = pool.worker_pids()
+        os.kill(pid, signal.SIGKILL)
+        # 관리 스레드가 워커 종료를 감지해 실행기를 깨진 상태로 표시할 때까지 대기
+        for _ in range(500):
+            if pool._executor._broken:
+                break
+            time.sleep(0.01)
+
+        assert asyncio.run(pool.run("get_simple_recommendations", width=20, length=20, height=8))
+        (new_pid,) = pool.worker_pids()
+        assert new_pid != pid
+        assert pool.stats()["recovered"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_worker_crash_during_a_request_is_reported_and_recovered(bundle_dir, monkeypatch):
+    # 워커의 용기 담기 탐색이 시간 예산(5초)을 다 쓰도록 빔 폭을 키움
+    monkeypatch.setenv("PACKING_BEAM_WIDTH", "100000")
+    pool = ScoringPool(None, mode='process', workers=1, timeout=10)
+    try:
+        pool.start()
+        (pid,) = pool.worker_pids()
+
+        async def scenario():
+            # 계산 중에 워커가 죽으면 그 요청의 결과는 잃음
+            killer = asyncio.create_task(asyncio.to_thread(lambda: (time.sleep(0.2), os.kill(pid, signal.SIGKILL))))
+            with pytest.raises(ScoringWorkerLost):
+                await pool.run("get_packing_recommendations",
+                               containers=[{"width": 60, "length": 60, "height": 60}] * 6,
+                               max_items_per_container=5, time_budget_ms=5000)
+            await killer
+            return await pool.run("get_simple_recommendations", width=20, length=20, height=8)
+
+        assert asyncio.run(scenario())
+        assert pool.stats()["workers_lost"] == 1 and pool.stats()["recovered"] == 1
+    finally:
+        pool.shutdown()
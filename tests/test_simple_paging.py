@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from conftest import make_menus
+from menu_index import ContainerFitIndex
+
+
+def brute_force_ranking(menus, width, length, height, category=None):
+    """들어가는 메뉴 위치를 부피 큰 순, 동률은 위치 순으로"""
+    volumes = menus['width'] * menus['length'] * menus['height']
+    fits = (menus['width'] <= width) & (menus['length'] <= length) & (menus['height'] <= height)
+    if category:
+        fits &= menus['category'] == category
+    positions = np.flatnonzero(fits.to_numpy())
+    return positions[np.lexsort((positions, -volumes.to_numpy()[positions]))]
+
+
+@pytest.mark.parametrize("limit,chunk_size", [(1, 1024), (7, 4), (50, 16), (5000, 64)])
+def test_query_top_by_volume_matches_sorting_every_fitting_menu(limit, chunk_size):
+    menus = make_menus(3000, seed=3)
+    index = ContainerFitIndex(menus['width'], menus['length'], menus['height'])
+    rng = np.random.default_rng(0)
+    for width, length, height in rng.uniform(5, 30, (20, 3)).round(1):
+        expected = brute_force_ranking(menus, width, length, height)
+        ranked = index.query_top_by_volume(width, length, height, limit, chunk_size=chunk_size)
+        assert list(ranked) == list(expected[:limit])
+
+        # 중간 순위 다음부터 (부피 동률 경계 포함)
+        if len(expected) > 10:
+            after = (index.volumes[expected[9]], expected[9])
+            ranked = index.query_top_by_volume(width, length, height, limit, after=after, chunk_size=chunk_size)
+            assert list(ranked) == list(expected[10:10 + limit])
+
+
+@pytest.mark.parametrize("category", [None, '한식'])
+def test_cursor_pages_walk_the_full_ranking(build_ai, category):
+    menus = make_menus(1000, seed=5)
+    ai = build_ai(menus)
+    container = (22.0, 21.5, 9.0)
+    expected = [f"M{i:05d}" for i in brute_force_ranking(menus, *container, category=category)]
+    assert len(expected) > 30
+
+    seen, cursor = [], None
+    while True:
+        page = ai.get_simple_recommendation_page(*container, top_k=7, preferred_category=category, cursor=cursor)
+        assert page["status"] == "success"
+        seen.extend(menu["menu_id"] for menu in page["recommendations"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == expected
+
+    # offset 페이지와 커서 페이지는 같은 순서
+    page = ai.get_simple_recommendation_page(*container, top_k=7, preferred_category=category, offset=14)
+    assert [menu["menu_id"] for menu in page["recommendations"]] == expected[14:21]
+    assert ai.get_simple_recommendations(*container, top_k=5, preferred_category=category) == \
+        ai.get_simple_recommendation_page(*container, top_k=5, preferred_category=category)["recommendations"]
+
+
+def test_invalid_cursor_is_an_error(build_ai):
+    page = build_ai().get_simple_recommendation_page(20, 20, 8, cursor="not-a-cursor")
+    assert page["status"] == "error"